@@ -0,0 +1,200 @@
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from algoritmos.geometria import GeometriaCena
+from algoritmos.leitor_xml import Cena, carregar_cena_xml
+
+"""
+Formato binario de cena (.vo2d)
+    MAGICO (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON | arrays alinhados em ALINHAMENTO bytes
+O cabeçalho guarda a viewport, a window, a tabela de cores, o tamanho e a data de modificação do XML
+de origem e, para cada array, seu tipo, formato e posição no arquivo.
+"""
+MAGICO = b'VO2D\x00\x01\r\n'
+VERSAO = 1
+ALINHAMENTO = 64
+EXTENSAO = '.vo2d'
+
+# Arrays gravados no arquivo, com o tipo utilizado em disco
+ARRAYS = (
+    ('coordenadas', '<f8'),
+    ('deslocamentos', '<i8'),
+    ('tipos', '<i1'),
+    ('indices_cor', '<i4'),
+    ('caixas_mundo', '<f8'),
+)
+
+"""
+Retorna o caminho do cache binario correspondente a um arquivo XML (mesmo diretório e nome, extensão .vo2d)
+"""
+def caminho_cache(caminho_xml):
+    return os.path.splitext(caminho_xml)[0] + EXTENSAO
+
+# Identificação do arquivo de origem, usada para saber se o cache ainda corresponde a ele
+def identificacao_origem(caminho_xml):
+    informacoes = os.stat(caminho_xml)
+    return {"tamanho": informacoes.st_size, "modificacao_ns": informacoes.st_mtime_ns}
+
+def _alinhar(posicao):
+    return -(-posicao // ALINHAMENTO) * ALINHAMENTO
+
+"""
+Grava uma cena no formato binario
+O arquivo é escrito em um temporário e renomeado ao final, de modo que um cache incompleto nunca é lido
+Parâmetros:
+    caminho (str): Caminho do arquivo .vo2d
+    cena (Cena): Cena a ser gravada
+    caminho_xml (str): Arquivo XML de origem (opcional), registrado para a verificação de validade do cache
+"""
+def salvar_cena_binaria(caminho, cena: Cena, caminho_xml=None):
+    geometria = cena.geometria
+    arrays = {
+        "coordenadas": geometria.coordenadas,
+        "deslocamentos": geometria.deslocamentos,
+        "tipos": geometria.tipos,
+        "indices_cor": geometria.indices_cor,
+        "caixas_mundo": geometria.caixas_mundo,
+    }
+
+    cabecalho = {
+        "versao": VERSAO,
+        "origem": identificacao_origem(caminho_xml) if caminho_xml is not None else None,
+        "viewport": cena.viewport,
+        "window": cena.window,
+        "cores": list(geometria.tabela_cores),
+        "arrays": {},
+    }
+
+    # Calcula a posição de cada array; o cabeçalho é reservado com folga para que as posições caibam nele
+    reservado = _alinhar(len(MAGICO) + 4 + len(json.dumps(cabecalho).encode('utf-8')) + 128 * len(ARRAYS))
+    posicao = reservado
+    for nome, tipo in ARRAYS:
+        array = np.ascontiguousarray(arrays[nome], dtype=tipo)
+        arrays[nome] = array
+        cabecalho["arrays"][nome] = {"tipo": tipo, "formato": list(array.shape), "posicao": posicao}
+        posicao = _alinhar(posicao + array.nbytes)
+
+    texto = json.dumps(cabecalho).encode('utf-8')
+    if len(MAGICO) + 4 + len(texto) > reservado:
+        raise ValueError("Cabeçalho do cache binário maior que o espaço reservado")
+
+    # Temporário com nome unico no mesmo diretório: gravações simultaneas (outros processos ou threads) nunca usam o mesmo
+    diretorio, nome = os.path.split(os.path.abspath(caminho))
+    descritor, temporario = tempfile.mkstemp(suffix='.tmp', prefix=nome + '.', dir=diretorio)
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(MAGICO)
+            arquivo.write(struct.pack('<I', len(texto)))
+            arquivo.write(texto)
+            for nome, _ in ARRAYS:
+                arquivo.seek(cabecalho["arrays"][nome]["posicao"])
+                arquivo.write(arrays[nome].tobytes())
+            arquivo.truncate(posicao)
+        os.replace(temporario, caminho)
+    except BaseException:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        raise
+
+"""
+Lê apenas o cabeçalho de um arquivo .vo2d
+Retorna:
+    dict: Cabeçalho do arquivo, ou None se o arquivo nao for um cache valido desta versão
+"""
+def ler_cabecalho_binario(caminho):
+    try:
+        with open(caminho, 'rb') as arquivo:
+            if arquivo.read(len(MAGICO)) != MAGICO:
+                return None
+            tamanho, = struct.unpack('<I', arquivo.read(4))
+            cabecalho = json.loads(arquivo.read(tamanho).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    if cabecalho.get("versao") != VERSAO:
+        return None
+    return cabecalho
+
+"""
+Abre uma cena no formato binario mapeando os arrays em memória
+Nada além do cabeçalho é lido na abertura: as paginas dos arrays sao carregadas sob demanda pelo sistema operacional.
+Os arrays sao mapeados em modo copy-on-write: alterações ficam em memória e nao modificam o arquivo
+Parâmetros:
+    caminho (str): Caminho do arquivo .vo2d
+Retorna:
+    Cena: Viewport, window e geometria sobre os arrays mapeados
+"""
+def abrir_cena_binaria(caminho) -> Cena:
+    cabecalho = ler_cabecalho_binario(caminho)
+    if cabecalho is None:
+        raise ValueError(f"Arquivo de cena binária inválido: {caminho}")
+
+    arrays = {}
+    for nome, _ in ARRAYS:
+        descricao = cabecalho["arrays"][nome]
+        formato = tuple(descricao["formato"])
+        if 0 in formato:
+            arrays[nome] = np.zeros(formato, dtype=descricao["tipo"])
+        else:
+            arrays[nome] = np.memmap(caminho, dtype=descricao["tipo"], mode='c', offset=descricao["posicao"], shape=formato)
+
+    geometria = GeometriaCena.de_arrays(
+        arrays["coordenadas"],
+        arrays["deslocamentos"],
+        arrays["tipos"],
+        arrays["indices_cor"],
+        cabecalho["cores"],
+        caixas_mundo=arrays["caixas_mundo"],
+    )
+    return Cena(dict(cabecalho["viewport"]), dict(cabecalho["window"]), geometria)
+
+"""
+Verifica se o cache binario ainda corresponde ao arquivo XML (mesmo tamanho e data de modificação)
+"""
+def cache_atualizado(caminho_xml, caminho_binario=None):
+    caminho_binario = caminho_binario or caminho_cache(caminho_xml)
+    if not os.path.exists(caminho_binario):
+        return False
+
+    cabecalho = ler_cabecalho_binario(caminho_binario)
+    if cabecalho is None:
+        return False
+    return cabecalho.get("origem") == identificacao_origem(caminho_xml)
+
+"""
+Carrega uma cena a partir de um arquivo XML, usando o cache binario ao lado do XML quando ele estiver atualizado
+Quando o cache nao existe ou esta desatualizado, o XML é lido normalmente e o cache é regravado
+Parâmetros:
+    caminho_xml (str): Caminho do arquivo XML
+    progresso (callable): Função opcional progresso(bytes_lidos, bytes_totais), repassada ao leitor XML
+    ao_ler_cabecalho (callable): Função opcional chamada com a Cena assim que viewport e window forem conhecidas
+    gravar_cache (bool): Se o cache deve ser (re)gravado após a leitura do XML
+Retorna:
+    Cena: Viewport, window e geometria lidas
+"""
+def carregar_cena(caminho_xml, progresso=None, ao_ler_cabecalho=None, gravar_cache: bool = True) -> Cena:
+    caminho_binario = caminho_cache(caminho_xml)
+
+    if cache_atualizado(caminho_xml, caminho_binario):
+        try:
+            cena = abrir_cena_binaria(caminho_binario)
+        except (OSError, ValueError, KeyError):
+            cena = None
+        if cena is not None:
+            if ao_ler_cabecalho is not None:
+                ao_ler_cabecalho(cena)
+            return cena
+
+    cena = carregar_cena_xml(caminho_xml, progresso=progresso, ao_ler_cabecalho=ao_ler_cabecalho)
+
+    if gravar_cache:
+        # O cache é apenas uma otimização: falhas de escrita (ex.: diretório somente leitura) sao ignoradas
+        try:
+            salvar_cena_binaria(caminho_binario, cena, caminho_xml)
+        except OSError:
+            pass
+    return cena
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+
+# Orçamento de memória padrão do cache de quadros (bytes)
+ORCAMENTO_PADRAO = 128 * 1024 * 1024
+
+# Casas decimais utilizadas nas chaves: movimentos e zoom somam passos fixos (0.5 e 0.10), e a soma
+# em ponto flutuante de ida e volta nem sempre retorna exatamente ao mesmo valor
+CASAS_CHAVE = 9
+
+# Estimativas (CPython 64 bits) do espaço ocupado por um comando de desenho (objeto e lista de coordenadas;
+# as opções sao compartilhadas entre os comandos) e por cada coordenada (float e referência na lista)
+BYTES_COMANDO = 160
+BYTES_COORDENADA = 32
+
+"""
+Classe CacheQuadros -> Cache LRU dos comandos de desenho já recortados e levados a viewport, por estado de visualização
+Voltar a uma visão recente (ex.: rotacionar para a esquerda e para a direita, ou aumentar e diminuir o zoom
+pelo mesmo passo) reutiliza os comandos gerados, sem repetir o recorte.
+Quando o tamanho estimado dos quadros guardados ultrapassa o orçamento, os menos usados recentemente sao descartados.
+Cada quadro guarda tambem a versão das formas com que foi gerado, para ser atualizado apenas nas formas editadas depois
+Atributos:
+    orcamento (int): Memória máxima (bytes, estimada) ocupada pelos quadros; 0 desativa o cache
+    tamanho (int): Memória estimada ocupada pelos quadros guardados
+    acertos, falhas (int): Consultas atendidas e nao atendidas pelo cache
+    descartes (int): Quadros descartados para respeitar o orçamento
+"""
+class CacheQuadros:
+    def __init__(self, orcamento: int = ORCAMENTO_PADRAO):
+        self.orcamento = max(int(orcamento), 0)
+        self.quadros = OrderedDict()
+        self.tamanho = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def __len__(self):
+        return len(self.quadros)
+
+    """
+    Retorna os comandos guardados para a chave (marcando o quadro como o mais recente), ou None
+    """
+    def obter(self, chave):
+        quadro = self.obter_quadro(chave)
+        return None if quadro is None else quadro[0]
+
+    """
+    Retorna o par (comandos, versao das formas) guardado para a chave (marcando o quadro como o mais recente), ou None
+    """
+    def obter_quadro(self, chave):
+        quadro = self.quadros.get(chave)
+        if quadro is None:
+            self.falhas += 1
+            return None
+        self.quadros.move_to_end(chave)
+        self.acertos += 1
+        return quadro[0], quadro[2]
+
+    """
+    Guarda os comandos de um quadro
+    Quadros maiores que o orçamento nao sao guardados
+    Parâmetros:
+        chave: Estado de visualização (ver chave_visao)
+        comandos (list): Comandos de desenho do quadro (nao devem ser modificados depois de guardados)
+        versao (int): Versão das formas com que os comandos foram gerados
+    """
+    def guardar(self, chave, comandos, versao: int = 0):
+        tamanho = tamanho_comandos(comandos)
+        if tamanho > self.orcamento:
+            return
+
+        anterior = self.quadros.pop(chave, None)
+        if anterior is not None:
+            self.tamanho -= anterior[1]
+
+        self.quadros[chave] = (comandos, tamanho, versao)
+        self.tamanho += tamanho
+        while self.tamanho > self.orcamento:
+            _, (_, tamanho_descartado, _) = self.quadros.popitem(last=False)
+            self.tamanho -= tamanho_descartado
+            self.descartes += 1
+
+    """
+    Altera o orçamento de memória, descartando os quadros menos recentes que nao couberem nele
+    """
+    def definir_orcamento(self, orcamento: int):
+        self.orcamento = max(int(orcamento), 0)
+        while self.quadros and self.tamanho > self.orcamento:
+            _, (_, tamanho_descartado, _) = self.quadros.popitem(last=False)
+            self.tamanho -= tamanho_descartado
+            self.descartes += 1
+
+    """
+    Descarta todos os quadros (ex.: quando as formas da cena mudam); os contadores sao mantidos
+    """
+    def limpar(self):
+        self.quadros.clear()
+        self.tamanho = 0
+
+    """
+    Zera os contadores de acertos, falhas e descartes
+    """
+    def zerar_contadores(self):
+        self.acertos = self.falhas = self.descartes = 0
+
+    """
+    Retorna os contadores do cache, para ajuste do orçamento
+    Retorna:
+        dict: quadros, tamanho, orcamento, acertos, falhas, descartes e taxa_acertos
+    """
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            "quadros": len(self.quadros),
+            "tamanho": self.tamanho,
+            "orcamento": self.orcamento,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+        }
+
+"""
+Estima a memória ocupada por uma lista de comandos de desenho (objetos e listas de coordenadas)
+"""
+def tamanho_comandos(comandos):
+    coordenadas = sum(len(comando.coordenadas) for comando in comandos)
+    return 64 + 8 * len(comandos) + BYTES_COMANDO * len(comandos) + BYTES_COORDENADA * coordenadas
+
+"""
+Monta a chave de um estado de visualização, com os valores arredondados para CASAS_CHAVE casas decimais
+Parâmetros:
+    window, viewport (dict): Limites da window (mundo) e da viewport
+    angulo (float): Angulo de rotação da window
+    escala (float): Escala (zoom) da window
+    algoritmos (tuple): Algoritmos de clipping selecionados (retas e polígonos)
+"""
+def chave_visao(window, viewport, angulo, escala, algoritmos=()):
+    def arredondar(valor):
+        # round(-0.0) preserva o sinal: soma 0.0 para que 0.0 e -0.0 gerem a mesma chave
+        return round(float(valor), CASAS_CHAVE) + 0.0
+
+    return (
+        tuple(arredondar(window[lado]) for lado in ('xmin', 'ymin', 'xmax', 'ymax')),
+        tuple(arredondar(viewport[lado]) for lado in ('xmin', 'ymin', 'xmax', 'ymax')),
+        arredondar(angulo % 360),
+        arredondar(escala),
+        tuple(algoritmos),
+    )
@@ -0,0 +1,91 @@
+"""
+Classe CamadaRetida -> Mantém no canvas um item por chave (forma) entre quadros, em vez de apagar e recriar tudo
+A cada quadro os comandos de desenho sao comparados com os itens existentes:
+    - itens que continuam visiveis apenas têm as coordenadas atualizadas (canvas.coords), quando mudaram;
+    - itens que deixaram de ser visiveis sao ocultados (state='hidden') e reaproveitados quando voltarem;
+    - itens sao criados apenas para chaves que nunca foram desenhadas.
+Funciona com qualquer objeto com a interface do tkinter.Canvas (create_*, coords, itemconfigure, delete)
+Atributos:
+    canvas: Canvas onde os itens sao desenhados
+    itens (dict): {chave: ItemRetido}
+"""
+class CamadaRetida:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.itens = {}
+        self.visiveis = set()
+
+    """
+    Atualiza o canvas com os comandos de um quadro
+    Parâmetros:
+        comandos (list): Comandos de desenho (ComandoDesenho) com chave definida
+        ocultar_ausentes (bool): Oculta os itens cujas chaves nao aparecem nos comandos
+    """
+    def atualizar(self, comandos, ocultar_ausentes: bool = True):
+        canvas = self.canvas
+        itens = self.itens
+        visiveis = set()
+
+        for comando in comandos:
+            item = itens.get(comando.chave)
+
+            if item is None or item.tipo != comando.tipo:
+                if item is not None:
+                    canvas.delete(item.identificador)
+                identificador = getattr(canvas, 'create_' + comando.tipo)(*comando.coordenadas, **comando.opcoes)
+                itens[comando.chave] = ItemRetido(identificador, comando.tipo, comando.coordenadas, comando.opcoes)
+            else:
+                if item.coordenadas != comando.coordenadas:
+                    canvas.coords(item.identificador, *comando.coordenadas)
+                    item.coordenadas = comando.coordenadas
+                if item.opcoes != comando.opcoes:
+                    canvas.itemconfigure(item.identificador, **comando.opcoes)
+                    item.opcoes = comando.opcoes
+                if comando.chave not in self.visiveis:
+                    canvas.itemconfigure(item.identificador, state='normal')
+
+            visiveis.add(comando.chave)
+
+        if ocultar_ausentes:
+            for chave in self.visiveis - visiveis:
+                canvas.itemconfigure(itens[chave].identificador, state='hidden')
+            self.visiveis = visiveis
+        else:
+            self.visiveis |= visiveis
+
+    """
+    Oculta os itens das chaves informadas (ex.: formas removidas), mantendo-os para reaproveitamento
+    """
+    def ocultar(self, chaves):
+        for chave in chaves:
+            if chave in self.visiveis:
+                self.canvas.itemconfigure(self.itens[chave].identificador, state='hidden')
+                self.visiveis.discard(chave)
+
+    """
+    Remove todos os itens da camada do canvas
+    """
+    def limpar(self):
+        for item in self.itens.values():
+            self.canvas.delete(item.identificador)
+        self.itens = {}
+        self.visiveis = set()
+
+    """
+    Esquece os itens sem apagá-los (quando o canvas já foi limpo com canvas.delete('all'))
+    """
+    def esquecer(self):
+        self.itens = {}
+        self.visiveis = set()
+
+"""
+Classe ItemRetido -> Item do canvas mantido pela camada, com o ultimo estado enviado ao canvas
+"""
+class ItemRetido:
+    __slots__ = ('identificador', 'tipo', 'coordenadas', 'opcoes')
+
+    def __init__(self, identificador, tipo, coordenadas, opcoes):
+        self.identificador = identificador
+        self.tipo = tipo
+        self.coordenadas = coordenadas
+        self.opcoes = opcoes
@@ -0,0 +1,122 @@
+import os
+import warnings
+
+"""
+Conversão de nomes de cores (os mesmos aceitos pelo tkinter) para RGB, sem depender do tkinter
+Os nomes sao lidos da base de cores do X11 (rgb.txt) quando ela esta disponivel; caso contrario
+apenas as cores basicas abaixo (que incluem as usadas nas entradas e na cena sintetica dos benchmarks) e as
+cores hexadecimais (#rgb, #rrggbb, #rrrrggggbbbb) sao reconhecidas
+Uma cor nao reconhecida gera um aviso (warnings) e é substituida pela cor padrão
+"""
+CORES_BASICAS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "lime": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "gray": (190, 190, 190),
+    "grey": (190, 190, 190),
+    "lightgrey": (211, 211, 211),
+    "lightgray": (211, 211, 211),
+    "darkgray": (169, 169, 169),
+    "darkgrey": (169, 169, 169),
+    "orange": (255, 165, 0),
+    "purple": (160, 32, 240),
+    "maroon": (176, 48, 96),
+    "brown": (165, 42, 42),
+    "pink": (255, 192, 203),
+    "navy": (0, 0, 128),
+    "chartreuse2": (118, 238, 0),
+    "cornflowerblue": (100, 149, 237),
+    "darkorange1": (255, 127, 0),
+    "deepskyblue2": (0, 178, 238),
+    "firebrick": (178, 34, 34),
+    "forestgreen": (34, 139, 34),
+    "gold2": (238, 201, 0),
+    "goldenrod1": (255, 193, 37),
+    "indianred1": (255, 106, 106),
+    "maroon1": (255, 52, 179),
+    "orchid1": (255, 131, 250),
+    "steelblue": (70, 130, 180),
+    "tomato2": (238, 92, 66),
+    "violetred1": (255, 62, 150),
+    "yellow2": (238, 238, 0),
+}
+
+ARQUIVOS_RGB = (
+    "/usr/share/X11/rgb.txt",
+    "/etc/X11/rgb.txt",
+    "/usr/X11R6/lib/X11/rgb.txt",
+    "/opt/X11/share/X11/rgb.txt",
+)
+
+_tabela = None
+
+# Normaliza o nome de uma cor como o X11: sem espaços e sem diferenciar maiusculas
+def _normalizar_nome(nome):
+    return nome.replace(" ", "").lower()
+
+"""
+Retorna a tabela {nome: (r, g, b)} de cores conhecidas, carregada apenas na primeira chamada
+"""
+def tabela_cores():
+    global _tabela
+    if _tabela is not None:
+        return _tabela
+
+    tabela = dict(CORES_BASICAS)
+    for caminho in ARQUIVOS_RGB:
+        if not os.path.exists(caminho):
+            continue
+        with open(caminho, encoding="latin-1") as arquivo:
+            for linha in arquivo:
+                partes = linha.split()
+                if len(partes) < 4 or linha.startswith("!"):
+                    continue
+                try:
+                    rgb = (int(partes[0]), int(partes[1]), int(partes[2]))
+                except ValueError:
+                    continue
+                tabela.setdefault(_normalizar_nome("".join(partes[3:])), rgb)
+        break
+
+    _tabela = tabela
+    return _tabela
+
+"""
+Converte uma cor para RGB
+Parâmetros:
+    cor (str): Nome da cor (ex.: 'gold2') ou cor hexadecimal (ex.: '#ffd700')
+    padrao (tuple): Cor retornada (com um aviso) quando a cor nao é reconhecida
+Retorna:
+    tuple: (r, g, b) com valores de 0 a 255
+"""
+def cor_rgb(cor, padrao=(0, 0, 0)):
+    if not cor:
+        return padrao
+
+    if cor.startswith("#"):
+        digitos = cor[1:]
+        if len(digitos) in (3, 6, 9, 12):
+            tamanho = len(digitos) // 3
+            try:
+                componentes = [int(digitos[i * tamanho:(i + 1) * tamanho], 16) for i in range(3)]
+            except ValueError:
+                return _cor_desconhecida(cor, padrao)
+            maximo = 16 ** tamanho - 1
+            return tuple(round(c * 255 / maximo) for c in componentes)
+        return _cor_desconhecida(cor, padrao)
+
+    rgb = tabela_cores().get(_normalizar_nome(cor))
+    if rgb is None:
+        return _cor_desconhecida(cor, padrao)
+    return rgb
+
+# Avisa que a cor nao foi reconhecida (uma vez por cor) e retorna a cor padrão
+def _cor_desconhecida(cor, padrao):
+    warnings.warn(f"cor desconhecida {cor!r}: usando {padrao}", stacklevel=3)
+    return padrao
@@ -0,0 +1,114 @@
+import math
+import numpy as np
+
+"""
+Modos de desenho dos pontos (ver Renderizador.definir_modo_pontos):
+    PONTOS_INDIVIDUAIS: um oval por ponto visivel
+    PONTOS_AGREGADOS: um marcador por celula da tela e cor, na posição media dos pontos da celula
+    PONTOS_DENSIDADE: uma imagem de densidade, sob as demais formas
+Nos modos agregados o custo do desenho é limitado pela resolução da viewport, e nao pelo numero de pontos
+"""
+PONTOS_INDIVIDUAIS = 0
+PONTOS_AGREGADOS = 1
+PONTOS_DENSIDADE = 2
+
+# Lado (em pixels) das celulas dos marcadores agregados: o diametro do oval de um ponto
+TAMANHO_CELULA = 6
+
+# Lado (em pixels) das celulas da imagem de densidade
+TAMANHO_CELULA_IMAGEM = 2
+
+# Opacidade de uma celula com um unico ponto na imagem de densidade (a celula mais densa é opaca)
+OPACIDADE_MINIMA = 0.35
+
+"""
+Agrupa os pontos pela celula da tela em que caem e pela cor, com operações vetorizadas
+O identificador de cada grupo depende apenas da celula e da cor, e se mantém entre quadros; como o numero de
+celulas é limitado pela resolução, a contagem é feita com bincount, sem ordenar os pontos
+Parâmetros:
+    pixels (numpy.ndarray): Posição (N,2) dos pontos, em pixels
+    cores (numpy.ndarray): Indice da cor de cada ponto
+    n_cores (int): Numero de cores da tabela de cores
+    area (dict): Área de desenho (xmin, ymin, xmax, ymax), em pixels (ex.: a viewport)
+    tamanho_celula (float): Lado das celulas, em pixels
+Retorna:
+    tuple: (grupos, cores, centros, quantidades), um elemento por grupo (celula e cor), em ordem crescente de grupo:
+        o identificador do grupo, o indice da sua cor, a posição media (K,2) dos seus pontos e o numero de pontos
+"""
+def agregar_pontos(pixels, cores, n_cores, area, tamanho_celula=TAMANHO_CELULA):
+    pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+    cores = np.asarray(cores, dtype=np.int64)
+    n_cores = max(int(n_cores), 1)
+
+    # Pontos sobre a borda (ou fora dela por arredondamento) ficam nas celulas da borda
+    colunas = max(int(math.ceil((area['xmax'] - area['xmin']) / tamanho_celula)), 1)
+    linhas = max(int(math.ceil((area['ymax'] - area['ymin']) / tamanho_celula)), 1)
+    celulas = np.floor((pixels - (area['xmin'], area['ymin'])) / tamanho_celula).astype(np.int64)
+    np.clip(celulas[:, 0], 0, colunas - 1, out=celulas[:, 0])
+    np.clip(celulas[:, 1], 0, linhas - 1, out=celulas[:, 1])
+    chaves = (celulas[:, 1] * colunas + celulas[:, 0]) * n_cores + cores
+
+    total = linhas * colunas * n_cores
+    quantidades = np.bincount(chaves, minlength=total)
+    grupos = np.flatnonzero(quantidades)
+    quantidades = quantidades[grupos]
+    centros = np.empty((len(grupos), 2))
+    centros[:, 0] = np.bincount(chaves, weights=pixels[:, 0], minlength=total)[grupos] / quantidades
+    centros[:, 1] = np.bincount(chaves, weights=pixels[:, 1], minlength=total)[grupos] / quantidades
+    return grupos, grupos % n_cores, centros, quantidades
+
+"""
+Raio dos marcadores agregados: o raio de um ponto, crescendo com o logaritmo do numero de pontos do grupo,
+limitado ao tamanho da celula
+"""
+def raios_marcadores(quantidades, raio_ponto, tamanho_celula=TAMANHO_CELULA):
+    raios = raio_ponto * (1 + 0.5 * np.log10(np.maximum(quantidades, 1)))
+    return np.minimum(raios, max(tamanho_celula, raio_ponto))
+
+"""
+Gera a imagem de densidade dos pontos: cada celula recebe a cor media dos seus pontos, com opacidade
+proporcional ao logaritmo do numero de pontos (a celula mais densa é opaca), sobre a cor de fundo
+Parâmetros:
+    pixels (numpy.ndarray): Posição (N,2) dos pontos na viewport, em pixels
+    cores_rgb (numpy.ndarray): Cor (N,3) de cada ponto, de 0 a 255
+    largura, altura (int): Tamanho da imagem
+    fundo (tuple): Cor RGB do fundo
+    tamanho_celula (int): Lado das celulas, em pixels
+Retorna:
+    numpy.ndarray: Imagem RGB (altura, largura, 3)
+"""
+def imagem_densidade(pixels, cores_rgb, largura, altura, fundo=(255, 255, 255), tamanho_celula=TAMANHO_CELULA_IMAGEM):
+    largura, altura = max(int(largura), 0), max(int(altura), 0)
+    tamanho_celula = max(int(tamanho_celula), 1)
+    imagem = np.empty((altura, largura, 3), dtype=np.uint8)
+    imagem[:] = fundo
+
+    pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+    colunas = -(-largura // tamanho_celula)
+    linhas = -(-altura // tamanho_celula)
+    celulas = np.floor(pixels / tamanho_celula).astype(np.int64)
+    dentro = (celulas[:, 0] >= 0) & (celulas[:, 0] < colunas) & (celulas[:, 1] >= 0) & (celulas[:, 1] < linhas)
+    if not dentro.any():
+        return imagem
+
+    celulas = celulas[dentro, 1] * colunas + celulas[dentro, 0]
+    cores_rgb = np.asarray(cores_rgb, dtype=float).reshape(-1, 3)[dentro]
+    quantidades = np.bincount(celulas, minlength=linhas * colunas)
+    ocupadas = quantidades > 0
+
+    # Cor media e opacidade de cada celula
+    soma = np.stack([np.bincount(celulas, weights=cores_rgb[:, canal], minlength=linhas * colunas) for canal in range(3)], axis=1)
+    cores_celulas = soma[ocupadas] / quantidades[ocupadas, None]
+    maximo = quantidades.max()
+    opacidade = np.ones(ocupadas.sum())
+    if maximo > 1:
+        opacidade = OPACIDADE_MINIMA + (1 - OPACIDADE_MINIMA) * np.log(quantidades[ocupadas]) / np.log(maximo)
+
+    grade = np.empty((linhas * colunas, 3))
+    grade[:] = fundo
+    grade[ocupadas] = opacidade[:, None] * cores_celulas + (1 - opacidade[:, None]) * grade[ocupadas]
+    grade = np.rint(grade).astype(np.uint8).reshape(linhas, colunas, 3)
+
+    # Cada celula ocupa tamanho_celula x tamanho_celula pixels da imagem
+    imagem[:] = np.repeat(np.repeat(grade, tamanho_celula, axis=0), tamanho_celula, axis=1)[:altura, :largura]
+    return imagem
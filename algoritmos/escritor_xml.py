@@ -0,0 +1,241 @@
+import numpy as np
+from xml.sax.saxutils import quoteattr
+from algoritmos.geometria import TIPO_PONTO, TIPO_RETA, TIPO_POLIGONO, aplicar_matriz, matriz_viewport
+from algoritmos.poligonos import Ponto, Reta, Poligono
+
+# Nome do elemento XML de cada tipo de forma
+ELEMENTOS = {TIPO_PONTO: 'ponto', TIPO_RETA: 'reta', TIPO_POLIGONO: 'poligono'}
+
+"""
+Aplica a transformada de viewport a um conjunto de coordenadas normalizadas de uma só vez
+Equivalente a window2viewport da interface, aplicada a todos os vertices
+Parâmetros:
+    normalizadas (numpy.ndarray): Coordenadas normalizadas (N,2)
+    window (dict): Limites da window normalizada
+    viewport (dict): Limites da viewport
+Retorna:
+    numpy.ndarray: Coordenadas na viewport (N,2)
+"""
+def coordenadas_viewport(normalizadas, window, viewport):
+    return aplicar_matriz(matriz_viewport(window, viewport), normalizadas)
+
+"""
+Classe EscritorXML -> Escreve um arquivo de saída XML de forma incremental
+Os elementos sao gerados como texto e gravados em lotes de vertices, sem montar a arvore do documento,
+de modo que a memória utilizada nao depende do tamanho da cena.
+Cada vertice pode conter, além das coordenadas de mundo (x, y), as coordenadas normalizadas
+(x_norm, y_norm) e as coordenadas na viewport (x_viewport, y_viewport).
+Atributos:
+    caminho (str): Caminho do arquivo de saída
+    window_normalizada (dict): Window normalizada, necessária para as coordenadas na viewport
+    viewport (dict): Limites da viewport
+    matriz_normalizada (numpy.ndarray): Matriz de normalização, necessária para escrever formas a partir
+        apenas das coordenadas normalizadas (formas recortadas)
+    incluir_normalizadas (bool): Se as coordenadas normalizadas sao escritas
+    incluir_viewport (bool): Se as coordenadas na viewport sao escritas
+    tamanho_lote (int): Numero aproximado de vertices gravados de cada vez
+"""
+class EscritorXML:
+    def __init__(self, caminho, viewport: dict, window: dict, world_size: dict = None, window_normalizada: dict = None,
+                 matriz_normalizada=None, incluir_normalizadas: bool = False, incluir_viewport: bool = False,
+                 tamanho_lote: int = 65536):
+        if incluir_viewport and window_normalizada is None:
+            raise ValueError("As coordenadas na viewport exigem a window normalizada")
+
+        self.caminho = caminho
+        self.viewport = viewport
+        self.window_normalizada = window_normalizada
+        self.matriz_normalizada = matriz_normalizada
+        self.incluir_normalizadas = incluir_normalizadas
+        self.incluir_viewport = incluir_viewport
+        self.tamanho_lote = max(int(tamanho_lote), 1)
+
+        # Formas recortadas aguardando a gravação do proximo lote
+        self._pendentes = []
+        self._vertices_pendentes = 0
+
+        nomes = ['x', 'y']
+        if incluir_normalizadas:
+            nomes += ['x_norm', 'y_norm']
+        if incluir_viewport:
+            nomes += ['x_viewport', 'y_viewport']
+        self._modelo_vertice = '<ponto ' + ' '.join(f'{nome}="%r"' for nome in nomes)
+
+        self.arquivo = open(caminho, 'w', encoding='utf-8')
+        self.arquivo.write('<dados>\n')
+        self._escrever_limites('viewport', 'vpmin', 'vpmax', viewport)
+        self._escrever_limites('window', 'wmin', 'wmax', window)
+        if world_size is not None:
+            self._escrever_limites('world_size', 'wsmin', 'wsmax', world_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        self.fechar()
+
+    def _escrever_limites(self, elemento, minimo, maximo, limites):
+        self.arquivo.write(
+            f'<{elemento}>'
+            f'<{minimo} x={quoteattr(str(limites["xmin"]))} y={quoteattr(str(limites["ymin"]))}/>'
+            f'<{maximo} x={quoteattr(str(limites["xmax"]))} y={quoteattr(str(limites["ymax"]))}/>'
+            f'</{elemento}>\n'
+        )
+
+    """
+    Escreve um conjunto de formas descrito por arrays (mesmo formato da GeometriaCena)
+    As formas sao divididas em lotes de aproximadamente tamanho_lote vertices; cada lote é convertido
+    em texto e gravado de uma só vez
+    Parâmetros:
+        tipos (numpy.ndarray): Tipo de cada forma
+        deslocamentos (numpy.ndarray): Os vertices da forma i sao coordenadas[deslocamentos[i]:deslocamentos[i+1]]
+        coordenadas (numpy.ndarray): Coordenadas de mundo (N,2)
+        indices_cor (numpy.ndarray): Indice da cor de cada forma em tabela_cores
+        tabela_cores (list): Cores utilizadas
+        normalizadas (numpy.ndarray): Coordenadas normalizadas (N,2), obrigatórias se incluir_normalizadas ou incluir_viewport
+        removidas (numpy.ndarray): Mascara opcional das formas que nao sao escritas (ver GeometriaCena.remover_forma)
+    """
+    def escrever_formas(self, tipos, deslocamentos, coordenadas, indices_cor, tabela_cores, normalizadas=None, removidas=None):
+        if (self.incluir_normalizadas or self.incluir_viewport) and normalizadas is None:
+            raise ValueError("As coordenadas normalizadas sao necessárias para esta exportação")
+
+        tipos = np.asarray(tipos)
+        deslocamentos = np.asarray(deslocamentos)
+        cores = [quoteattr(str(cor)) for cor in tabela_cores]
+
+        primeira = 0
+        while primeira < len(tipos):
+            # Ultima forma do lote: a que alcança tamanho_lote vertices (pelo menos uma forma por lote)
+            limite = deslocamentos[primeira] + self.tamanho_lote
+            ultima = max(int(np.searchsorted(deslocamentos, limite, side='right')) - 1, primeira + 1)
+            ultima = min(ultima, len(tipos))
+
+            self.arquivo.write(self._texto_lote(
+                tipos[primeira:ultima], deslocamentos[primeira:ultima + 1],
+                coordenadas, normalizadas, indices_cor[primeira:ultima], cores,
+                None if removidas is None else removidas[primeira:ultima]
+            ))
+            primeira = ultima
+
+    # Converte um lote de formas em texto XML
+    def _texto_lote(self, tipos, deslocamentos, coordenadas, normalizadas, indices_cor, cores, removidas=None):
+        inicio, fim = int(deslocamentos[0]), int(deslocamentos[-1])
+
+        colunas = [np.asarray(coordenadas[inicio:fim], dtype=float)]
+        if self.incluir_normalizadas:
+            colunas.append(np.asarray(normalizadas[inicio:fim], dtype=float))
+        if self.incluir_viewport:
+            colunas.append(coordenadas_viewport(normalizadas[inicio:fim], self.window_normalizada, self.viewport))
+
+        modelo = self._modelo_vertice
+        vertices = [modelo % tuple(linha) for linha in np.hstack(colunas).tolist()]
+
+        removidas = [False] * len(tipos) if removidas is None else np.asarray(removidas).tolist()
+        partes = []
+        for tipo, primeiro, ultimo, cor, removida in zip(tipos.tolist(), deslocamentos[:-1].tolist(), deslocamentos[1:].tolist(),
+                                                          np.asarray(indices_cor).tolist(), removidas):
+            if removida:
+                continue
+            primeiro -= inicio
+            ultimo -= inicio
+            if tipo == TIPO_PONTO:
+                partes.append(f'{vertices[primeiro]} cor={cores[cor]}/>\n')
+            elif ultimo > primeiro:
+                elemento = ELEMENTOS[tipo]
+                partes.append(f'<{elemento} cor={cores[cor]}>' + '/>'.join(vertices[primeiro:ultimo]) + f'/></{elemento}>\n')
+            else:
+                partes.append(f'<{ELEMENTOS[tipo]} cor={cores[cor]}/>\n')
+        return ''.join(partes)
+
+    """
+    Escreve uma forma a partir de suas coordenadas normalizadas (ex.: forma recortada)
+    As coordenadas de mundo sao recuperadas pela inversa da matriz de normalização. As formas ficam
+    acumuladas e sao gravadas em lote quando tamanho_lote vertices forem atingidos
+    Parâmetros:
+        forma (Ponto | Reta | Poligono): Forma com as coordenadas normalizadas (x_norm, y_norm) definidas
+    """
+    def escrever_forma_normalizada(self, forma):
+        if isinstance(forma, Ponto):
+            tipo = TIPO_PONTO
+        elif isinstance(forma, Reta):
+            tipo = TIPO_RETA
+        elif isinstance(forma, Poligono):
+            tipo = TIPO_POLIGONO
+        else:
+            raise TypeError(f"Forma nao suportada: {type(forma).__name__}")
+
+        vertices = [(ponto.x_norm, ponto.y_norm) for ponto in forma.vertices()]
+        self._pendentes.append((tipo, vertices, forma.cor))
+        self._vertices_pendentes += len(vertices)
+        if self._vertices_pendentes >= self.tamanho_lote:
+            self._gravar_pendentes()
+
+    def _gravar_pendentes(self):
+        if not self._pendentes:
+            return
+        if self.matriz_normalizada is None:
+            raise ValueError("A matriz de normalização é necessária para escrever formas normalizadas")
+
+        tabela_cores = []
+        indice_cores = {}
+        tipos = np.empty(len(self._pendentes), dtype=np.int8)
+        indices_cor = np.empty(len(self._pendentes), dtype=np.int32)
+        deslocamentos = np.zeros(len(self._pendentes) + 1, dtype=np.int64)
+        normalizadas = []
+        for i, (tipo, vertices, cor) in enumerate(self._pendentes):
+            if cor not in indice_cores:
+                indice_cores[cor] = len(tabela_cores)
+                tabela_cores.append(cor)
+            tipos[i] = tipo
+            indices_cor[i] = indice_cores[cor]
+            deslocamentos[i + 1] = deslocamentos[i] + len(vertices)
+            normalizadas.extend(vertices)
+
+        normalizadas = np.asarray(normalizadas, dtype=float).reshape(-1, 2)
+        inversa = np.linalg.inv(np.asarray(self.matriz_normalizada, dtype=float))
+        coordenadas = normalizadas @ inversa[:2, :2].T + inversa[:2, 2]
+
+        self._pendentes = []
+        self._vertices_pendentes = 0
+        self.escrever_formas(tipos, deslocamentos, coordenadas, indices_cor, tabela_cores, normalizadas)
+
+    """
+    Grava as formas pendentes, fecha o elemento raiz e o arquivo
+    """
+    def fechar(self):
+        if self.arquivo.closed:
+            return
+        try:
+            self._gravar_pendentes()
+            self.arquivo.write('</dados>\n')
+        finally:
+            self.arquivo.close()
+
+"""
+Exporta uma cena para um arquivo XML de forma incremental
+Parâmetros:
+    caminho (str): Caminho do arquivo de saída
+    viewport, window, world_size (dict): Limites gravados no cabeçalho do arquivo
+    geometria (GeometriaCena): Formas da cena (todas, exceto as removidas, sao exportadas quando formas_recortadas é omitido)
+    window_normalizada (dict): Window normalizada (necessária para incluir_viewport)
+    matriz_normalizada (numpy.ndarray): Matriz de normalização (necessária para formas_recortadas)
+    incluir_normalizadas (bool): Escreve as coordenadas normalizadas de cada vertice
+    incluir_viewport (bool): Escreve as coordenadas de cada vertice na viewport
+    formas_recortadas (iterable): Formas recortadas visiveis; quando informado, apenas elas sao exportadas
+    tamanho_lote (int): Numero aproximado de vertices gravados de cada vez
+"""
+def exportar_cena_xml(caminho, viewport, window, geometria=None, world_size=None, window_normalizada=None,
+                      matriz_normalizada=None, incluir_normalizadas=False, incluir_viewport=False,
+                      formas_recortadas=None, tamanho_lote: int = 65536):
+    with EscritorXML(caminho, viewport, window, world_size, window_normalizada, matriz_normalizada,
+                     incluir_normalizadas, incluir_viewport, tamanho_lote) as escritor:
+        if formas_recortadas is not None:
+            for forma in formas_recortadas:
+                escritor.escrever_forma_normalizada(forma)
+        elif geometria is not None:
+            # As formas removidas da cena (ver GeometriaCena.remover_forma) sao ignoradas durante a escrita, sem copiar a cena
+            escritor.escrever_formas(
+                geometria.tipos, geometria.deslocamentos, geometria.coordenadas,
+                geometria.indices_cor, geometria.tabela_cores, geometria.normalizadas,
+                geometria.removidas if geometria.n_removidas else None
+            )
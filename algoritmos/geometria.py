@@ -0,0 +1,568 @@
+import numpy as np
+from algoritmos.poligonos import Ponto, Reta, Poligono, Orientacao
+
+"""
+Tipos de forma armazenados na geometria compacta
+"""
+TIPO_PONTO = 0
+TIPO_RETA = 1
+TIPO_POLIGONO = 2
+
+"""
+Classe GeometriaCena -> Armazena todas as formas de uma cena em arrays (estrutura de arrays)
+Em vez de um objeto Ponto por vertice, as coordenadas ficam em arrays contiguos e cada forma
+é descrita apenas pelo seu tipo, cor, visibilidade e pelo intervalo de vertices que ocupa.
+Atributos:
+    coordenadas (numpy.ndarray): Coordenadas (x, y) de mundo de todos os vertices (N,2)
+    normalizadas (numpy.ndarray): Coordenadas normalizadas (x_norm, y_norm) de todos os vertices (N,2)
+    deslocamentos (numpy.ndarray): Os vertices da forma i sao coordenadas[deslocamentos[i]:deslocamentos[i+1]]
+    tipos (numpy.ndarray): Tipo de cada forma (TIPO_PONTO, TIPO_RETA ou TIPO_POLIGONO)
+    indices_cor (numpy.ndarray): Indice da cor de cada forma em tabela_cores
+    visiveis (numpy.ndarray): Visibilidade de cada forma
+    removidas (numpy.ndarray): Formas removidas (ver remover_forma); os indices das demais formas nao mudam
+    caixas (numpy.ndarray): Caixa envolvente (xmin, ymin, xmax, ymax) normalizada de cada forma, atualizada a cada normalização
+    caixas_mundo (numpy.ndarray): Caixa envolvente de cada forma em coordenadas de mundo (NaN nas formas removidas)
+    tabela_cores (list): Cores distintas utilizadas pelas formas
+    n_removidas (int): Numero de formas removidas
+"""
+class GeometriaCena:
+    def __init__(self, capacidade_vertices: int = 1024, capacidade_formas: int = 256):
+        self.n_vertices = 0
+        self.n_formas = 0
+        self.n_removidas = 0
+        self.tabela_cores = []
+        self._indice_cores = {}
+
+        self._coordenadas = np.empty((max(capacidade_vertices, 1), 2))
+        self._normalizadas = np.empty((max(capacidade_vertices, 1), 2))
+        self._deslocamentos = np.zeros(max(capacidade_formas, 1) + 1, dtype=np.int64)
+        self._tipos = np.empty(max(capacidade_formas, 1), dtype=np.int8)
+        self._indices_cor = np.empty(max(capacidade_formas, 1), dtype=np.int32)
+        self._visiveis = np.ones(max(capacidade_formas, 1), dtype=bool)
+        self._removidas = np.zeros(max(capacidade_formas, 1), dtype=bool)
+        self._caixas = None
+        self._caixas_mundo = None
+
+    """
+    Cria uma geometria a partir de arrays já existentes (ex.: arrays mapeados em memória)
+    Os arrays de mundo nao sao copiados; as caixas envolventes de mundo podem ser fornecidas prontas
+    """
+    @classmethod
+    def de_arrays(cls, coordenadas, deslocamentos, tipos, indices_cor, tabela_cores, caixas_mundo=None):
+        geometria = cls.__new__(cls)
+        geometria.n_vertices = len(coordenadas)
+        geometria.n_formas = len(tipos)
+        geometria.n_removidas = 0
+        geometria.tabela_cores = list(tabela_cores)
+        geometria._indice_cores = {cor: i for i, cor in enumerate(geometria.tabela_cores)}
+
+        geometria._coordenadas = coordenadas
+        geometria._normalizadas = np.empty((len(coordenadas), 2))
+        geometria._deslocamentos = deslocamentos
+        geometria._tipos = tipos
+        geometria._indices_cor = indices_cor
+        geometria._visiveis = np.ones(len(tipos), dtype=bool)
+        geometria._removidas = np.zeros(len(tipos), dtype=bool)
+        geometria._caixas = None
+        geometria._caixas_mundo = caixas_mundo
+        return geometria
+
+    @property
+    def coordenadas(self):
+        return self._coordenadas[:self.n_vertices]
+
+    @property
+    def normalizadas(self):
+        return self._normalizadas[:self.n_vertices]
+
+    @property
+    def deslocamentos(self):
+        return self._deslocamentos[:self.n_formas + 1]
+
+    @property
+    def tipos(self):
+        return self._tipos[:self.n_formas]
+
+    @property
+    def indices_cor(self):
+        return self._indices_cor[:self.n_formas]
+
+    @property
+    def visiveis(self):
+        return self._visiveis[:self.n_formas]
+
+    @property
+    def removidas(self):
+        return self._removidas[:self.n_formas]
+
+    # As caixas ficam em arrays com folga no final, para que as formas adicionadas nao exijam copia-los
+    @property
+    def caixas(self):
+        if self._caixas is None or len(self._caixas) < self.n_formas:
+            self._caixas = self._marcar_removidas(caixas_envolventes(self.normalizadas, self.deslocamentos))
+        return self._caixas[:self.n_formas]
+
+    @property
+    def caixas_mundo(self):
+        if self._caixas_mundo is None or len(self._caixas_mundo) < self.n_formas:
+            self._caixas_mundo = self._marcar_removidas(caixas_envolventes(self.coordenadas, self.deslocamentos))
+        return self._caixas_mundo[:self.n_formas]
+
+    # Caixas das formas removidas: NaN, que nao intercepta nenhuma região
+    def _marcar_removidas(self, caixas):
+        if self.n_removidas:
+            caixas[self.removidas] = np.nan
+        return caixas
+
+    """
+    Garante espaço para mais vertices e formas, dobrando a capacidade dos arrays quando necessário
+    """
+    def _reservar(self, novos_vertices: int, novas_formas: int):
+        necessario = self.n_vertices + novos_vertices
+        if necessario > min(len(self._coordenadas), len(self._normalizadas)):
+            capacidade = max(necessario, 2 * len(self._coordenadas))
+            self._coordenadas = self._redimensionar(self._coordenadas, self.n_vertices, (capacidade, 2))
+            self._normalizadas = self._redimensionar(self._normalizadas, self.n_vertices, (capacidade, 2))
+
+        necessario = self.n_formas + novas_formas
+        if necessario > len(self._tipos):
+            capacidade = max(necessario, 2 * len(self._tipos))
+            self._deslocamentos = self._redimensionar(self._deslocamentos, self.n_formas + 1, (capacidade + 1,))
+            self._tipos = self._redimensionar(self._tipos, self.n_formas, (capacidade,))
+            self._indices_cor = self._redimensionar(self._indices_cor, self.n_formas, (capacidade,))
+            self._visiveis = self._redimensionar(self._visiveis, self.n_formas, (capacidade,))
+            self._removidas = self._redimensionar(self._removidas, self.n_formas, (capacidade,))
+
+    @staticmethod
+    def _redimensionar(array, usados, formato):
+        novo = np.empty(formato, dtype=array.dtype)
+        novo[:usados] = array[:usados]
+        return novo
+
+    # Acrescenta uma linha a um array com folga (caixas), dobrando a capacidade quando necessário
+    @classmethod
+    def _acrescentar(cls, array, usados, linha):
+        if usados >= len(array):
+            array = cls._redimensionar(array, usados, (max(2 * len(array), usados + 1),) + array.shape[1:])
+        array[usados] = linha
+        return array
+
+    # Retorna o indice da cor na tabela de cores, adicionando a cor caso ainda nao exista
+    def indice_cor(self, cor):
+        indice = self._indice_cores.get(cor)
+        if indice is None:
+            indice = len(self.tabela_cores)
+            self.tabela_cores.append(cor)
+            self._indice_cores[cor] = indice
+        return indice
+
+    """
+    Adiciona uma forma com suas coordenadas de mundo
+    Parâmetros:
+        tipo (int): Tipo da forma
+        coordenadas (numpy.ndarray): Vertices da forma (K,2)
+        cor (str): Cor da forma
+    Retorna:
+        int: Indice da forma adicionada
+    """
+    def _adicionar_forma(self, tipo, coordenadas, cor):
+        quantidade = len(coordenadas)
+        self._reservar(quantidade, 1)
+
+        inicio = self.n_vertices
+        self._coordenadas[inicio:inicio + quantidade] = coordenadas
+        self._normalizadas[inicio:inicio + quantidade] = coordenadas
+
+        indice = self.n_formas
+        self._tipos[indice] = tipo
+        self._indices_cor[indice] = self.indice_cor(cor)
+        self._visiveis[indice] = True
+        self._removidas[indice] = False
+        self._deslocamentos[indice + 1] = inicio + quantidade
+
+        # As caixas já calculadas recebem apenas a da nova forma (a normalizada vale ate normalizar_formas);
+        # enquanto nao foram calculadas (ex.: na leitura do arquivo) nada é feito por forma
+        if self._caixas_mundo is not None and len(self._caixas_mundo) >= indice:
+            self._caixas_mundo = self._acrescentar(self._caixas_mundo, indice, caixa_vertices(self._coordenadas, inicio, inicio + quantidade))
+        if self._caixas is not None and len(self._caixas) >= indice:
+            self._caixas = self._acrescentar(self._caixas, indice, caixa_vertices(self._coordenadas, inicio, inicio + quantidade))
+
+        self.n_vertices += quantidade
+        self.n_formas += 1
+        return indice
+
+    def adicionar_ponto(self, x: float, y: float, cor='black'):
+        return self._adicionar_forma(TIPO_PONTO, ((x, y),), cor)
+
+    def adicionar_reta(self, x1: float, y1: float, x2: float, y2: float, cor='black'):
+        return self._adicionar_forma(TIPO_RETA, ((x1, y1), (x2, y2)), cor)
+
+    def adicionar_poligono(self, coordenadas, cor='black'):
+        return self._adicionar_forma(TIPO_POLIGONO, np.asarray(coordenadas, dtype=float).reshape(-1, 2), cor)
+
+    """
+    Adiciona um objeto Ponto, Reta ou Poligono, copiando suas coordenadas de mundo para os arrays
+    """
+    def append(self, forma):
+        if isinstance(forma, Ponto):
+            return self.adicionar_ponto(forma.x, forma.y, forma.cor)
+        if isinstance(forma, Reta):
+            return self.adicionar_reta(forma.ponto1.x, forma.ponto1.y, forma.ponto2.x, forma.ponto2.y, forma.cor)
+        if isinstance(forma, Poligono):
+            return self.adicionar_poligono([(ponto.x, ponto.y) for ponto in forma.pontos], forma.cor)
+        raise TypeError(f"Forma nao suportada: {type(forma).__name__}")
+
+    """
+    Translada os vertices de uma forma (coordenadas de mundo)
+    As coordenadas normalizadas da forma só sao atualizadas na proxima normalização (ver normalizar_formas)
+    """
+    def mover_forma(self, indice: int, dx: float, dy: float):
+        self._verificar_forma(indice)
+        inicio, fim = self.intervalo(indice)
+        self._coordenadas[inicio:fim] += (dx, dy)
+        self._atualizar_caixa(self._caixas_mundo, self._coordenadas, indice)
+
+    """
+    Remove uma forma, sem mover as demais: a forma é apenas marcada como removida (e a sua caixa passa a ser NaN)
+    Os vertices continuam nos arrays ate a geometria ser compactada (ver compactada)
+    """
+    def remover_forma(self, indice: int):
+        self._verificar_forma(indice)
+        self._removidas[indice] = True
+        self.n_removidas += 1
+        for caixas in (self._caixas, self._caixas_mundo):
+            if caixas is not None and len(caixas) > indice:
+                caixas[indice] = np.nan
+
+    # Recalcula apenas a linha da forma em caixas já calculadas (ex.: após a edição de um vertice por uma visão);
+    # a caixa de uma forma removida continua NaN
+    def _atualizar_caixa(self, caixas, coordenadas, indice):
+        if caixas is not None and len(caixas) > indice and not self._removidas[indice]:
+            caixas[indice] = caixa_vertices(coordenadas, *self.intervalo(indice))
+
+    def _verificar_forma(self, indice):
+        if not 0 <= indice < self.n_formas:
+            raise IndexError("indice de forma fora do intervalo")
+        if self._removidas[indice]:
+            raise IndexError(f"a forma {indice} foi removida")
+
+    """
+    Retorna uma geometria sem as formas removidas (a propria geometria quando nenhuma foi removida)
+    As formas restantes mantêm a ordem, mas os seus indices mudam
+    """
+    def compactada(self):
+        if self.n_removidas == 0:
+            return self
+        formas = np.flatnonzero(~self.removidas)
+        vertices, quantidades = indices_vertices(self.deslocamentos, formas)
+        geometria = GeometriaCena.de_arrays(
+            self.coordenadas[vertices], np.concatenate(([0], np.cumsum(quantidades))), self.tipos[formas],
+            self.indices_cor[formas], self.tabela_cores
+        )
+        geometria.normalizadas[:] = self.normalizadas[vertices]
+        geometria.visiveis[:] = self.visiveis[formas]
+        return geometria
+
+    def clear(self):
+        self.n_vertices = 0
+        self.n_formas = 0
+        self.n_removidas = 0
+        self._caixas = None
+        self._caixas_mundo = None
+        self.tabela_cores = []
+        self._indice_cores = {}
+
+    def __len__(self):
+        return self.n_formas
+
+    """
+    Retorna uma visão (PontoVista, RetaVista ou PoligonoVista) da forma de indice i
+    A visão nao copia as coordenadas, lendo e escrevendo diretamente nos arrays
+    """
+    def __getitem__(self, indice: int):
+        if indice < 0:
+            indice += self.n_formas
+        if not 0 <= indice < self.n_formas:
+            raise IndexError("indice de forma fora do intervalo")
+
+        tipo = self._tipos[indice]
+        if tipo == TIPO_PONTO:
+            return PontoVista(self, int(self._deslocamentos[indice]), indice)
+        if tipo == TIPO_RETA:
+            return RetaVista(self, indice)
+        return PoligonoVista(self, indice)
+
+    def __iter__(self):
+        for indice in range(self.n_formas):
+            yield self[indice]
+
+    # Retorna o intervalo [inicio, fim) dos vertices da forma
+    def intervalo(self, indice: int):
+        return int(self._deslocamentos[indice]), int(self._deslocamentos[indice + 1])
+
+    def cor(self, indice: int):
+        return self.tabela_cores[self._indices_cor[indice]]
+
+    """
+    Normaliza todos os vertices da cena com uma unica operação matricial
+    Parâmetros:
+        matriz_normalizada (numpy.ndarray): Matriz de normalização
+    Retorna:
+        numpy.ndarray: Coordenadas normalizadas (N,2)
+    """
+    def normalizar(self, matriz_normalizada):
+        matriz = np.asarray(matriz_normalizada, dtype=float)
+        normalizadas = self.normalizadas
+        np.dot(self.coordenadas, matriz[:2, :2].T, out=normalizadas)
+        normalizadas += matriz[:2, 2]
+        self._caixas = None
+        return normalizadas
+
+    """
+    Normaliza apenas os vertices das formas informadas (ex.: formas adicionadas ou movidas), atualizando
+    as suas caixas normalizadas
+    Parâmetros:
+        indices (list): Indices das formas
+        matriz_normalizada (numpy.ndarray): Matriz de normalização (a mesma das demais formas)
+    """
+    def normalizar_formas(self, indices, matriz_normalizada):
+        indices = np.asarray(indices, dtype=np.int64)
+        vertices, quantidades = indices_vertices(self.deslocamentos, indices)
+        matriz = np.asarray(matriz_normalizada, dtype=float)
+        self._normalizadas[vertices] = np.dot(self._coordenadas[vertices], matriz[:2, :2].T) + matriz[:2, 2]
+        if self._caixas is not None and len(self._caixas) >= self.n_formas:
+            caixas = caixas_envolventes(self._normalizadas[vertices], np.concatenate(([0], np.cumsum(quantidades))))
+            caixas[self._removidas[indices]] = np.nan
+            self._caixas[indices] = caixas
+
+"""
+Calcula as caixas envolventes (xmin, ymin, xmax, ymax) de todas as formas de uma só vez
+Parâmetros:
+    coordenadas (numpy.ndarray): Vertices de todas as formas (N,2)
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma (S+1,)
+Retorna:
+    numpy.ndarray: Caixas (S,4); formas sem vertices recebem NaN
+"""
+def caixas_envolventes(coordenadas, deslocamentos):
+    caixas = np.full((len(deslocamentos) - 1, 4), np.nan)
+    inicio = deslocamentos[:-1]
+    com_vertices = deslocamentos[1:] > inicio
+    if com_vertices.any():
+        indices = inicio[com_vertices]
+        caixas[com_vertices, 0:2] = np.minimum.reduceat(coordenadas, indices, axis=0)
+        caixas[com_vertices, 2:4] = np.maximum.reduceat(coordenadas, indices, axis=0)
+    return caixas
+
+
+# Caixa envolvente (xmin, ymin, xmax, ymax) dos vertices inicio:fim de uma forma (NaN se ela nao tiver vertices)
+def caixa_vertices(coordenadas, inicio, fim):
+    if fim <= inicio:
+        return (np.nan, np.nan, np.nan, np.nan)
+    vertices = coordenadas[inicio:fim]
+    minimo = vertices.min(axis=0)
+    maximo = vertices.max(axis=0)
+    return (minimo[0], minimo[1], maximo[0], maximo[1])
+
+"""
+Retorna os indices dos vertices de um conjunto de formas, concatenados na ordem das formas
+Parâmetros:
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma (S+1,)
+    formas (numpy.ndarray): Indices das formas
+Retorna:
+    tuple: (indices dos vertices, quantidade de vertices de cada forma)
+"""
+def indices_vertices(deslocamentos, formas):
+    formas = np.asarray(formas, dtype=np.int64)
+    inicio = deslocamentos[formas]
+    quantidades = deslocamentos[formas + 1] - inicio
+    indices = np.arange(int(quantidades.sum())) - np.repeat(np.cumsum(quantidades) - quantidades - inicio, quantidades)
+    return indices, quantidades
+
+"""
+Matriz 3x3 da transformada de viewport: leva a window (coordenadas normalizadas ou de mundo)
+ao retangulo da viewport em pixels, com o eixo y invertido (como no canvas)
+Parâmetros:
+    window (dict): Limites da window (xmin, ymin, xmax, ymax)
+    viewport (dict): Limites da viewport
+"""
+def matriz_viewport(window, viewport):
+    escala_x = (viewport['xmax'] - viewport['xmin']) / (window['xmax'] - window['xmin'])
+    escala_y = (viewport['ymax'] - viewport['ymin']) / (window['ymax'] - window['ymin'])
+    return np.array([
+        [escala_x, 0, -window['xmin'] * escala_x],
+        [0, -escala_y, (viewport['ymax'] - viewport['ymin']) + window['ymin'] * escala_y],
+        [0, 0, 1],
+    ])
+
+"""
+Aplica uma matriz de transformação 3x3 a um array de coordenadas (N,2) de uma só vez
+"""
+def aplicar_matriz(matriz, coordenadas):
+    matriz = np.asarray(matriz, dtype=float)
+    return np.dot(np.asarray(coordenadas, dtype=float).reshape(-1, 2), matriz[:2, :2].T) + matriz[:2, 2]
+
+"""
+Classe PontoVista -> Ponto cujas coordenadas estão armazenadas em uma GeometriaCena
+Para pontos isolados, a cor e a visibilidade sao as da forma; para vertices de retas
+e poligonos a visibilidade é propria da visão (usada pelos algoritmos de clipping)
+"""
+class PontoVista(Ponto):
+    __slots__ = ('_geometria', '_indice', '_forma', '_visible')
+
+    def __init__(self, geometria: GeometriaCena, indice: int, forma: int):
+        self._geometria = geometria
+        self._indice = indice
+        self._forma = forma
+        self._visible = True
+        self.orientacao = Orientacao.NAO_UTILIZADA
+        self.intersecao = False
+
+    @property
+    def x(self):
+        return float(self._geometria._coordenadas[self._indice, 0])
+
+    @x.setter
+    def x(self, valor):
+        geometria = self._geometria
+        geometria._coordenadas[self._indice, 0] = valor
+        geometria._atualizar_caixa(geometria._caixas_mundo, geometria._coordenadas, self._forma)
+
+    @property
+    def y(self):
+        return float(self._geometria._coordenadas[self._indice, 1])
+
+    @y.setter
+    def y(self, valor):
+        geometria = self._geometria
+        geometria._coordenadas[self._indice, 1] = valor
+        geometria._atualizar_caixa(geometria._caixas_mundo, geometria._coordenadas, self._forma)
+
+    @property
+    def x_norm(self):
+        return float(self._geometria._normalizadas[self._indice, 0])
+
+    @x_norm.setter
+    def x_norm(self, valor):
+        geometria = self._geometria
+        geometria._normalizadas[self._indice, 0] = valor
+        geometria._atualizar_caixa(geometria._caixas, geometria._normalizadas, self._forma)
+
+    @property
+    def y_norm(self):
+        return float(self._geometria._normalizadas[self._indice, 1])
+
+    @y_norm.setter
+    def y_norm(self, valor):
+        geometria = self._geometria
+        geometria._normalizadas[self._indice, 1] = valor
+        geometria._atualizar_caixa(geometria._caixas, geometria._normalizadas, self._forma)
+
+    @property
+    def cor(self):
+        return self._geometria.cor(self._forma)
+
+    @cor.setter
+    def cor(self, valor):
+        self._geometria._indices_cor[self._forma] = self._geometria.indice_cor(valor)
+
+    @property
+    def visible(self):
+        if self._geometria._tipos[self._forma] == TIPO_PONTO:
+            return bool(self._geometria._visiveis[self._forma])
+        return self._visible
+
+    @visible.setter
+    def visible(self, valor):
+        if self._geometria._tipos[self._forma] == TIPO_PONTO:
+            self._geometria._visiveis[self._forma] = valor
+        else:
+            self._visible = valor
+
+    # A copia de uma visão é um Ponto comum, desacoplado dos arrays da geometria
+    def __deepcopy__(self, memo):
+        return self.copia()
+
+"""
+Classe RetaVista -> Reta cujos pontos estão armazenados em uma GeometriaCena
+"""
+class RetaVista(Reta):
+    __slots__ = ('_geometria', '_forma')
+
+    def __init__(self, geometria: GeometriaCena, forma: int):
+        self._geometria = geometria
+        self._forma = forma
+
+    @property
+    def ponto1(self):
+        return PontoVista(self._geometria, int(self._geometria._deslocamentos[self._forma]), self._forma)
+
+    @property
+    def ponto2(self):
+        return PontoVista(self._geometria, int(self._geometria._deslocamentos[self._forma]) + 1, self._forma)
+
+    @property
+    def cor(self):
+        return self._geometria.cor(self._forma)
+
+    @cor.setter
+    def cor(self, valor):
+        self._geometria._indices_cor[self._forma] = self._geometria.indice_cor(valor)
+
+    @property
+    def visible(self):
+        return bool(self._geometria._visiveis[self._forma])
+
+    @visible.setter
+    def visible(self, valor):
+        self._geometria._visiveis[self._forma] = valor
+
+    def caixa_envolvente(self):
+        return tuple(self._geometria.caixas[self._forma].tolist())
+
+    def __deepcopy__(self, memo):
+        reta = Reta(self.ponto1.copia(), self.ponto2.copia(), self.cor)
+        reta.visible = self.visible
+        return reta
+
+"""
+Classe PoligonoVista -> Poligono cujos pontos estão armazenados em uma GeometriaCena
+A lista de pontos (visões) é criada apenas no primeiro acesso
+"""
+class PoligonoVista(Poligono):
+    __slots__ = ('_geometria', '_forma', '_pontos')
+
+    def __init__(self, geometria: GeometriaCena, forma: int):
+        self._geometria = geometria
+        self._forma = forma
+        self._pontos = None
+
+    @property
+    def pontos(self):
+        if self._pontos is None:
+            inicio, fim = self._geometria.intervalo(self._forma)
+            self._pontos = [PontoVista(self._geometria, indice, self._forma) for indice in range(inicio, fim)]
+        return self._pontos
+
+    @property
+    def cor(self):
+        return self._geometria.cor(self._forma)
+
+    @cor.setter
+    def cor(self, valor):
+        self._geometria._indices_cor[self._forma] = self._geometria.indice_cor(valor)
+
+    @property
+    def visible(self):
+        return bool(self._geometria._visiveis[self._forma])
+
+    @visible.setter
+    def visible(self, valor):
+        self._geometria._visiveis[self._forma] = valor
+
+    def caixa_envolvente(self):
+        return tuple(self._geometria.caixas[self._forma].tolist())
+
+    def __deepcopy__(self, memo):
+        poligono = Poligono([ponto.copia() for ponto in self.pontos], self.cor)
+        poligono.visible = self.visible
+        return poligono
@@ -0,0 +1,183 @@
+import math
+import numpy as np
+
+# As formas adicionadas ou movidas depois da construção da grade ficam em uma lista de excedentes, testada
+# diretamente em toda consulta; a grade é reconstruida quando a lista passa de max(LIMITE_EXCEDENTES, formas / 64)
+LIMITE_EXCEDENTES = 1024
+
+"""
+Classe GradeUniforme -> Indice espacial em grade uniforme sobre as caixas envolventes das formas (coordenadas de mundo)
+Cada forma é registrada em todas as celulas que sua caixa envolvente cobre; a consulta de uma região retorna
+apenas as formas registradas nas celulas que a região cobre, em vez de percorrer todas as formas da cena.
+As celulas sao armazenadas em formato compacto (CSR): as formas da celula c sao formas[inicio[c]:inicio[c+1]]
+Formas adicionadas ou movidas (adicionar, atualizar) vao para a lista de excedentes, sem alterar as celulas;
+formas removidas (remover) recebem uma caixa NaN e deixam de aparecer nas consultas
+Atributos:
+    caixas (numpy.ndarray): Caixas envolventes (S,4) das formas em coordenadas de mundo
+    origem (tuple): Canto inferior esquerdo da grade
+    tamanho_celula (tuple): Largura e altura de cada celula
+    colunas, linhas (int): Dimensões da grade
+    grandes (numpy.ndarray): Formas que cobrem celulas demais e sao testadas diretamente em toda consulta
+    excedentes (numpy.ndarray): Formas adicionadas ou movidas desde a construção da grade, testadas diretamente
+    reconstrucoes (int): Numero de vezes em que a grade foi reconstruida pelo excesso de excedentes
+"""
+class GradeUniforme:
+    def __init__(self, caixas, celulas_por_eixo: int = None, max_celulas_por_forma: int = 256):
+        self._caixas = np.asarray(caixas, dtype=float).reshape(-1, 4)
+        self.n_formas = len(self._caixas)
+        self.celulas_por_eixo = celulas_por_eixo
+        self.max_celulas_por_forma = max_celulas_por_forma
+        self.reconstrucoes = 0
+        self._construir()
+
+    @property
+    def caixas(self):
+        return self._caixas[:self.n_formas]
+
+    # Distribui as formas nas celulas da grade e esvazia a lista de excedentes
+    def _construir(self):
+        caixas = self.caixas
+        validas = ~np.isnan(caixas).any(axis=1)
+        indices = np.flatnonzero(validas)
+
+        celulas_por_eixo = self.celulas_por_eixo
+        if celulas_por_eixo is None:
+            celulas_por_eixo = min(max(int(math.sqrt(len(indices))), 1), 1024)
+        self.colunas = self.linhas = celulas_por_eixo
+
+        if len(indices):
+            xmin, ymin = caixas[indices, 0].min(), caixas[indices, 1].min()
+            xmax, ymax = caixas[indices, 2].max(), caixas[indices, 3].max()
+        else:
+            xmin = ymin = 0.0
+            xmax = ymax = 1.0
+        self.origem = (xmin, ymin)
+        self.tamanho_celula = (max(xmax - xmin, 1e-12) / self.colunas, max(ymax - ymin, 1e-12) / self.linhas)
+
+        ix0, iy0 = self._celula(caixas[indices, 0], caixas[indices, 1])
+        ix1, iy1 = self._celula(caixas[indices, 2], caixas[indices, 3])
+        largura = ix1 - ix0 + 1
+        quantidade = largura * (iy1 - iy0 + 1)
+
+        # Formas que cobrem muitas celulas ficam fora da grade
+        grande = quantidade > self.max_celulas_por_forma
+        self.grandes = indices[grande]
+        indices, ix0, iy0, largura, quantidade = indices[~grande], ix0[~grande], iy0[~grande], largura[~grande], quantidade[~grande]
+
+        # Expande cada forma em um par (celula, forma) para cada celula coberta
+        formas = np.repeat(indices, quantidade)
+        deslocamento = np.arange(len(formas)) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+        larguras = np.repeat(largura, quantidade)
+        celulas = (np.repeat(iy0, quantidade) + deslocamento // larguras) * self.colunas + np.repeat(ix0, quantidade) + deslocamento % larguras
+
+        ordem = np.argsort(celulas, kind='stable')
+        self.formas = formas[ordem]
+        self.inicio = np.searchsorted(celulas[ordem], np.arange(self.colunas * self.linhas + 1))
+        self._excedentes = set()
+        self._lista_excedentes = None
+
+    def __len__(self):
+        return self.n_formas
+
+    @property
+    def excedentes(self):
+        if self._lista_excedentes is None:
+            self._lista_excedentes = np.fromiter(sorted(self._excedentes), dtype=np.int64, count=len(self._excedentes))
+        return self._lista_excedentes
+
+    # Retorna a coluna e a linha da grade que contem as coordenadas (limitadas a grade)
+    def _celula(self, x, y):
+        coluna = np.floor((np.asarray(x) - self.origem[0]) / self.tamanho_celula[0])
+        linha = np.floor((np.asarray(y) - self.origem[1]) / self.tamanho_celula[1])
+        return (np.clip(coluna, 0, self.colunas - 1).astype(np.int64),
+                np.clip(linha, 0, self.linhas - 1).astype(np.int64))
+
+    """
+    Registra uma nova forma (o proximo indice) com a sua caixa envolvente
+    Retorna:
+        int: Indice da forma no indice espacial
+    """
+    def adicionar(self, caixa):
+        indice = self.n_formas
+        if indice >= len(self._caixas):
+            caixas = np.empty((max(2 * len(self._caixas), indice + 1), 4))
+            caixas[:indice] = self._caixas[:indice]
+            self._caixas = caixas
+        self.n_formas += 1
+        self.atualizar(indice, caixa)
+        return indice
+
+    """
+    Atualiza a caixa envolvente de uma forma (ex.: forma movida); a caixa NaN remove a forma das consultas
+    """
+    def atualizar(self, indice, caixa):
+        self._caixas[indice] = caixa
+        if np.isnan(self._caixas[indice]).any():
+            self._excedentes.discard(indice)
+        else:
+            self._excedentes.add(indice)
+        self._lista_excedentes = None
+        if len(self._excedentes) > max(LIMITE_EXCEDENTES, self.n_formas // 64):
+            self.reconstrucoes += 1
+            self._construir()
+
+    """
+    Remove uma forma das consultas (o indice das demais formas nao muda)
+    """
+    def remover(self, indice):
+        self.atualizar(indice, np.nan)
+
+    """
+    Retorna os indices (em ordem crescente) das formas cuja caixa envolvente intercepta a região consultada
+    Parâmetros:
+        xmin, ymin, xmax, ymax (float): Região consultada em coordenadas de mundo
+    """
+    def consultar(self, xmin, ymin, xmax, ymax):
+        candidatas = [self.grandes, self.excedentes]
+
+        gxmax = self.origem[0] + self.tamanho_celula[0] * self.colunas
+        gymax = self.origem[1] + self.tamanho_celula[1] * self.linhas
+        if xmax >= self.origem[0] and xmin <= gxmax and ymax >= self.origem[1] and ymin <= gymax:
+            ix0, iy0 = self._celula(xmin, ymin)
+            ix1, iy1 = self._celula(xmax, ymax)
+            # As celulas de uma mesma linha da grade sao contiguas no formato CSR
+            for linha in range(int(iy0), int(iy1) + 1):
+                primeira = linha * self.colunas + int(ix0)
+                ultima = linha * self.colunas + int(ix1)
+                candidatas.append(self.formas[self.inicio[primeira]:self.inicio[ultima + 1]])
+
+        return self.filtrar(np.unique(np.concatenate(candidatas)), xmin, ymin, xmax, ymax)
+
+    """
+    Retorna, na mesma ordem, as formas informadas cuja caixa envolvente intercepta a região
+    (as formas removidas, com caixa NaN, nunca interceptam)
+    """
+    def filtrar(self, indices, xmin, ymin, xmax, ymax):
+        indices = np.asarray(indices, dtype=np.int64)
+        caixas = self._caixas[indices]
+        intercepta = (caixas[:, 2] >= xmin) & (caixas[:, 0] <= xmax) & (caixas[:, 3] >= ymin) & (caixas[:, 1] <= ymax)
+        return indices[intercepta]
+
+"""
+Calcula a extensão, em coordenadas de mundo, da região visivel pela window
+A window normalizada é levada de volta ao mundo pela inversa da matriz de normalização (com rotação e escala)
+e a caixa envolvente dos seus quatro cantos é retornada, com uma pequena margem para erros de arredondamento
+Parâmetros:
+    matriz_normalizada (numpy.ndarray): Matriz de normalização
+    limites (tuple): (xmin, ymin, xmax, ymax) da window normalizada
+Retorna:
+    tuple: (xmin, ymin, xmax, ymax) em coordenadas de mundo
+"""
+def extensao_mundo(matriz_normalizada, limites):
+    xmin, ymin, xmax, ymax = limites
+    cantos = np.array([
+        [xmin, xmin, xmax, xmax],
+        [ymin, ymax, ymin, ymax],
+        [1, 1, 1, 1],
+    ])
+    mundo = np.linalg.solve(np.asarray(matriz_normalizada, dtype=float), cantos)
+
+    wxmin, wymin = mundo[0].min(), mundo[1].min()
+    wxmax, wymax = mundo[0].max(), mundo[1].max()
+    margem = 1e-9 * max(wxmax - wxmin, wymax - wymin, 1.0)
+    return (float(wxmin - margem), float(wymin - margem), float(wxmax + margem), float(wymax + margem))
@@ -0,0 +1,194 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+"""
+Classe Instrumentacao -> Mede o tempo, as alocações e contadores de cada etapa do pipeline, por quadro
+As etapas sao marcadas com blocos with (instrumentacao.etapa('recorte_retas')), agrupadas em quadros
+(instrumentacao.quadro('movimentar')). Desativada, etapa() e quadro() retornam um contexto vazio compartilhado
+e contar() nao faz nada, de modo que o custo fica restrito a uma chamada por etapa.
+As alocações sao medidas pela variação de sys.getallocatedblocks() (blocos de memória do Python) em cada etapa.
+O quadro atual é mantido por thread: etapas de outra thread (ex.: o redesenho em segundo plano) nao entram nele
+Atributos:
+    ativa (bool): Se as medidas estao sendo registradas
+    quadros (deque): Ultimos quadros medidos (ver Quadro)
+    eventos (deque): Ultimas etapas medidas, no formato de eventos do Chrome Trace (exportar_trace)
+"""
+class Instrumentacao:
+    def __init__(self, ativa: bool = False, max_quadros: int = 1000, max_eventos: int = 100000):
+        self.ativa = ativa
+        self.quadros = deque(maxlen=max_quadros)
+        self.eventos = deque(maxlen=max_eventos)
+        self._local = threading.local()
+        self._origem = time.perf_counter()
+
+    # Quadro sendo medido na thread atual
+    @property
+    def _quadro_atual(self):
+        return getattr(self._local, 'quadro', None)
+
+    @_quadro_atual.setter
+    def _quadro_atual(self, quadro):
+        self._local.quadro = quadro
+
+    def ativar(self):
+        self.ativa = True
+
+    def desativar(self):
+        self.ativa = False
+        self._quadro_atual = None
+
+    # Descarta os quadros e eventos registrados
+    def limpar(self):
+        self.quadros.clear()
+        self.eventos.clear()
+
+    """
+    Retorna o contexto que mede um quadro (ex.: uma ação do usuario e o redesenho que ela causa)
+    Quadros aninhados sao medidos como etapas do quadro externo
+    """
+    def quadro(self, nome):
+        if not self.ativa:
+            return _CONTEXTO_VAZIO
+        if self._quadro_atual is not None:
+            return _Etapa(self, nome)
+        return _Quadro(self, nome)
+
+    """
+    Retorna o contexto que mede uma etapa do quadro atual
+    """
+    def etapa(self, nome):
+        if not self.ativa:
+            return _CONTEXTO_VAZIO
+        return _Etapa(self, nome)
+
+    """
+    Soma uma quantidade a um contador do quadro atual (ex.: formas recortadas, interseções calculadas)
+    """
+    def contar(self, nome, quantidade=1):
+        if self.ativa and self._quadro_atual is not None:
+            contadores = self._quadro_atual.contadores
+            contadores[nome] = contadores.get(nome, 0) + quantidade
+
+    """
+    Retorna o ultimo quadro medido, ou None
+    """
+    def ultimo_quadro(self):
+        return self.quadros[-1] if self.quadros else None
+
+    """
+    Grava os eventos registrados no formato Chrome Trace (JSON), que pode ser aberto em chrome://tracing ou no Perfetto
+    """
+    def exportar_trace(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({"traceEvents": list(self.eventos), "displayTimeUnit": "ms"}, arquivo)
+
+    # Registra uma etapa (ou quadro) concluida como evento do trace
+    def _registrar_evento(self, nome, inicio, duracao, argumentos):
+        self.eventos.append({
+            "name": nome,
+            "ph": "X",
+            "ts": (inicio - self._origem) * 1e6,
+            "dur": duracao * 1e6,
+            "pid": 1,
+            "tid": threading.get_ident(),
+            "args": argumentos,
+        })
+
+"""
+Classe Quadro -> Medidas de um quadro
+Atributos:
+    nome (str): Nome do quadro
+    duracao (float): Duração total do quadro (segundos)
+    etapas (dict): {etapa: duração acumulada no quadro (segundos)}
+    alocacoes (dict): {etapa: variação do numero de blocos de memória alocados}
+    contadores (dict): {contador: valor}
+"""
+class Quadro:
+    __slots__ = ('nome', 'inicio', 'duracao', 'etapas', 'alocacoes', 'contadores')
+
+    def __init__(self, nome, inicio):
+        self.nome = nome
+        self.inicio = inicio
+        self.duracao = 0.0
+        self.etapas = {}
+        self.alocacoes = {}
+        self.contadores = {}
+
+    def como_dict(self):
+        return {
+            "nome": self.nome,
+            "duracao_s": self.duracao,
+            "etapas_s": dict(self.etapas),
+            "alocacoes": dict(self.alocacoes),
+            "contadores": dict(self.contadores),
+        }
+
+    """
+    Texto com a duração do quadro, de cada etapa e os contadores (usado na sobreposição da interface)
+    """
+    def resumo(self):
+        linhas = [f"{self.nome}: {self.duracao * 1000:.1f} ms"]
+        for etapa, duracao in self.etapas.items():
+            linhas.append(f"  {etapa}: {duracao * 1000:.1f} ms ({self.alocacoes.get(etapa, 0):+d} blocos)")
+        for contador, valor in self.contadores.items():
+            linhas.append(f"  {contador}: {valor}")
+        return "\n".join(linhas)
+
+# Contexto sem efeito, compartilhado por todas as medidas quando a instrumentação esta desativada
+class _ContextoVazio:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        return False
+
+_CONTEXTO_VAZIO = _ContextoVazio()
+
+# Mede uma etapa: acumula a duração e as alocações no quadro atual e registra o evento do trace
+class _Etapa:
+    __slots__ = ('instrumentacao', 'nome', 'inicio', 'blocos')
+
+    def __init__(self, instrumentacao, nome):
+        self.instrumentacao = instrumentacao
+        self.nome = nome
+
+    def __enter__(self):
+        self.blocos = sys.getallocatedblocks()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        duracao = time.perf_counter() - self.inicio
+        blocos = sys.getallocatedblocks() - self.blocos
+        quadro = self.instrumentacao._quadro_atual
+        if quadro is not None:
+            quadro.etapas[self.nome] = quadro.etapas.get(self.nome, 0.0) + duracao
+            quadro.alocacoes[self.nome] = quadro.alocacoes.get(self.nome, 0) + blocos
+        self.instrumentacao._registrar_evento(self.nome, self.inicio, duracao, {"blocos": blocos})
+        return False
+
+# Mede um quadro: as etapas executadas dentro dele sao acumuladas no Quadro
+class _Quadro:
+    __slots__ = ('instrumentacao', 'quadro')
+
+    def __init__(self, instrumentacao, nome):
+        self.instrumentacao = instrumentacao
+        self.quadro = Quadro(nome, 0.0)
+
+    def __enter__(self):
+        self.instrumentacao._quadro_atual = self.quadro
+        self.quadro.inicio = time.perf_counter()
+        return self.quadro
+
+    def __exit__(self, tipo, valor, traceback):
+        quadro = self.quadro
+        quadro.duracao = time.perf_counter() - quadro.inicio
+        self.instrumentacao._quadro_atual = None
+        self.instrumentacao.quadros.append(quadro)
+        self.instrumentacao._registrar_evento(quadro.nome, quadro.inicio, quadro.duracao, dict(quadro.contadores))
+        return False
@@ -0,0 +1,141 @@
+import os
+import xml.etree.ElementTree as ET
+from algoritmos.geometria import GeometriaCena
+
+"""
+Classe Cena -> Agrupa o que é lido de um arquivo de entrada: viewport, window e as formas (geometria compacta)
+Atributos:
+    viewport (dict): Limites da viewport (xmin, ymin, xmax, ymax)
+    window (dict): Limites da window (xmin, ymin, xmax, ymax)
+    geometria (GeometriaCena): Formas da cena
+"""
+class Cena:
+    def __init__(self, viewport: dict = None, window: dict = None, geometria: GeometriaCena = None):
+        self.viewport = viewport if viewport is not None else {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0}
+        self.window = window if window is not None else {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0}
+        self.geometria = geometria if geometria is not None else GeometriaCena()
+
+"""
+Classe ArquivoMonitorado -> Arquivo binario que registra quantos bytes ja foram lidos pelo parser
+"""
+class ArquivoMonitorado:
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.lidos = 0
+
+    def read(self, tamanho=-1):
+        dados = self.arquivo.read(tamanho)
+        self.lidos += len(dados)
+        return dados
+
+"""
+Lê incrementalmente um arquivo XML de entrada, gerando cada elemento de primeiro nivel assim que ele é fechado
+Os elementos ja processados sao descartados, de modo que a arvore completa nunca fica em memória
+Parâmetros:
+    caminho (str): Caminho do arquivo XML
+    progresso (callable): Função opcional progresso(bytes_lidos, bytes_totais), chamada a cada intervalo_progresso formas
+    intervalo_progresso (int): Numero de formas entre duas chamadas de progresso
+Gera:
+    ('viewport', dict), ('window', dict),
+    ('ponto', (x, y), cor), ('reta', ((x1, y1), (x2, y2)), cor), ('poligono', [(x, y), ...], cor)
+"""
+def ler_elementos_xml(caminho, progresso=None, intervalo_progresso: int = 10000):
+    total = os.path.getsize(caminho)
+    formas = 0
+
+    with open(caminho, 'rb') as arquivo_xml:
+        arquivo = ArquivoMonitorado(arquivo_xml)
+        profundidade = 0
+        raiz = None
+
+        for evento, element in ET.iterparse(arquivo, events=('start', 'end')):
+            if evento == 'start':
+                profundidade += 1
+                if profundidade == 1:
+                    raiz = element
+                continue
+
+            profundidade -= 1
+            # Apenas os elementos filhos da raiz (<dados>) sao processados
+            if profundidade != 1:
+                continue
+
+            match(element.tag):
+                case 'viewport':
+                    yield ('viewport', {
+                        "xmin": int(element[0].attrib['x']),
+                        "ymin": int(element[0].attrib['y']),
+                        "xmax": int(element[1].attrib['x']),
+                        "ymax": int(element[1].attrib['y']),
+                    })
+
+                case 'window':
+                    yield ('window', {
+                        "xmin": float(element[0].attrib['x']),
+                        "ymin": float(element[0].attrib['y']),
+                        "xmax": float(element[1].attrib['x']),
+                        "ymax": float(element[1].attrib['y']),
+                    })
+
+                case 'ponto':
+                    formas += 1
+                    yield ('ponto', (float(element.attrib['x']), float(element.attrib['y'])), element.attrib.get('cor', 'black'))
+
+                case 'reta':
+                    formas += 1
+                    yield ('reta', (
+                        (float(element[0].attrib['x']), float(element[0].attrib['y'])),
+                        (float(element[1].attrib['x']), float(element[1].attrib['y']))
+                    ), element.attrib.get('cor', 'black'))
+
+                case 'poligono':
+                    formas += 1
+                    yield ('poligono', [(float(p.attrib['x']), float(p.attrib['y'])) for p in element], element.attrib.get('cor', 'black'))
+
+            # Descarta o elemento processado (e a referência da raiz para ele)
+            element.clear()
+            raiz.clear()
+
+            if progresso is not None and formas and formas % intervalo_progresso == 0:
+                progresso(arquivo.lidos, total)
+
+    if progresso is not None:
+        progresso(total, total)
+
+"""
+Carrega um arquivo XML de entrada de forma incremental, adicionando as formas diretamente na geometria compacta
+Parâmetros:
+    caminho (str): Caminho do arquivo XML
+    geometria (GeometriaCena): Geometria onde as formas sao adicionadas (uma nova é criada se omitida)
+    progresso (callable): Função opcional progresso(bytes_lidos, bytes_totais)
+    ao_ler_cabecalho (callable): Função opcional chamada com a Cena assim que viewport e window forem lidas,
+        antes das formas (nos arquivos de entrada, viewport e window aparecem primeiro)
+Retorna:
+    Cena: Viewport, window e geometria lidas
+"""
+def carregar_cena_xml(caminho, geometria: GeometriaCena = None, progresso=None, ao_ler_cabecalho=None) -> Cena:
+    cena = Cena(geometria=geometria)
+    lidos = set()
+
+    for elemento in ler_elementos_xml(caminho, progresso):
+        match(elemento[0]):
+            case 'viewport':
+                cena.viewport.update(elemento[1])
+                lidos.add('viewport')
+            case 'window':
+                cena.window.update(elemento[1])
+                lidos.add('window')
+            case 'ponto':
+                (x, y), cor = elemento[1], elemento[2]
+                cena.geometria.adicionar_ponto(x, y, cor)
+            case 'reta':
+                ((x1, y1), (x2, y2)), cor = elemento[1], elemento[2]
+                cena.geometria.adicionar_reta(x1, y1, x2, y2, cor)
+            case 'poligono':
+                cena.geometria.adicionar_poligono(elemento[1], elemento[2])
+
+        if ao_ler_cabecalho is not None and len(lidos) == 2:
+            ao_ler_cabecalho(cena)
+            ao_ler_cabecalho = None
+
+    return cena
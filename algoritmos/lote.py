@@ -0,0 +1,226 @@
+# Processamento em lote de arquivos de entrada, sem interface gráfica (nao importa o tkinter)
+# Uso (na raiz do projeto): python -m algoritmos.lote entradas/ [outro.xml ...] [--saida saidas] [--processos 4]
+#                                                  [--window 0 0 10 7.5] [--angulo 0] [--escala 1] [--reta liang]
+#                                                  [--poligono automatico] [--apenas-visiveis] [--png] [--resumo resumo.json]
+# Cada arquivo é lido (usando o cache binario), normalizado com a window, o angulo e a escala informados,
+# recortado e exportado no formato do arquivo de saída da interface. Os arquivos sao distribuidos entre os processos
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import algoritmos.poligonos as poligonos
+from algoritmos.cache_binario import carregar_cena
+from algoritmos.escritor_xml import exportar_cena_xml
+from algoritmos.renderizador import Renderizador, salvar_png
+
+ALGORITMOS_RETA = {"cohen-sutherland": 0, "liang-barsky": 1}
+
+ALGORITMOS_POLIGONO = {
+    "automatico": poligonos.RECORTE_AUTOMATICO,
+    "weiler-atherton": poligonos.RECORTE_WEILER_ATHERTON,
+    "weiler-atherton-indexado": poligonos.RECORTE_WEILER_ATHERTON_INDEXADO,
+    "sutherland-hodgman": poligonos.RECORTE_SUTHERLAND_HODGMAN,
+}
+
+"""
+Classe OpcoesLote -> Opções de visualização e de saída aplicadas a todos os arquivos do lote
+Atributos:
+    window (dict): Window aplicada a todas as cenas (None usa a window de cada arquivo)
+    angulo (float): Angulo de rotação da window (graus)
+    escala (float): Escala (zoom) da window
+    algoritmo_reta (int): 0 para Cohen-Sutherland, 1 para Liang-Barsky
+    algoritmo_poligono (int): Algoritmo de clipping de polígonos (constantes RECORTE_* de poligonos)
+    apenas_visiveis (bool): Exporta apenas as formas visiveis, já recortadas pela window
+    png (bool): Grava tambem a imagem da janela principal (PNG)
+    gravar_cache (bool): Grava o cache binario (.vo2d) dos arquivos lidos do XML
+"""
+class OpcoesLote:
+    def __init__(self, window: dict = None, angulo: float = 0.0, escala: float = 1.0, algoritmo_reta: int = 1,
+                 algoritmo_poligono: int = poligonos.RECORTE_AUTOMATICO, apenas_visiveis: bool = False,
+                 png: bool = False, gravar_cache: bool = True):
+        self.window = window
+        self.angulo = angulo
+        self.escala = escala
+        self.algoritmo_reta = algoritmo_reta
+        self.algoritmo_poligono = algoritmo_poligono
+        self.apenas_visiveis = apenas_visiveis
+        self.png = png
+        self.gravar_cache = gravar_cache
+
+"""
+Lista os arquivos XML de entrada, em ordem, com o caminho de saída de cada um
+Arquivos informados diretamente sao gravados na raiz do diretório de saída; os arquivos de um diretório
+mantêm, no diretório de saída, o caminho relativo a ele
+Parâmetros:
+    entradas (list): Arquivos e diretórios
+    saida (str): Diretório de saída
+    recursivo (bool): Percorre tambem os subdiretórios
+Retorna:
+    list: Pares (arquivo de entrada, arquivo de saída)
+"""
+def listar_arquivos(entradas, saida, recursivo=False):
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for raiz, diretorios, nomes in os.walk(entrada):
+                diretorios.sort()
+                if not recursivo:
+                    diretorios.clear()
+                for nome in sorted(nomes):
+                    if nome.lower().endswith(".xml"):
+                        caminho = os.path.join(raiz, nome)
+                        arquivos.append((caminho, os.path.join(saida, os.path.relpath(caminho, entrada))))
+        else:
+            arquivos.append((entrada, os.path.join(saida, os.path.basename(entrada))))
+    return arquivos
+
+"""
+Processa um arquivo: leitura, normalização, recorte e exportação
+Parâmetros:
+    entrada (str): Arquivo XML de entrada
+    saida (str): Arquivo XML de saída (a imagem, se pedida, é gravada ao lado, com extensão .png)
+    opcoes (OpcoesLote): Opções de visualização e de saída
+Retorna:
+    dict: Medidas do arquivo (formas, vertices e tempo de cada etapa, em segundos)
+"""
+def processar_arquivo(entrada, saida, opcoes: OpcoesLote):
+    inicio = time.perf_counter()
+    cena = carregar_cena(entrada, gravar_cache=opcoes.gravar_cache)
+    leitura = time.perf_counter()
+
+    renderizador = Renderizador(cena.viewport, opcoes.window or cena.window, orcamento_cache=0)
+    renderizador.algClippingReta = opcoes.algoritmo_reta
+    renderizador.algClippingPoligono = opcoes.algoritmo_poligono
+    renderizador.definir_formas(cena.geometria)
+    # Rotação e zoom aplicados como na interface (a window normalizada é a da visão inicial)
+    if opcoes.angulo:
+        renderizador.rotacionar(opcoes.angulo)
+    if opcoes.escala != 1.0:
+        renderizador.aplicar_zoom(opcoes.escala - 1.0)
+    renderizador.sincronizar_normalizacao()
+    normalizacao = time.perf_counter()
+
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    exportar_cena_xml(
+        saida,
+        renderizador.viewport,
+        renderizador.window,
+        renderizador.formas,
+        world_size=renderizador.world_size,
+        window_normalizada=renderizador.window_normalizada,
+        matriz_normalizada=renderizador.matriz_normalizada,
+        incluir_normalizadas=True,
+        incluir_viewport=True,
+        formas_recortadas=renderizador.recortar_formas() if opcoes.apenas_visiveis else None
+    )
+    if opcoes.png:
+        salvar_png(os.path.splitext(saida)[0] + ".png", renderizador.renderizar_imagem())
+    fim = time.perf_counter()
+
+    return {
+        "entrada": entrada,
+        "saida": saida,
+        "formas": len(cena.geometria),
+        "vertices": int(cena.geometria.n_vertices),
+        "leitura_s": leitura - inicio,
+        "normalizacao_s": normalizacao - leitura,
+        "recorte_exportacao_s": fim - normalizacao,
+        "total_s": fim - inicio,
+    }
+
+# Executa processar_arquivo registrando a falha em vez de interromper o lote
+def _processar_arquivo_seguro(entrada, saida, opcoes):
+    try:
+        return processar_arquivo(entrada, saida, opcoes)
+    except Exception as erro:
+        return {"entrada": entrada, "saida": saida, "erro": f"{type(erro).__name__}: {erro}"}
+
+"""
+Processa um lote de arquivos, distribuindo-os entre processos
+Parâmetros:
+    arquivos (list): Pares (arquivo de entrada, arquivo de saída), ver listar_arquivos
+    opcoes (OpcoesLote): Opções de visualização e de saída
+    processos (int): Numero de processos (padrão: numero de CPUs); com 1 processo o lote roda no proprio processo
+    ao_concluir (callable): Função opcional chamada com as medidas de cada arquivo, na ordem em que terminam
+Retorna:
+    list: Medidas de cada arquivo, na ordem de arquivos; arquivos com falha têm a chave "erro"
+"""
+def processar_lote(arquivos, opcoes: OpcoesLote, processos: int = None, ao_concluir=None):
+    processos = max(min(int(processos or os.cpu_count() or 1), len(arquivos)), 1)
+    resultados = [None] * len(arquivos)
+
+    if processos == 1:
+        for posicao, (entrada, saida) in enumerate(arquivos):
+            resultados[posicao] = _processar_arquivo_seguro(entrada, saida, opcoes)
+            if ao_concluir is not None:
+                ao_concluir(resultados[posicao])
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        tarefas = {
+            executor.submit(_processar_arquivo_seguro, entrada, saida, opcoes): posicao
+            for posicao, (entrada, saida) in enumerate(arquivos)
+        }
+        for tarefa in as_completed(tarefas):
+            resultados[tarefas[tarefa]] = tarefa.result()
+            if ao_concluir is not None:
+                ao_concluir(tarefa.result())
+    return resultados
+
+# Imprime a linha de um arquivo processado, com a sua vazão
+def imprimir_resultado(resultado):
+    if "erro" in resultado:
+        print(f"FALHA {resultado['entrada']}: {resultado['erro']}", file=sys.stderr)
+        return
+    total = max(resultado["total_s"], 1e-9)
+    print(f"{resultado['entrada']}: {resultado['formas']} formas, {resultado['vertices']} vertices em {total * 1000:.1f} ms "
+          f"({resultado['formas'] / total:.0f} formas/s, {resultado['vertices'] / total:.0f} vertices/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Processa arquivos de entrada em lote: leitura, normalização, recorte e exportação")
+    parser.add_argument("entradas", nargs="+", help="Arquivos XML ou diretórios com arquivos XML")
+    parser.add_argument("--saida", default="saidas", help="Diretório dos arquivos de saída")
+    parser.add_argument("--recursivo", action="store_true", help="Percorre tambem os subdiretórios")
+    parser.add_argument("--processos", type=int, help="Numero de processos (padrão: numero de CPUs)")
+    parser.add_argument("--window", type=float, nargs=4, metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
+                        help="Window aplicada a todas as cenas (padrão: a window de cada arquivo)")
+    parser.add_argument("--angulo", type=float, default=0.0, help="Angulo de rotação da window, em graus")
+    parser.add_argument("--escala", type=float, default=1.0, help="Escala (zoom) da window")
+    parser.add_argument("--reta", choices=ALGORITMOS_RETA, default="liang-barsky", help="Algoritmo de clipping de retas")
+    parser.add_argument("--poligono", choices=ALGORITMOS_POLIGONO, default="automatico", help="Algoritmo de clipping de polígonos")
+    parser.add_argument("--apenas-visiveis", action="store_true", help="Exporta apenas as formas visiveis, já recortadas")
+    parser.add_argument("--png", action="store_true", help="Grava tambem a imagem da janela principal")
+    parser.add_argument("--sem-cache", action="store_true", help="Nao grava o cache binario (.vo2d) ao lado das entradas")
+    parser.add_argument("--resumo", help="Arquivo JSON com as medidas de cada arquivo")
+    args = parser.parse_args()
+
+    window = None
+    if args.window is not None:
+        window = dict(zip(("xmin", "ymin", "xmax", "ymax"), args.window))
+    opcoes = OpcoesLote(window, args.angulo, args.escala, ALGORITMOS_RETA[args.reta], ALGORITMOS_POLIGONO[args.poligono],
+                        args.apenas_visiveis, args.png, not args.sem_cache)
+
+    arquivos = listar_arquivos(args.entradas, args.saida, args.recursivo)
+    if not arquivos:
+        parser.error("nenhum arquivo XML encontrado")
+
+    inicio = time.perf_counter()
+    resultados = processar_lote(arquivos, opcoes, args.processos, ao_concluir=imprimir_resultado)
+    duracao = time.perf_counter() - inicio
+
+    concluidos = [resultado for resultado in resultados if "erro" not in resultado]
+    formas = sum(resultado["formas"] for resultado in concluidos)
+    print(f"{len(concluidos)} de {len(arquivos)} arquivos em {duracao:.2f} s "
+          f"({len(concluidos) / duracao:.1f} arquivos/s, {formas / duracao:.0f} formas/s)")
+
+    if args.resumo:
+        with open(args.resumo, "w", encoding="utf-8") as arquivo:
+            json.dump({"duracao_s": duracao, "arquivos": resultados}, arquivo, indent=2)
+
+    if len(concluidos) < len(arquivos):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+# Pirâmide de tiles: o mundo pré-renderizado em varios niveis de zoom, com cache em disco
+# Uso (na raiz do projeto): python -m algoritmos.piramide_tiles entradas/entrada.xml [--diretorio entrada.tiles]
+#                                                              [--niveis 6] [--processos 4] [--limite-mb 1024]
+# A geração pode ser interrompida e retomada: os tiles já gravados no diretório nao sao renderizados novamente
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import algoritmos.poligonos as poligonos
+from algoritmos.cores import cor_rgb
+from algoritmos.geometria import GeometriaCena
+from algoritmos.renderizador import RAIO_PONTO, Renderizador, rasterizar, verificar_cancelamento
+
+# Tamanho (pixels) do lado de cada tile
+TAMANHO_TILE = 256
+
+# Margem (pixels) renderizada em volta de cada tile e descartada: as arestas criadas pelo recorte na borda
+# da window do tile e os pontos sobre a borda ficam na margem, sem marcar as junções entre os tiles
+MARGEM_TILE = 4
+
+NIVEIS_PADRAO = 6
+
+# Limite padrão do cache em disco (bytes)
+LIMITE_PADRAO = 1024 * 1024 * 1024
+
+# Tiles por tarefa na geração paralela
+TILES_POR_TAREFA = 16
+
+ARQUIVO_MANIFESTO = "piramide.json"
+VERSAO = 1
+
+"""
+Classe CacheTiles -> Cache de tiles em disco, com limite de tamanho
+Cada tile é um arquivo .npy (imagem RGB) em diretorio/nivel/coluna_linha.npy; tiles vazios (sem formas)
+sao gravados como imagens sem pixels. Os arquivos sao gravados de forma atômica (arquivo temporário
+renomeado), de modo que uma geração interrompida nunca deixa tiles incompletos. Quando o limite é
+ultrapassado, os tiles usados há mais tempo sao removidos. A ordem de uso fica em memória; ao abrir o cache ela
+vem da data de modificação dos arquivos, atualizada a cada leitura
+Atributos:
+    diretorio (str): Diretório do cache
+    limite_bytes (int): Tamanho maximo dos tiles gravados
+    tamanhos (OrderedDict): {(nivel, coluna, linha): tamanho do arquivo em bytes}, do tile usado há mais tempo ao mais recente
+    total_bytes (int): Soma dos tamanhos dos tiles
+    descartes (int): Tiles removidos pelo limite de tamanho
+"""
+class CacheTiles:
+    def __init__(self, diretorio, limite_bytes: int = LIMITE_PADRAO):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.tamanhos = OrderedDict()
+        self.total_bytes = 0
+        self.descartes = 0
+        os.makedirs(diretorio, exist_ok=True)
+        self._ler_diretorio()
+
+    def __contains__(self, chave):
+        return chave in self.tamanhos
+
+    def __len__(self):
+        return len(self.tamanhos)
+
+    # Caminho do arquivo de um tile
+    def caminho(self, chave):
+        return caminho_tile(self.diretorio, chave)
+
+    """
+    Retorna a imagem de um tile, ou None se ele nao estiver no cache
+    """
+    def obter(self, chave):
+        if chave not in self.tamanhos:
+            return None
+        caminho = self.caminho(chave)
+        try:
+            imagem = np.load(caminho)
+            os.utime(caminho)
+        except (OSError, ValueError):
+            self._esquecer(chave)
+            return None
+        self.tamanhos.move_to_end(chave)
+        return imagem
+
+    """
+    Grava um tile e remove os tiles mais antigos se o limite for ultrapassado
+    """
+    def guardar(self, chave, imagem):
+        self.registrar(chave, gravar_tile(self.caminho(chave), imagem))
+
+    """
+    Registra um tile gravado por outro processo (ver gravar_tile) e aplica o limite de tamanho
+    """
+    def registrar(self, chave, tamanho):
+        self.total_bytes += tamanho - self.tamanhos.get(chave, 0)
+        self.tamanhos[chave] = tamanho
+        self.tamanhos.move_to_end(chave)
+        if self.total_bytes > self.limite_bytes:
+            self._descartar_antigos(protegido=chave)
+
+    """
+    Remove um tile do cache (nada é feito se ele nao estiver no cache)
+    """
+    def remover(self, chave):
+        if chave not in self.tamanhos:
+            return
+        try:
+            os.remove(self.caminho(chave))
+        except OSError:
+            pass
+        self._esquecer(chave)
+
+    """
+    Remove todos os tiles do cache
+    """
+    def limpar(self):
+        for nome in os.listdir(self.diretorio):
+            caminho = os.path.join(self.diretorio, nome)
+            if os.path.isdir(caminho) and nome.isdigit():
+                shutil.rmtree(caminho, ignore_errors=True)
+        self.tamanhos = OrderedDict()
+        self.total_bytes = 0
+
+    # Lê os tiles do diretório, na ordem da data de modificação (uso)
+    def _ler_diretorio(self):
+        tiles = []
+        for nome_nivel in os.listdir(self.diretorio):
+            pasta = os.path.join(self.diretorio, nome_nivel)
+            if not (nome_nivel.isdigit() and os.path.isdir(pasta)):
+                continue
+            for nome in os.listdir(pasta):
+                coluna_linha, extensao = os.path.splitext(nome)
+                partes = coluna_linha.split("_")
+                if extensao != ".npy" or len(partes) != 2 or not all(parte.isdigit() for parte in partes):
+                    continue
+                chave = (int(nome_nivel), int(partes[0]), int(partes[1]))
+                estado = os.stat(os.path.join(pasta, nome))
+                tiles.append((estado.st_mtime, chave, estado.st_size))
+        for _, chave, tamanho in sorted(tiles):
+            self.tamanhos[chave] = tamanho
+            self.total_bytes += tamanho
+
+    def _esquecer(self, chave):
+        self.total_bytes -= self.tamanhos.pop(chave, 0)
+
+    # Remove os tiles usados há mais tempo (o inicio de tamanhos) ate o total voltar ao limite
+    def _descartar_antigos(self, protegido=None):
+        while self.total_bytes > self.limite_bytes and self.tamanhos:
+            chave = next(iter(self.tamanhos))
+            if chave == protegido:
+                if len(self.tamanhos) == 1:
+                    break
+                self.tamanhos.move_to_end(chave)
+                continue
+            try:
+                os.remove(self.caminho(chave))
+            except OSError:
+                pass
+            self._esquecer(chave)
+            self.descartes += 1
+
+"""
+Caminho do arquivo de um tile (nivel, coluna, linha) no diretório do cache
+"""
+def caminho_tile(diretorio, chave):
+    nivel, coluna, linha = chave
+    return os.path.join(diretorio, str(nivel), f"{coluna}_{linha}.npy")
+
+"""
+Grava a imagem de um tile de forma atômica (arquivo temporário renomeado) e retorna o tamanho do arquivo
+"""
+def gravar_tile(caminho, imagem):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        np.save(arquivo, imagem)
+    os.replace(temporario, caminho)
+    return os.path.getsize(caminho)
+
+"""
+Classe PiramideTiles -> O mundo pré-renderizado em tiles de TAMANHO_TILE pixels, em varios niveis de zoom
+O nivel z divide a extensão (o world_size, ampliado para conter todas as formas e tornado quadrado) em
+2**z x 2**z tiles. Cada tile é renderizado pelo pipeline normal (recorte das formas pela window do tile
+com os algoritmos selecionados e rasterização) e guardado no cache em disco. Visões sem rotação sao
+compostas a partir dos tiles do nivel mais proximo da escala da visão, sem recortar as formas novamente.
+O cache é associado a cena e aos parâmetros (impressao): se eles mudam, os tiles antigos sao descartados.
+Quando uma forma da cena é editada, apenas os tiles da região afetada sao descartados (invalidar).
+Com abrir_cache=False o diretório nao é lido (usado pelos processos da geração, que apenas gravam tiles)
+Atributos:
+    geometria (GeometriaCena): Formas da cena
+    extensao (dict): Extensão do mundo coberta pelo nivel 0
+    niveis (int): Numero de niveis da pirâmide
+    tamanho_tile (int): Lado de cada tile em pixels
+    cache (CacheTiles): Cache dos tiles em disco
+"""
+class PiramideTiles:
+    def __init__(self, geometria, diretorio, world_size: dict = None, niveis: int = NIVEIS_PADRAO,
+                 tamanho_tile: int = TAMANHO_TILE, limite_bytes: int = LIMITE_PADRAO, algoritmo_reta: int = 1,
+                 algoritmo_poligono: int = poligonos.RECORTE_AUTOMATICO, fundo: str = 'white', abrir_cache: bool = True):
+        self.diretorio = diretorio
+        self.world_size = dict(world_size or {"xmin": 0, "ymin": 0, "xmax": 50, "ymax": 37.5})
+        self.niveis = niveis
+        self.tamanho_tile = tamanho_tile
+        self.algoritmo_reta = algoritmo_reta
+        self.algoritmo_poligono = algoritmo_poligono
+        self.fundo = fundo
+        self.cache = CacheTiles(diretorio, limite_bytes) if abrir_cache else None
+        self._renderizador = None
+        self.definir_geometria(geometria)
+
+    """
+    Associa a pirâmide a uma cena, descartando os tiles gravados para outra cena ou outros parâmetros
+    """
+    def definir_geometria(self, geometria):
+        self.geometria = geometria
+        self._renderizador = None
+        self.extensao = extensao_piramide(self.world_size, geometria)
+        if self.cache is None:
+            return
+        self.impressao = self.calcular_impressao()
+
+        caminho = os.path.join(self.diretorio, ARQUIVO_MANIFESTO)
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                manifesto = json.load(arquivo)
+        except (OSError, ValueError):
+            manifesto = None
+        if manifesto is None or manifesto.get("impressao") != self.impressao:
+            self.cache.limpar()
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump({"versao": VERSAO, "impressao": self.impressao, "extensao": self.extensao,
+                           "tamanho_tile": self.tamanho_tile}, arquivo, indent=2)
+
+    """
+    Descarta, em todos os niveis, os tiles que cobrem uma região do mundo (ex.: a caixa de uma forma editada)
+    Os tiles sao renderizados novamente quando forem usados. O manifesto deixa de corresponder ao arquivo
+    da cena, de modo que os tiles sao descartados se o arquivo original for aberto novamente
+    Parâmetros:
+        caixa (tuple): (xmin, ymin, xmax, ymax) em coordenadas de mundo
+    """
+    def invalidar(self, caixa):
+        xmin, ymin, xmax, ymax = (float(valor) for valor in caixa)
+        if not all(math.isfinite(valor) for valor in (xmin, ymin, xmax, ymax)):
+            return
+        # O renderizador dos tiles tem o seu proprio indice espacial, que nao conhece a edição
+        self._renderizador = None
+        if self.cache is None:
+            return
+
+        if self.impressao is not None:
+            self.impressao = None
+            with open(os.path.join(self.diretorio, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as arquivo:
+                json.dump({"versao": VERSAO, "impressao": None, "extensao": self.extensao,
+                           "tamanho_tile": self.tamanho_tile}, arquivo, indent=2)
+
+        extensao = self.extensao
+        for nivel in range(self.niveis):
+            lado = self.tamanho_mundo_tile(nivel)
+            # Folga para os pontos, desenhados com RAIO_PONTO pixels em volta da coordenada
+            folga = (RAIO_PONTO + 1) * lado / self.tamanho_tile
+            ultimo = 2 ** nivel - 1
+            coluna0 = max(math.floor((xmin - folga - extensao["xmin"]) / lado), 0)
+            coluna1 = min(math.floor((xmax + folga - extensao["xmin"]) / lado), ultimo)
+            linha0 = max(math.floor((extensao["ymax"] - ymax - folga) / lado), 0)
+            linha1 = min(math.floor((extensao["ymax"] - ymin + folga) / lado), ultimo)
+            for linha in range(linha0, linha1 + 1):
+                for coluna in range(coluna0, coluna1 + 1):
+                    self.cache.remover((nivel, coluna, linha))
+
+    """
+    Impressão digital da cena e dos parâmetros que mudam as imagens dos tiles
+    """
+    def calcular_impressao(self):
+        geometria = self.geometria
+        resumo = hashlib.sha1()
+        for array in (geometria.coordenadas, geometria.deslocamentos, geometria.tipos, geometria.indices_cor):
+            resumo.update(np.ascontiguousarray(array).tobytes())
+        parametros = [VERSAO, geometria.tabela_cores, self.extensao, self.tamanho_tile, MARGEM_TILE,
+                      self.algoritmo_reta, self.algoritmo_poligono, self.fundo]
+        resumo.update(json.dumps(parametros, sort_keys=True).encode())
+        return resumo.hexdigest()
+
+    # Tamanho (unidades de mundo) do lado de um tile do nivel
+    def tamanho_mundo_tile(self, nivel):
+        return (self.extensao["xmax"] - self.extensao["xmin"]) / 2 ** nivel
+
+    """
+    Window (coordenadas de mundo) de um tile; as linhas sao contadas a partir do topo da extensão
+    Parâmetros:
+        margem (float): Margem em pixels do tile acrescentada em cada lado
+    """
+    def window_tile(self, nivel, coluna, linha, margem=0.0):
+        lado = self.tamanho_mundo_tile(nivel)
+        folga = margem * lado / self.tamanho_tile
+        xmin = self.extensao["xmin"] + coluna * lado
+        ymax = self.extensao["ymax"] - linha * lado
+        return {"xmin": xmin - folga, "ymin": ymax - lado - folga, "xmax": xmin + lado + folga, "ymax": ymax + folga}
+
+    """
+    Renderiza um tile com o pipeline de visualização
+    Retorna:
+        numpy.ndarray: Imagem RGB (tamanho_tile, tamanho_tile, 3), ou uma imagem sem pixels se o tile nao tem formas
+    """
+    def renderizar_tile(self, nivel, coluna, linha):
+        window = self.window_tile(nivel, coluna, linha, MARGEM_TILE)
+        renderizador = self.renderizador_tiles()
+        if len(renderizador.indice_espacial.consultar(window["xmin"], window["ymin"], window["xmax"], window["ymax"])) == 0:
+            return np.empty((0, 0, 3), dtype=np.uint8)
+
+        renderizador.window.update(window)
+        renderizador.normalizar()
+        lado = self.tamanho_tile + 2 * MARGEM_TILE
+        imagem = rasterizar(renderizador.gerar_comandos_cena(), lado, lado, self.fundo)
+        return imagem[MARGEM_TILE:MARGEM_TILE + self.tamanho_tile, MARGEM_TILE:MARGEM_TILE + self.tamanho_tile].copy()
+
+    """
+    Retorna a imagem de um tile, do cache ou renderizada (e guardada no cache)
+    """
+    def tile(self, nivel, coluna, linha):
+        chave = (nivel, coluna, linha)
+        imagem = self.cache.obter(chave)
+        if imagem is None:
+            imagem = self.renderizar_tile(nivel, coluna, linha)
+            self.cache.guardar(chave, imagem)
+        return imagem
+
+    # Renderizador usado nos tiles: viewport do tile com a margem, sem cache de quadros. A geometria é uma visão
+    # dos mesmos arrays com as suas proprias coordenadas normalizadas, para nao desfazer a normalização da interface
+    def renderizador_tiles(self):
+        if self._renderizador is None:
+            geometria = self.geometria
+            geometria = GeometriaCena.de_arrays(geometria.coordenadas, geometria.deslocamentos, geometria.tipos,
+                                                geometria.indices_cor, geometria.tabela_cores, caixas_mundo=geometria.caixas_mundo)
+            lado = self.tamanho_tile + 2 * MARGEM_TILE
+            renderizador = Renderizador({"xmin": 0, "ymin": 0, "xmax": lado, "ymax": lado},
+                                        self.window_tile(0, 0, 0, MARGEM_TILE), self.world_size, orcamento_cache=0)
+            renderizador.algClippingReta = self.algoritmo_reta
+            renderizador.algClippingPoligono = self.algoritmo_poligono
+            renderizador.definir_formas(geometria)
+            self._renderizador = renderizador
+        return self._renderizador
+
+    """
+    Retorna as chaves (nivel, coluna, linha) dos tiles dos niveis informados que ainda nao estao no cache
+    """
+    def tiles_pendentes(self, niveis=None):
+        pendentes = []
+        for nivel in (range(self.niveis) if niveis is None else niveis):
+            for linha in range(2 ** nivel):
+                for coluna in range(2 ** nivel):
+                    if (nivel, coluna, linha) not in self.cache:
+                        pendentes.append((nivel, coluna, linha))
+        return pendentes
+
+    """
+    Renderiza os tiles que ainda nao estao no cache, distribuindo-os entre processos
+    Uma geração interrompida é retomada a partir dos tiles já gravados
+    Parâmetros:
+        niveis (iterable): Niveis a gerar (padrão: todos)
+        processos (int): Numero de processos (padrão: numero de CPUs); com 1 processo os tiles sao gerados no proprio processo
+        ao_concluir (callable): Função opcional ao_concluir(tiles_concluidos, tiles_totais), chamada a cada tarefa
+    Retorna:
+        int: Numero de tiles gerados
+    """
+    def gerar(self, niveis=None, processos: int = None, ao_concluir=None):
+        pendentes = self.tiles_pendentes(niveis)
+        processos = max(int(processos or os.cpu_count() or 1), 1)
+        tarefas = [pendentes[i:i + TILES_POR_TAREFA] for i in range(0, len(pendentes), TILES_POR_TAREFA)]
+        concluidos = 0
+
+        if processos == 1 or len(tarefas) <= 1:
+            for tarefa in tarefas:
+                for chave in tarefa:
+                    self.cache.guardar(chave, self.renderizar_tile(*chave))
+                concluidos += len(tarefa)
+                if ao_concluir is not None:
+                    ao_concluir(concluidos, len(pendentes))
+            return concluidos
+
+        geometria = self.geometria
+        arrays = (geometria.coordenadas, geometria.deslocamentos, geometria.tipos, geometria.indices_cor, geometria.tabela_cores,
+                  geometria.caixas_mundo)
+        parametros = (self.diretorio, self.world_size, self.niveis, self.tamanho_tile, self.cache.limite_bytes,
+                      self.algoritmo_reta, self.algoritmo_poligono, self.fundo)
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo, initargs=(arrays, parametros)) as executor:
+            for gravados in executor.map(_gerar_tiles, tarefas):
+                for chave, tamanho in gravados:
+                    self.cache.registrar(chave, tamanho)
+                concluidos += len(gravados)
+                if ao_concluir is not None:
+                    ao_concluir(concluidos, len(pendentes))
+        return concluidos
+
+    """
+    Nivel cuja resolução é a mais proxima do tamanho de pixel informado (unidades de mundo)
+    """
+    def nivel_para(self, tamanho_pixel):
+        razao = self.tamanho_mundo_tile(0) / (self.tamanho_tile * tamanho_pixel)
+        if not math.isfinite(razao) or razao <= 0:
+            return 0
+        return min(max(int(round(math.log2(razao))), 0), self.niveis - 1)
+
+    """
+    Compõe a imagem de uma visão sem rotação a partir dos tiles do nivel mais proximo da sua escala
+    Os tiles que faltam sao renderizados e guardados no cache
+    Parâmetros:
+        window (dict): Região visivel do mundo
+        viewport (dict): Viewport (o tamanho da imagem)
+        cancelado (callable): Função opcional verificada a cada tile (ver verificar_cancelamento)
+    Retorna:
+        numpy.ndarray: Imagem RGB (altura, largura, 3) da viewport
+    """
+    def compor(self, window, viewport, cancelado=None):
+        largura = max(int(viewport["xmax"] - viewport["xmin"]), 0)
+        altura = max(int(viewport["ymax"] - viewport["ymin"]), 0)
+        imagem = np.empty((altura, largura, 3), dtype=np.uint8)
+        imagem[:] = cor_rgb(self.fundo, (255, 255, 255))
+        if largura == 0 or altura == 0:
+            return imagem
+
+        pixel_x = (window["xmax"] - window["xmin"]) / largura
+        pixel_y = (window["ymax"] - window["ymin"]) / altura
+        nivel = self.nivel_para(min(pixel_x, pixel_y))
+        pixel_nivel = self.tamanho_mundo_tile(nivel) / self.tamanho_tile
+        quantidade = 2 ** nivel
+
+        # Pixel do nivel (contado a partir do canto superior esquerdo da extensão) no centro de cada pixel da imagem
+        colunas = np.floor((window["xmin"] + (np.arange(largura) + 0.5) * pixel_x - self.extensao["xmin"]) / pixel_nivel).astype(np.int64)
+        linhas = np.floor((self.extensao["ymax"] - (window["ymax"] - (np.arange(altura) + 0.5) * pixel_y)) / pixel_nivel).astype(np.int64)
+        dentro_x = (colunas >= 0) & (colunas < quantidade * self.tamanho_tile)
+        dentro_y = (linhas >= 0) & (linhas < quantidade * self.tamanho_tile)
+        if not dentro_x.any() or not dentro_y.any():
+            return imagem
+
+        # Mosaico dos tiles que cobrem a visão
+        coluna0, coluna1 = colunas[dentro_x].min() // self.tamanho_tile, colunas[dentro_x].max() // self.tamanho_tile
+        linha0, linha1 = linhas[dentro_y].min() // self.tamanho_tile, linhas[dentro_y].max() // self.tamanho_tile
+        mosaico = np.empty(((linha1 - linha0 + 1) * self.tamanho_tile, (coluna1 - coluna0 + 1) * self.tamanho_tile, 3), dtype=np.uint8)
+        mosaico[:] = imagem[0, 0]
+        for linha in range(linha0, linha1 + 1):
+            for coluna in range(coluna0, coluna1 + 1):
+                verificar_cancelamento(cancelado)
+                tile = self.tile(nivel, coluna, linha)
+                if tile.size:
+                    y, x = (linha - linha0) * self.tamanho_tile, (coluna - coluna0) * self.tamanho_tile
+                    mosaico[y:y + self.tamanho_tile, x:x + self.tamanho_tile] = tile
+
+        indices_y = linhas[dentro_y] - linha0 * self.tamanho_tile
+        indices_x = colunas[dentro_x] - coluna0 * self.tamanho_tile
+        imagem[np.ix_(dentro_y, dentro_x)] = mosaico[np.ix_(indices_y, indices_x)]
+        return imagem
+
+"""
+Extensão quadrada coberta pelo nivel 0 da pirâmide: o world_size ampliado para conter todas as formas
+"""
+def extensao_piramide(world_size, geometria):
+    xmin, ymin, xmax, ymax = world_size["xmin"], world_size["ymin"], world_size["xmax"], world_size["ymax"]
+    if len(geometria):
+        caixas = geometria.caixas_mundo
+        xmin, ymin = min(xmin, float(np.nanmin(caixas[:, 0]))), min(ymin, float(np.nanmin(caixas[:, 1])))
+        xmax, ymax = max(xmax, float(np.nanmax(caixas[:, 2]))), max(ymax, float(np.nanmax(caixas[:, 3])))
+    lado = max(xmax - xmin, ymax - ymin)
+    cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+    return {"xmin": cx - lado / 2, "ymin": cy - lado / 2, "xmax": cx + lado / 2, "ymax": cy + lado / 2}
+
+# Pirâmide usada pelos processos da geração paralela (uma por processo)
+_piramide_processo = None
+
+def _iniciar_processo(arrays, parametros):
+    global _piramide_processo
+    _piramide_processo = PiramideTiles(GeometriaCena.de_arrays(*arrays), *parametros, abrir_cache=False)
+
+# Renderiza e grava os tiles de uma tarefa; retorna os pares (chave, tamanho do arquivo)
+def _gerar_tiles(chaves):
+    piramide = _piramide_processo
+    return [(chave, gravar_tile(caminho_tile(piramide.diretorio, chave), piramide.renderizar_tile(*chave))) for chave in chaves]
+
+def main():
+    from algoritmos.cache_binario import carregar_cena
+    from algoritmos.lote import ALGORITMOS_RETA, ALGORITMOS_POLIGONO
+
+    parser = argparse.ArgumentParser(description="Gera a pirâmide de tiles de um arquivo de entrada (a geração pode ser retomada)")
+    parser.add_argument("entrada", help="Arquivo XML de entrada")
+    parser.add_argument("--diretorio", help="Diretório dos tiles (padrão: o nome da entrada com a extensão .tiles)")
+    parser.add_argument("--niveis", type=int, default=NIVEIS_PADRAO)
+    parser.add_argument("--processos", type=int, help="Numero de processos (padrão: numero de CPUs)")
+    parser.add_argument("--limite-mb", type=float, default=LIMITE_PADRAO / (1024 * 1024), help="Tamanho maximo do cache em disco")
+    parser.add_argument("--reta", choices=ALGORITMOS_RETA, default="liang-barsky")
+    parser.add_argument("--poligono", choices=ALGORITMOS_POLIGONO, default="automatico")
+    args = parser.parse_args()
+
+    cena = carregar_cena(args.entrada)
+    diretorio = args.diretorio or os.path.splitext(args.entrada)[0] + ".tiles"
+    piramide = PiramideTiles(cena.geometria, diretorio, niveis=args.niveis, limite_bytes=int(args.limite_mb * 1024 * 1024),
+                             algoritmo_reta=ALGORITMOS_RETA[args.reta], algoritmo_poligono=ALGORITMOS_POLIGONO[args.poligono])
+
+    inicio = time.perf_counter()
+    def progresso(concluidos, totais):
+        print(f"\r{concluidos}/{totais} tiles", end="", flush=True)
+    gerados = piramide.gerar(processos=args.processos, ao_concluir=progresso)
+    duracao = time.perf_counter() - inicio
+    print(f"\n{gerados} tiles gerados em {duracao:.2f} s; {len(piramide.cache)} tiles no cache "
+          f"({piramide.cache.total_bytes / (1024 * 1024):.1f} MB, {piramide.cache.descartes} descartados pelo limite)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import numpy as np
+from algoritmos.poligonos import Ponto, Poligono, Window, limites_window
+
+"""
+Recorta os vertices de um polígono contra um unico lado da window (um semiplano)
+Cada aresta (atual -> proximo) gera ate dois vertices de saida, na ordem:
+    intersecção (quando a aresta cruza o lado) e o proximo vertice (quando ele esta dentro)
+Parametros:
+    coordenadas (numpy.ndarray): Vertices do polígono (K,2)
+    eixo (int): 0 para os lados verticais (x), 1 para os lados horizontais (y)
+    limite (float): Coordenada do lado da window
+    minimo (bool): True se o lado é o limite minimo (dentro significa >= limite)
+"""
+def recorta_semiplano(coordenadas, eixo, limite, minimo):
+    proximos = np.roll(coordenadas, -1, axis=0)
+    if minimo:
+        dentro_atual = coordenadas[:, eixo] >= limite
+        dentro_proximo = proximos[:, eixo] >= limite
+    else:
+        dentro_atual = coordenadas[:, eixo] <= limite
+        dentro_proximo = proximos[:, eixo] <= limite
+
+    cruza = dentro_atual != dentro_proximo
+    delta = proximos - coordenadas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = (limite - coordenadas[:, eixo]) / delta[:, eixo]
+        intersecoes = coordenadas + delta * u[:, None]
+    intersecoes[:, eixo] = limite
+
+    saida = np.stack((intersecoes, proximos), axis=1)           # (K,2,2)
+    mascara = np.stack((cruza, dentro_proximo), axis=1)         # (K,2)
+    return saida[mascara]
+
+"""
+Algoritmo de clipping de polígonos de Sutherland-Hodgman, apenas com coordenadas
+O polígono é recortado sucessivamente contra os quatro lados da window, com operações vetorizadas
+Parametros:
+    limites (tuple): (xmin, ymin, xmax, ymax) da window
+    coordenadas (numpy.ndarray): Vertices normalizados do polígono (K,2)
+Retorna:
+    numpy.ndarray: Vertices do polígono recortado (M,2); vazio quando o polígono esta totalmente fora
+"""
+def SutherlandHodgmanCoordenadas(limites, coordenadas):
+    xmin, ymin, xmax, ymax = limites
+    coordenadas = np.asarray(coordenadas, dtype=float).reshape(-1, 2)
+
+    for eixo, limite, minimo in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        if len(coordenadas) == 0:
+            break
+        coordenadas = recorta_semiplano(coordenadas, eixo, limite, minimo)
+
+    # Remove vertices repetidos consecutivos (vertices sobre os lados da window)
+    if len(coordenadas) > 1:
+        repetidos = (coordenadas == np.roll(coordenadas, 1, axis=0)).all(axis=1)
+        coordenadas = coordenadas[~repetidos]
+    return coordenadas
+
+"""
+Algoritmo de clipping de polígonos de Sutherland-Hodgman
+Mais simples e rapido que o de Weiler-Atherton, produz sempre um unico polígono de saida
+(polígonos concavos que se dividem em varias partes ficam ligados por arestas sobre os lados da window)
+Parametros:
+    window (Window): Window de recorte
+    poligono (Poligono): Polígono a ser recortado
+Retorna:
+    Poligono: Polígono recortado
+"""
+def SutherlandHodgmanPolygonClipping(window : Window, poligono : Poligono) -> Poligono:
+    coordenadas = [(ponto.x_norm, ponto.y_norm) for ponto in poligono.pontos]
+    recortado = SutherlandHodgmanCoordenadas(limites_window(window), coordenadas)
+
+    poligonoRecortado = Poligono(cor=poligono.cor)
+    for x_norm, y_norm in recortado.tolist():
+        poligonoRecortado.pontos.append(Ponto(x_norm, y_norm))
+
+    poligonoRecortado.visible = len(poligonoRecortado.pontos) > 0
+    return poligonoRecortado
@@ -1,8 +1,7 @@
 from itertools import cycle
 from enum import Enum
+import math
 from math import atan2
-import copy
-from copy import deepcopy
 import numpy as np
 
 """
@@ -17,6 +16,8 @@ Atributos:
     intersecao (bool): Indica se o ponto é uma interseção para o algoritmo de clipping de poligonos
 """
 class Ponto:
+    __slots__ = ('cor', 'x', 'y', 'x_norm', 'y_norm', 'visible', 'orientacao', 'intersecao')
+
     def __init__(self, x: float = 0, y: float = 0, orientacao=None, cor='black'):
         self.cor = cor
         self.x = x
@@ -45,6 +46,23 @@ class Ponto:
     def str_normalizado(self):
         return f"PontoNorm({self.x_norm},{self.y_norm})"
 
+    # Retorna uma copia do ponto sem utilizar copy.deepcopy (os atributos sao todos imutaveis)
+    def copia(self):
+        ponto = Ponto.__new__(Ponto)
+        ponto.cor = self.cor
+        ponto.x = self.x
+        ponto.y = self.y
+        ponto.x_norm = self.x_norm
+        ponto.y_norm = self.y_norm
+        ponto.visible = self.visible
+        ponto.orientacao = self.orientacao
+        ponto.intersecao = self.intersecao
+        return ponto
+
+    # Retorna a lista de vertices da forma (usado na normalização em lote)
+    def vertices(self):
+        return [self]
+
     """
     Criterios de igualdade para o ponto:
     - Coordenadas x e y
@@ -79,11 +97,14 @@ class Ponto:
 Classe Reta -> Representa uma reta com dois pontos
 """
 class Reta:
+    __slots__ = ('cor', 'ponto1', 'ponto2', 'visible', '_caixa')
+
     def __init__(self, ponto1: Ponto, ponto2: Ponto, cor = 'black'):
         self.cor = cor
         self.ponto1 = ponto1
         self.ponto2 = ponto2
         self.visible = True
+        self._caixa = None
 
     """
     Normaliza os pontos da reta com base na matriz de normalização
@@ -91,18 +112,35 @@ class Reta:
     def normalizar(self, matriz_normalizada):
         self.ponto1.normalizar(matriz_normalizada)
         self.ponto2.normalizar(matriz_normalizada)
+        self._caixa = None
+
+    """
+    Retorna a caixa envolvente (xmin, ymin, xmax, ymax) da reta em coordenadas normalizadas
+    A caixa fica armazenada ate a proxima normalização
+    """
+    def caixa_envolvente(self):
+        if self._caixa is None:
+            self._caixa = caixa_envolvente_pontos((self.ponto1, self.ponto2))
+        return self._caixa
 
     def __str__(self):
         return f"Reta({self.ponto1}, {self.ponto2})"
 
+    # Retorna a lista de vertices da forma (usado na normalização em lote)
+    def vertices(self):
+        return [self.ponto1, self.ponto2]
+
 """
 Classe Poligono -> Representa um poligono com uma lista de pontos
 """
 class Poligono:
+    __slots__ = ('cor', 'visible', 'pontos', '_caixa')
+
     def __init__(self, pontos : list = None, cor='black'):
         self.cor = cor
         self.visible = True
         self.pontos = pontos if pontos is not None else []
+        self._caixa = None
 
     def __str__(self):
         string = f'Poligono com os pontos '
@@ -116,6 +154,20 @@ class Poligono:
     def normalizar(self, matriz_normalizada):
         for ponto in self.pontos:
             ponto.normalizar(matriz_normalizada)
+        self._caixa = None
+
+    """
+    Retorna a caixa envolvente (xmin, ymin, xmax, ymax) do polígono em coordenadas normalizadas
+    A caixa fica armazenada ate a proxima normalização
+    """
+    def caixa_envolvente(self):
+        if self._caixa is None:
+            self._caixa = caixa_envolvente_pontos(self.pontos)
+        return self._caixa
+
+    # Retorna a lista de vertices da forma (usado na normalização em lote)
+    def vertices(self):
+        return self.pontos
 
     # Retorna uma string com os pontos normalizados
     def str_normalizado(self):
@@ -143,6 +195,8 @@ class Poligono:
 Classe que representa a window de recorte
 """
 class Window:
+    __slots__ = ('XminYmin', 'XminYmax', 'XmaxYmax', 'XmaxYmin')
+
     def __init__(self, xmin: float, ymin: float, xmax: float, ymax: float):
         self.XminYmin = Ponto(xmin,ymin)
         self.XminYmax = Ponto(xmin,ymax)
@@ -174,7 +228,11 @@ class Orientacao(Enum):
 Classe que define uma lista circular de pontos de um polígono.
 """
 class CircularListPoligono:
+    __slots__ = ('current', 'size')
+
     class Node:
+        __slots__ = ('ponto', 'next', 'prev')
+
         def __init__(self, ponto: Ponto):
             self.ponto = ponto
             self.next = None
@@ -253,6 +311,66 @@ class CircularListPoligono:
             return "[]"
         return "[" + " <-> ".join(map(str, self)) + "]"
 
+"""
+Retorna os limites (xmin, ymin, xmax, ymax) da window em coordenadas normalizadas
+"""
+def limites_window(window : Window):
+    return window.XminYmin.x_norm, window.XminYmin.y_norm, window.XmaxYmax.x_norm, window.XmaxYmax.y_norm
+
+"""
+Retorna a caixa envolvente (xmin, ymin, xmax, ymax) de uma lista de pontos em coordenadas normalizadas
+"""
+def caixa_envolvente_pontos(pontos):
+    xs = [ponto.x_norm for ponto in pontos]
+    ys = [ponto.y_norm for ponto in pontos]
+    if not xs:
+        return (math.inf, math.inf, -math.inf, -math.inf)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+"""
+Classificação de uma caixa envolvente em relação a window, usada para aceitar ou rejeitar formas sem recorte
+    CAIXA_FORA: forma totalmente fora da window (rejeitada)
+    CAIXA_DENTRO: forma totalmente dentro da window (aceita sem recorte)
+    CAIXA_PARCIAL: forma cruza (ou pode cruzar) os lados da window e precisa ser recortada
+"""
+CAIXA_FORA = 0
+CAIXA_DENTRO = 1
+CAIXA_PARCIAL = 2
+
+"""
+Classifica a caixa envolvente (xmin, ymin, xmax, ymax) de uma forma em relação a window
+Incluida a mesma margem de erro de checa_poligono_totalmente_dentro_window
+"""
+def classificar_caixa(window : Window, caixa) -> int:
+    wxmin, wymin, wxmax, wymax = limites_window(window)
+    xmin, ymin, xmax, ymax = caixa
+    epsilon = 0.00000000000001
+
+    if xmax < wxmin or xmin > wxmax or ymax < wymin or ymin > wymax:
+        return CAIXA_FORA
+    if xmin + epsilon >= wxmin and xmax <= wxmax + epsilon and ymin + epsilon >= wymin and ymax <= wymax + epsilon:
+        return CAIXA_DENTRO
+    return CAIXA_PARCIAL
+
+"""
+Classifica de uma só vez as caixas envolventes de varias formas em relação a window
+Parâmetros:
+    window (Window): Window de recorte
+    caixas (numpy.ndarray): Caixas envolventes (S,4) no formato (xmin, ymin, xmax, ymax)
+Retorna:
+    numpy.ndarray: CAIXA_FORA, CAIXA_DENTRO ou CAIXA_PARCIAL para cada forma
+"""
+def classificar_caixas(window : Window, caixas):
+    wxmin, wymin, wxmax, wymax = limites_window(window)
+    caixas = np.asarray(caixas, dtype=float).reshape(-1, 4)
+    xmin, ymin, xmax, ymax = caixas[:, 0], caixas[:, 1], caixas[:, 2], caixas[:, 3]
+    epsilon = 0.00000000000001
+
+    fora = (xmax < wxmin) | (xmin > wxmax) | (ymax < wymin) | (ymin > wymax) | np.isnan(caixas).any(axis=1)
+    dentro = (xmin + epsilon >= wxmin) & (xmax <= wxmax + epsilon) & (ymin + epsilon >= wymin) & (ymax <= wymax + epsilon)
+
+    return np.where(fora, CAIXA_FORA, np.where(dentro, CAIXA_DENTRO, CAIXA_PARCIAL))
+
 """
 Verifica se o ponto está dentro da window através das coordenadas x e y do ponto e da window
 Atribui True para visibilidade do ponto se ele estiver dentro da window
@@ -311,32 +429,41 @@ Retorna:
     list: Lista com as 2 listas de recorte, respectivamente, do polígono e da window
 """
 def calcula_listas_recorte(window : Window, poligono : Poligono) -> list: 
-    from algoritmos.reta_liang import LiangBarskyClipping
+    from algoritmos.reta_liang import LiangBarskyClippingCoordenadas
     pontosIntersecaoPoligono = []
+    limites = limites_window(window)
+    pontos = poligono.pontos
+    resultado = [False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, False]
 
     #lista que se tornara a lista circular dos pontos do poligono
     list1 = Poligono()
     #lista que se tornara a lista circular dos pontos da window
     list2 = Poligono()
 
-    for i in range(len(poligono.pontos)):
+    for i in range(len(pontos)):
         # Ponto atual e próximo ponto (o último conecta ao primeiro)
-        ponto1 = Ponto(poligono.pontos[i].x_norm, poligono.pontos[i].y_norm)
-        ponto2 = Ponto(poligono.pontos[(i + 1) % len(poligono.pontos)].x_norm,
-                   poligono.pontos[(i + 1) % len(poligono.pontos)].y_norm)
+        ponto1 = Ponto(pontos[i].x_norm, pontos[i].y_norm)
+        proximo = pontos[(i + 1) % len(pontos)]
 
         list1.pontos.append(ponto1)
 
-        # Recebe as retas com pontos de interseção ou não
-        pontosIntersecaoReta = LiangBarskyClipping(window, Reta(ponto1, ponto2))
+        # Recorta a aresta apenas com coordenadas; os pontos de interseção sao criados somente quando existem
+        visivel, x1, y1, x2, y2, u1, u2, coincidentes = LiangBarskyClippingCoordenadas(
+            limites, ponto1.x_norm, ponto1.y_norm, proximo.x_norm, proximo.y_norm, resultado)
+        if not visivel:
+            continue
 
         # Checa se houve pontos de interseção
-        if pontosIntersecaoReta.ponto1.intersecao:
-            list1.pontos.append(pontosIntersecaoReta.ponto1)
-            pontosIntersecaoPoligono.append(pontosIntersecaoReta.ponto1)
-        if isinstance(pontosIntersecaoReta.ponto2,Ponto) and pontosIntersecaoReta.ponto2.intersecao:
-            list1.pontos.append(pontosIntersecaoReta.ponto2)
-            pontosIntersecaoPoligono.append(pontosIntersecaoReta.ponto2)
+        if u1 > 0:
+            intersecao = Ponto(x1, y1, Orientacao.NAO_UTILIZADA if coincidentes else Orientacao.ENTRANDO)
+            intersecao.intersecao = True
+            list1.pontos.append(intersecao)
+            pontosIntersecaoPoligono.append(intersecao)
+        if u2 < 1:
+            intersecao = Ponto(x2, y2, Orientacao.SAINDO)
+            intersecao.intersecao = True
+            list1.pontos.append(intersecao)
+            pontosIntersecaoPoligono.append(intersecao)
 
     #Se nao houve intersecao com a window checa se o poligono esta totalmente dentro ou fora da window
     if not pontosIntersecaoPoligono:
@@ -344,9 +471,8 @@ def calcula_listas_recorte(window : Window, poligono : Poligono) -> list:
         return [dentro]
 
     # Adiciona os pontos da window na lista 2
-    for atr, value in vars(window).items():
-        if isinstance(value, Ponto):
-            list2.pontos.append(value)
+    for value in window:
+        list2.pontos.append(value)
 
     # Adiciona os pontos de interseção na lista 2
     for point in pontosIntersecaoPoligono:
@@ -421,8 +547,9 @@ def WeilerAthertonPolygonClipping(window : Window, poligono: Poligono) -> Poligo
             # print("Poligono totalmente recortado")
             return poligonoRecortado
 
-    circular_list_poligono = CircularListPoligono(Poligono(deepcopy(listas[0].pontos)))
-    circular_list_window = CircularListPoligono(Poligono(deepcopy(listas[1].pontos)))
+    # Cada lista recebe suas proprias copias dos pontos, pois a orientação dos pontos é alterada durante o percurso
+    circular_list_poligono = CircularListPoligono(Poligono([ponto.copia() for ponto in listas[0].pontos]))
+    circular_list_window = CircularListPoligono(Poligono([ponto.copia() for ponto in listas[1].pontos]))
 
     p = busca_ponto_entrada(circular_list_poligono,len(listas[0].pontos))
 
@@ -466,3 +593,272 @@ def WeilerAthertonPolygonClipping(window : Window, poligono: Poligono) -> Poligo
                 poligonoRecortado.pontos.append(ponto_intersecao)
     poligonoRecortado.cor = poligono.cor
     return poligonoRecortado
+
+"""
+Verifica se o ponto (x, y) esta dentro do polígono (teste do raio / regra par-impar)
+Parâmetros:
+    x, y (float): Coordenadas normalizadas do ponto
+    coordenadas (list): Vertices normalizados (x_norm, y_norm) do polígono
+"""
+def ponto_dentro_poligono(x, y, coordenadas) -> bool:
+    dentro = False
+    n = len(coordenadas)
+    for i in range(n):
+        x1, y1 = coordenadas[i]
+        x2, y2 = coordenadas[(i + 1) % n]
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            dentro = not dentro
+    return dentro
+
+"""
+Retorna a posição de um ponto sobre o contorno da window, medida no sentido horário a partir do canto superior esquerdo
+É o mesmo sentido em que a lista da window é ordenada no algoritmo de Weiler-Atherton
+Parâmetros:
+    limites (tuple): (xmin, ymin, xmax, ymax) da window
+    x, y (float): Coordenadas normalizadas de um ponto sobre o contorno
+"""
+def posicao_contorno_window(limites, x, y) -> float:
+    xmin, ymin, xmax, ymax = limites
+    largura = xmax - xmin
+    altura = ymax - ymin
+
+    # O ponto pertence ao lado mais proximo: TOPO, DIREITO, BASE ou ESQUERDO
+    distancias = (abs(y - ymax), abs(x - xmax), abs(y - ymin), abs(x - xmin))
+    lado = distancias.index(min(distancias))
+    if lado == 0:
+        return min(max(x - xmin, 0.0), largura)
+    if lado == 1:
+        return largura + min(max(ymax - y, 0.0), altura)
+    if lado == 2:
+        return largura + altura + min(max(xmax - x, 0.0), largura)
+    return 2 * largura + altura + min(max(y - ymin, 0.0), altura)
+
+"""
+Algoritmo de clipping de polígonos de Weiler-Atherton com os pontos de interseção indexados
+Em vez de buscar cada ponto de entrada/saida nas listas circulares (busca_ponto_lista) e de ordenar a lista
+da window por angulo, cada interseção recebe um identificador e a lista da window é ordenada pela posição
+dos pontos ao longo do contorno da window. A troca entre as listas é feita diretamente pelo indice.
+Parâmetros:
+    window (Window): Window de recorte
+    poligono (Poligono): Polígono a ser recortado (vertices no sentido horário)
+Retorna:
+    Poligono: Polígono recortado (as partes de um polígono concavo ficam em sequencia na mesma lista, como no WeilerAthertonPolygonClipping)
+"""
+def WeilerAthertonIndexadoPolygonClipping(window : Window, poligono : Poligono) -> Poligono:
+    from algoritmos.reta_liang import LiangBarskyClippingCoordenadas
+    limites = limites_window(window)
+    xmin, ymin, xmax, ymax = limites
+    poligonoRecortado = Poligono(cor=poligono.cor)
+
+    coordenadas = [(ponto.x_norm, ponto.y_norm) for ponto in poligono.pontos]
+    n = len(coordenadas)
+    resultado = [False, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, False]
+
+    # Lista do polígono: (x, y, orientacao, identificador da interseção ou -1 para vertices)
+    lista_poligono = []
+    # Interseções: (posição no contorno da window, x, y, orientacao, identificador)
+    intersecoes = []
+
+    for i in range(n):
+        x, y = coordenadas[i]
+        proximo_x, proximo_y = coordenadas[(i + 1) % n]
+        lista_poligono.append((x, y, Orientacao.NAO_UTILIZADA, -1))
+
+        visivel, x1, y1, x2, y2, u1, u2, coincidentes = LiangBarskyClippingCoordenadas(limites, x, y, proximo_x, proximo_y, resultado)
+        # Arestas que apenas tocam a window em um ponto nao geram interseções
+        if not visivel or coincidentes:
+            continue
+
+        if u1 > 0:
+            intersecoes.append((posicao_contorno_window(limites, x1, y1), x1, y1, Orientacao.ENTRANDO, len(intersecoes)))
+            lista_poligono.append((x1, y1, Orientacao.ENTRANDO, intersecoes[-1][4]))
+        if u2 < 1:
+            intersecoes.append((posicao_contorno_window(limites, x2, y2), x2, y2, Orientacao.SAINDO, len(intersecoes)))
+            lista_poligono.append((x2, y2, Orientacao.SAINDO, intersecoes[-1][4]))
+
+    # Sem interseções: o polígono esta totalmente dentro, totalmente fora ou contem a window inteira
+    if not intersecoes:
+        if checa_poligono_totalmente_dentro_window(window, poligono):
+            return poligono
+        if n >= 3 and ponto_dentro_poligono((xmin + xmax) / 2.0, (ymin + ymax) / 2.0, coordenadas):
+            for x, y in ((xmin, ymax), (xmax, ymax), (xmax, ymin), (xmin, ymin)):
+                poligonoRecortado.pontos.append(Ponto(x, y))
+            return poligonoRecortado
+        poligonoRecortado.visible = False
+        return poligonoRecortado
+
+    # Lista da window: cantos e interseções ordenados pela posição no contorno (sentido horário)
+    largura = xmax - xmin
+    altura = ymax - ymin
+    cantos = [
+        (0.0, 0, xmin, ymax, Orientacao.NAO_UTILIZADA, -1),
+        (largura, 0, xmax, ymax, Orientacao.NAO_UTILIZADA, -1),
+        (largura + altura, 0, xmax, ymin, Orientacao.NAO_UTILIZADA, -1),
+        (2 * largura + altura, 0, xmin, ymin, Orientacao.NAO_UTILIZADA, -1),
+    ]
+    lista_window = sorted(cantos + [(posicao, 1, x, y, orientacao, identificador) for posicao, x, y, orientacao, identificador in intersecoes])
+    lista_window = [(x, y, orientacao, identificador) for _, _, x, y, orientacao, identificador in lista_window]
+
+    # Indice de cada interseção nas duas listas
+    indice_poligono = [0] * len(intersecoes)
+    indice_window = [0] * len(intersecoes)
+    for i, (_, _, _, identificador) in enumerate(lista_poligono):
+        if identificador >= 0:
+            indice_poligono[identificador] = i
+    for i, (_, _, _, identificador) in enumerate(lista_window):
+        if identificador >= 0:
+            indice_window[identificador] = i
+
+    utilizada = [False] * len(intersecoes)
+    # Limite de passos para evitar laços infinitos em casos degenerados
+    passos_restantes = 2 * (len(lista_poligono) + len(lista_window))
+
+    for _, _, orientacao_inicio, inicio in lista_poligono:
+        if orientacao_inicio != Orientacao.ENTRANDO or utilizada[inicio]:
+            continue
+
+        entrada = inicio
+        while not utilizada[entrada] and passos_restantes > 0:
+            utilizada[entrada] = True
+
+            # Percorre a lista do polígono da entrada ate a proxima saida
+            i = indice_poligono[entrada]
+            x, y, orientacao, identificador = lista_poligono[i]
+            while orientacao != Orientacao.SAINDO and passos_restantes > 0:
+                if identificador >= 0:
+                    utilizada[identificador] = True
+                poligonoRecortado.pontos.append(Ponto(x, y))
+                i = (i + 1) % len(lista_poligono)
+                x, y, orientacao, identificador = lista_poligono[i]
+                passos_restantes -= 1
+
+            # Percorre a lista da window da saida ate a proxima entrada
+            j = indice_window[identificador]
+            utilizada[identificador] = True
+            x, y, orientacao, identificador = lista_window[j]
+            while orientacao != Orientacao.ENTRANDO and passos_restantes > 0:
+                poligonoRecortado.pontos.append(Ponto(x, y))
+                j = (j + 1) % len(lista_window)
+                x, y, orientacao, identificador = lista_window[j]
+                passos_restantes -= 1
+
+            entrada = identificador
+
+    poligonoRecortado.visible = len(poligonoRecortado.pontos) > 0
+    return poligonoRecortado
+
+# Menor numero de vertices com que a verificação de convexidade usa numpy
+MINIMO_VERTICES_VETORIZADO = 48
+
+"""
+Verifica se o polígono é convexo (e simples), condição em que o recorte produz sempre um unico polígono
+Polígonos pequenos sao verificados em Python puro: o custo fixo das operações do numpy domina nesse caso
+Parâmetros:
+    coordenadas (list): Vertices normalizados (x_norm, y_norm) do polígono
+"""
+def poligono_convexo(coordenadas) -> bool:
+    if len(coordenadas) < MINIMO_VERTICES_VETORIZADO:
+        return _poligono_convexo_laco([(float(x), float(y)) for x, y in coordenadas])
+
+    pontos = np.asarray(coordenadas, dtype=float).reshape(-1, 2)
+    if len(pontos) < 4:
+        return len(pontos) == 3
+
+    arestas = np.roll(pontos, -1, axis=0) - pontos
+    produtos = arestas[:, 0] * np.roll(arestas[:, 1], -1) - arestas[:, 1] * np.roll(arestas[:, 0], -1)
+    produtos = produtos[produtos != 0]
+    if not (np.all(produtos > 0) or np.all(produtos < 0)):
+        return False
+
+    # Um polígono convexo muda o sentido do percurso em x (e em y) no maximo duas vezes
+    for eixo in (0, 1):
+        sinais = np.sign(arestas[:, eixo])
+        sinais = sinais[sinais != 0]
+        if np.count_nonzero(sinais != np.roll(sinais, 1)) > 2:
+            return False
+    return True
+
+# Mesma verificação de poligono_convexo, com um laço sobre as arestas
+def _poligono_convexo_laco(pontos):
+    n = len(pontos)
+    if n < 4:
+        return n == 3
+
+    arestas = [(pontos[(i + 1) % n][0] - pontos[i][0], pontos[(i + 1) % n][1] - pontos[i][1]) for i in range(n)]
+    sentido = 0
+    for i in range(n):
+        (ax, ay), (bx, by) = arestas[i], arestas[(i + 1) % n]
+        produto = ax * by - ay * bx
+        if produto == 0:
+            continue
+        if sentido == 0:
+            sentido = 1 if produto > 0 else -1
+        elif (produto > 0) != (sentido > 0):
+            return False
+
+    for eixo in (0, 1):
+        sinais = [aresta[eixo] > 0 for aresta in arestas if aresta[eixo] != 0]
+        if sum(1 for i in range(len(sinais)) if sinais[i] != sinais[i - 1]) > 2:
+            return False
+    return True
+
+"""
+Algoritmos de clipping de polígonos disponiveis
+    RECORTE_WEILER_ATHERTON: implementação original com listas circulares
+    RECORTE_WEILER_ATHERTON_INDEXADO: Weiler-Atherton com interseções indexadas pela posição no contorno da window
+    RECORTE_SUTHERLAND_HODGMAN: Sutherland-Hodgman vetorizado (um unico polígono de saida)
+    RECORTE_AUTOMATICO: Sutherland-Hodgman para polígonos convexos com pelo menos MINIMO_VERTICES_SUTHERLAND vertices
+        e Weiler-Atherton indexado para os demais (abaixo desse tamanho o Weiler-Atherton indexado é mais rapido,
+        e a verificação de convexidade nem é feita)
+"""
+RECORTE_WEILER_ATHERTON = 0
+RECORTE_WEILER_ATHERTON_INDEXADO = 1
+RECORTE_SUTHERLAND_HODGMAN = 2
+RECORTE_AUTOMATICO = 3
+
+# Menor numero de vertices com que o recorte automatico usa Sutherland-Hodgman (ver benchmarks/recorte_poligonos.py)
+MINIMO_VERTICES_SUTHERLAND = 64
+
+"""
+Escolhe o algoritmo do recorte automatico para um polígono
+Parâmetros:
+    coordenadas (list): Vertices normalizados (x_norm, y_norm) do polígono
+Retorna:
+    int: RECORTE_SUTHERLAND_HODGMAN ou RECORTE_WEILER_ATHERTON_INDEXADO
+"""
+def algoritmo_automatico(coordenadas) -> int:
+    if len(coordenadas) >= MINIMO_VERTICES_SUTHERLAND and poligono_convexo(coordenadas):
+        return RECORTE_SUTHERLAND_HODGMAN
+    return RECORTE_WEILER_ATHERTON_INDEXADO
+
+"""
+Recorta um polígono com o algoritmo selecionado
+Parâmetros:
+    window (Window): Window de recorte
+    poligono (Poligono): Polígono a ser recortado
+    algoritmo (int): Um dos algoritmos RECORTE_*
+Retorna:
+    Poligono: Polígono recortado
+"""
+def RecortePoligono(window : Window, poligono : Poligono, algoritmo : int = RECORTE_AUTOMATICO) -> Poligono:
+    from algoritmos.poligono_sutherland import SutherlandHodgmanPolygonClipping
+
+    # Aceitação/rejeição trivial pela caixa envolvente, antes de qualquer algoritmo de recorte
+    classificacao = classificar_caixa(window, poligono.caixa_envolvente())
+    if classificacao == CAIXA_DENTRO:
+        return poligono
+    if classificacao == CAIXA_FORA:
+        poligonoRecortado = Poligono(cor=poligono.cor)
+        poligonoRecortado.visible = False
+        return poligonoRecortado
+
+    if algoritmo == RECORTE_WEILER_ATHERTON:
+        return WeilerAthertonPolygonClipping(window, poligono)
+    if algoritmo == RECORTE_WEILER_ATHERTON_INDEXADO:
+        return WeilerAthertonIndexadoPolygonClipping(window, poligono)
+    if algoritmo == RECORTE_SUTHERLAND_HODGMAN:
+        return SutherlandHodgmanPolygonClipping(window, poligono)
+
+    if algoritmo_automatico([(ponto.x_norm, ponto.y_norm) for ponto in poligono.pontos]) == RECORTE_SUTHERLAND_HODGMAN:
+        return SutherlandHodgmanPolygonClipping(window, poligono)
+    return WeilerAthertonIndexadoPolygonClipping(window, poligono)
@@ -0,0 +1,243 @@
+import multiprocessing
+import os
+import weakref
+from collections import OrderedDict
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import algoritmos.poligonos as poligonos
+from algoritmos.renderizador import recortar_poligonos_coordenadas, verificar_cancelamento
+
+# Abaixo deste numero de polígonos parciais o recorte é feito no proprio processo:
+# o custo de distribuir as tarefas supera o ganho do paralelismo
+MINIMO_POLIGONOS = 2000
+
+# Numero de lotes por processo: lotes menores equilibram melhor a carga entre os processos
+LOTES_POR_PROCESSO = 4
+
+# Numero de memórias compartilhadas mantidas abertas em cada processo (duas por geometria)
+MAXIMO_MEMORIAS_PROCESSO = 8
+
+"""
+Classe RecorteParalelo -> Recorta os polígonos parcialmente visiveis de uma cena em um conjunto de processos
+As coordenadas normalizadas e os deslocamentos de cada geometria recortada sao colocados uma vez em memória
+compartilhada (GeometriaCompartilhada): a geometria passa a normalizar diretamente nessa memória, e os processos
+leem os vertices de lá; alternar entre geometrias (ex.: os niveis de detalhe) nao copia nada. Cada tarefa recebe
+apenas os limites da window e os indices das formas do seu lote, e devolve os vertices recortados em arrays, sem
+enviar objetos Ponto entre os processos.
+Cenas com poucos polígonos parciais sao recortadas no proprio processo (MINIMO_POLIGONOS).
+Pontos e retas já sao recortados em lote (operações vetorizadas) e continuam no processo principal.
+Os processos sao criados sem fork (contexto_processos): scripts que ativam o recorte paralelo devem proteger o
+codigo principal com if __name__ == "__main__"
+Atributos:
+    processos (int): Numero de processos do conjunto
+    minimo_poligonos (int): Quantidade minima de polígonos parciais para usar os processos
+    compartilhadas (dict): {id da geometria: GeometriaCompartilhada} geometrias com coordenadas na memória compartilhada
+"""
+class RecorteParalelo:
+    def __init__(self, processos: int = None, minimo_poligonos: int = MINIMO_POLIGONOS):
+        self.processos = max(int(processos or os.cpu_count() or 1), 1)
+        self.minimo_poligonos = minimo_poligonos
+        self.compartilhadas = {}
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        self.fechar()
+
+    # A memória compartilhada nao é liberada pelo sistema quando o objeto é descartado sem fechar()
+    def __del__(self):
+        if self.compartilhadas:
+            self.liberar()
+
+    """
+    Recorta os polígonos parcialmente visiveis informados
+    Parâmetros:
+        geometria (GeometriaCena): Geometria da cena, já normalizada
+        window (Window): Window de recorte (espaço das coordenadas normalizadas da geometria)
+        algoritmo (int): Um dos algoritmos RECORTE_* de poligonos
+        indices (numpy.ndarray): Indices dos polígonos a recortar
+        cancelado (callable): Função opcional verificada entre os lotes (ver verificar_cancelamento); com o recorte
+            cancelado, os lotes que ainda nao começaram sao descartados
+    Retorna:
+        dict: {indice da forma: array (K,2) dos vertices recortados}, apenas com os polígonos visiveis
+    """
+    def recortar_poligonos(self, geometria, window, algoritmo, indices, cancelado=None):
+        indices = np.asarray(indices, dtype=np.int64)
+        limites = poligonos.limites_window(window)
+
+        if len(indices) < self.minimo_poligonos or self.processos == 1:
+            return recortar_poligonos_coordenadas(geometria.normalizadas, geometria.deslocamentos, window, limites, algoritmo, indices,
+                                                  cancelado)
+
+        compartilhada = self.compartilhar(geometria)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processos, mp_context=contexto_processos())
+
+        nomes = tuple(memoria.name for memoria in compartilhada.memorias)
+        formatos = (compartilhada.normalizadas.shape, compartilhada.deslocamentos.shape)
+        tarefas = [
+            self._executor.submit(_recortar_lote, nomes, formatos, tuple(limites), algoritmo, lote)
+            for lote in dividir_lotes(geometria.deslocamentos, indices, self.processos * LOTES_POR_PROCESSO)
+        ]
+
+        # Os resultados sao reunidos na ordem dos lotes, que é a ordem original das formas
+        recortados = {}
+        try:
+            for tarefa in tarefas:
+                verificar_cancelamento(cancelado)
+                visiveis, quantidades, coordenadas = tarefa.result()
+                recortados.update(zip(visiveis.tolist(), np.split(coordenadas, np.cumsum(quantidades)[:-1])))
+        except BaseException:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            raise
+        return recortados
+
+    """
+    Coloca as coordenadas normalizadas e os deslocamentos da geometria em memória compartilhada
+    Nada é copiado se a geometria já estiver compartilhada e nao tiver crescido (formas adicionadas)
+    Retorna:
+        GeometriaCompartilhada: A memória compartilhada da geometria
+    """
+    def compartilhar(self, geometria):
+        # As memórias das geometrias já descartadas foram liberadas (ver GeometriaCompartilhada)
+        for chave in [chave for chave, compartilhada in self.compartilhadas.items() if compartilhada.geometria() is None]:
+            self.compartilhadas.pop(chave).liberar()
+
+        compartilhada = self.compartilhadas.get(id(geometria))
+        if compartilhada is not None and compartilhada.atual(geometria):
+            return compartilhada
+        if compartilhada is not None:
+            compartilhada.liberar()
+        compartilhada = self.compartilhadas[id(geometria)] = GeometriaCompartilhada(geometria)
+        return compartilhada
+
+    """
+    Devolve as geometrias a arrays próprios e libera a memória compartilhada
+    """
+    def liberar(self):
+        for compartilhada in self.compartilhadas.values():
+            compartilhada.liberar()
+        self.compartilhadas = {}
+
+    """
+    Encerra os processos e libera a memória compartilhada
+    """
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.liberar()
+
+"""
+Classe GeometriaCompartilhada -> Coordenadas normalizadas e deslocamentos de uma geometria em memória compartilhada
+A geometria passa a normalizar diretamente na memória compartilhada. A memória é liberada com liberar(), ou quando
+a geometria é descartada (ex.: um nivel de detalhe que deixou de ser usado)
+Atributos:
+    geometria (weakref.ref): Referência fraca a geometria compartilhada
+    memorias (list): Memórias (SharedMemory) das coordenadas normalizadas e dos deslocamentos
+    normalizadas (numpy.ndarray): Coordenadas normalizadas, na memória compartilhada
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma, na memória compartilhada
+"""
+class GeometriaCompartilhada:
+    def __init__(self, geometria):
+        normalizadas = geometria.normalizadas
+        deslocamentos = geometria.deslocamentos
+        self.memorias = [
+            shared_memory.SharedMemory(create=True, size=max(normalizadas.nbytes, 1)),
+            shared_memory.SharedMemory(create=True, size=max(deslocamentos.nbytes, 1)),
+        ]
+        self.normalizadas = np.ndarray(normalizadas.shape, dtype=np.float64, buffer=self.memorias[0].buf)
+        self.normalizadas[:] = normalizadas
+        self.deslocamentos = np.ndarray(deslocamentos.shape, dtype=np.int64, buffer=self.memorias[1].buf)
+        self.deslocamentos[:] = deslocamentos
+
+        geometria._normalizadas = self.normalizadas
+        self.geometria = weakref.ref(geometria)
+        self._finalizador = weakref.finalize(geometria, _liberar_memorias, self.memorias)
+
+    """
+    Verifica se a geometria ainda usa esta memória: formas adicionadas realocam os seus arrays
+    """
+    def atual(self, geometria):
+        return (self.geometria() is geometria and geometria._normalizadas is self.normalizadas
+                and len(geometria.deslocamentos) == len(self.deslocamentos))
+
+    """
+    Devolve a geometria (se ainda usar a memória compartilhada) a arrays próprios e libera a memória
+    """
+    def liberar(self):
+        geometria = self.geometria()
+        if geometria is not None and geometria._normalizadas is self.normalizadas:
+            geometria._normalizadas = self.normalizadas.copy()
+        self.normalizadas = None
+        self.deslocamentos = None
+        self._finalizador()
+
+# Fecha e remove as memórias compartilhadas
+def _liberar_memorias(memorias):
+    for memoria in memorias:
+        try:
+            memoria.close()
+        except BufferError:
+            # Visões dos arrays ainda em uso mantêm o mapeamento ate serem descartadas
+            pass
+        memoria.unlink()
+
+"""
+Contexto de criação dos processos: forkserver, ou spawn onde ele nao existe (ex.: Windows)
+O recorte é chamado de threads (ex.: o redesenho em segundo plano), e o fork de um processo com varias threads
+copia travas que podem estar em uso por outra thread, travando os processos criados
+"""
+def contexto_processos():
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+"""
+Divide os indices em lotes contiguos com quantidades de vertices semelhantes
+Parâmetros:
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma
+    indices (numpy.ndarray): Indices das formas, em ordem
+    quantidade (int): Numero maximo de lotes
+"""
+def dividir_lotes(deslocamentos, indices, quantidade):
+    if len(indices) == 0:
+        return []
+    vertices = np.cumsum(deslocamentos[indices + 1] - deslocamentos[indices])
+    cortes = np.searchsorted(vertices, vertices[-1] * np.arange(1, quantidade) / quantidade, side='right')
+    return [lote for lote in np.split(indices, np.unique(cortes)) if len(lote)]
+
+# Memórias compartilhadas abertas em cada processo, da usada menos recentemente a mais recente: {nome: (SharedMemory, numpy.ndarray)}
+_memorias_processo = OrderedDict()
+
+# Retorna o array sobre a memória compartilhada de nome informado, abrindo-a apenas na primeira vez
+# (as usadas menos recentemente sao fechadas, alem de MAXIMO_MEMORIAS_PROCESSO)
+def _array_compartilhado(nome, formato, tipo):
+    if nome in _memorias_processo:
+        _memorias_processo.move_to_end(nome)
+        return _memorias_processo[nome][1]
+
+    memoria = shared_memory.SharedMemory(name=nome)
+    _memorias_processo[nome] = (memoria, np.ndarray(formato, dtype=tipo, buffer=memoria.buf))
+    while len(_memorias_processo) > MAXIMO_MEMORIAS_PROCESSO:
+        _, (antiga, _) = _memorias_processo.popitem(last=False)
+        try:
+            antiga.close()
+        except BufferError:
+            pass
+    return _memorias_processo[nome][1]
+
+# Tarefa executada nos processos: recorta um lote e devolve (indices visiveis, quantidades de vertices, vertices)
+def _recortar_lote(nomes, formatos, limites, algoritmo, indices):
+    normalizadas = _array_compartilhado(nomes[0], formatos[0], np.float64)
+    deslocamentos = _array_compartilhado(nomes[1], formatos[1], np.int64)
+    window = poligonos.Window(limites[0], limites[1], limites[2], limites[3])
+
+    recortados = recortar_poligonos_coordenadas(normalizadas, deslocamentos, window, limites, algoritmo, indices)
+    quantidades = np.array([len(coordenadas) for coordenadas in recortados.values()], dtype=np.int64)
+    coordenadas = np.concatenate(list(recortados.values())) if recortados else np.empty((0, 2))
+    return np.fromiter(recortados.keys(), dtype=np.int64, count=len(recortados)), quantidades, coordenadas
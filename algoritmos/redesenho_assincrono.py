@@ -0,0 +1,242 @@
+import threading
+from algoritmos.densidade import PONTOS_DENSIDADE
+from algoritmos.renderizador import QuadroCancelado, codificar_png
+
+# Intervalo (ms) entre as verificações de um quadro pronto, enquanto há redesenho em andamento
+INTERVALO_VERIFICACAO = 15
+
+"""
+Classe QuadroPronto -> Resultado de um redesenho, a ser aplicado no canvas pela thread da interface
+Atributos:
+    geracao (int): Geração das ações atendidas pelo quadro
+    comandos (list): Comandos de desenho da janela principal
+    retangulo_minimapa (ComandoDesenho): Retangulo da window no minimapa
+    imagem (bytes): Imagem PNG da janela principal, composta pela pirâmide de tiles, ou a imagem de densidade dos
+        pontos, desenhada sob os comandos (None quando o quadro é apenas vetorial)
+"""
+class QuadroPronto:
+    __slots__ = ('geracao', 'comandos', 'retangulo_minimapa', 'imagem')
+
+    def __init__(self, geracao, comandos, retangulo_minimapa, imagem=None):
+        self.geracao = geracao
+        self.comandos = comandos
+        self.retangulo_minimapa = retangulo_minimapa
+        self.imagem = imagem
+
+"""
+Classe RedesenhoAssincrono -> Gera os quadros do renderizador em uma thread de segundo plano
+As ações do usuario (movimentar, rotacionar, zoom...) sao enfileiradas por solicitar() e a thread da interface
+continua livre. A thread de redesenho aplica de uma só vez todas as ações acumuladas e gera apenas o quadro
+do estado mais recente; se novas ações chegam durante a geração, o quadro em andamento é cancelado
+(QuadroCancelado) em vez de concluido. O quadro pronto é entregue na thread da interface por verificar(),
+que se reagenda com agendar (ex.: root.after) enquanto houver redesenho em andamento; quadros que ficaram
+antigos antes de serem aplicados sao descartados.
+Enquanto a thread de redesenho existe, o renderizador só deve ser usado diretamente com a trava adquirida
+(na thread da interface, por reservar(), que nao espera o fim do quadro em geração)
+Atributos:
+    renderizador (Renderizador): Renderizador usado pela thread de redesenho
+    aplicar (callable): Função aplicar(QuadroPronto), chamada na thread da interface com cada quadro pronto
+    agendar (callable): Função agendar(ms, funcao) que executa funcao na thread da interface (ex.: root.after)
+    trava (threading.RLock): Trava de uso do renderizador
+    geracao (int): Numero de ações solicitadas (ou cancelamentos); identifica o estado mais recente
+    quadros_cancelados (int): Quadros interrompidos por ações mais recentes
+    quadros_descartados (int): Quadros concluidos que já estavam antigos ao serem entregues
+"""
+class RedesenhoAssincrono:
+    def __init__(self, renderizador, aplicar, agendar):
+        self.renderizador = renderizador
+        self.aplicar = aplicar
+        self.agendar = agendar
+        self.trava = threading.RLock()
+        self.geracao = 0
+        self.quadros_cancelados = 0
+        self.quadros_descartados = 0
+
+        self._condicao = threading.Condition()
+        self._acoes = []
+        self._resultado = None
+        self._erro = None
+        self._ocupado = False
+        self._geracao_quadro = None
+        self._verificacao_agendada = False
+        self._encerrar = False
+        self._thread = None
+
+    """
+    Enfileira uma ação sobre o renderizador e o redesenho do estado resultante
+    Parâmetros:
+        acao (callable): Função acao(renderizador) que altera o estado de visualização (None apenas redesenha)
+        nome (str): Nome do quadro na instrumentação
+    """
+    def solicitar(self, acao=None, nome='redesenho'):
+        with self._condicao:
+            self._acoes.append((acao, nome))
+            self.geracao += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name='redesenho', daemon=True)
+                self._thread.start()
+            self._condicao.notify()
+        self._agendar_verificacao()
+
+    """
+    Descarta as ações pendentes e cancela o quadro em andamento (ex.: antes de abrir outro arquivo)
+    As ações já aplicadas ao renderizador nao sao desfeitas
+    """
+    def cancelar(self):
+        with self._condicao:
+            self._acoes = []
+            self._resultado = None
+            self.geracao += 1
+
+    """
+    Retorna o contexto que reserva o renderizador para uso direto na thread da interface (ex.: edição de formas)
+    O quadro em geração é cancelado antes de adquirir a trava: a espera vai apenas ate a proxima verificação de
+    cancelamento do quadro, e nao ate o seu fim. As ações pendentes sao mantidas e, se o quadro interrompido
+    era o do estado mais recente, o redesenho é solicitado novamente ao liberar a trava
+    """
+    def reservar(self):
+        return _Reserva(self)
+
+    """
+    Retorna se ainda há ações pendentes, um quadro em geração ou um quadro pronto nao aplicado
+    """
+    def pendente(self):
+        with self._condicao:
+            return bool(self._acoes) or self._ocupado or self._resultado is not None
+
+    """
+    Aplica o quadro pronto (na thread da interface) e se reagenda enquanto houver redesenho em andamento
+    Um erro ocorrido na thread de redesenho é lançado novamente aqui
+    """
+    def verificar(self):
+        with self._condicao:
+            resultado, self._resultado = self._resultado, None
+            erro, self._erro = self._erro, None
+            continuar = bool(self._acoes) or self._ocupado
+            self._verificacao_agendada = continuar
+
+        if continuar:
+            self.agendar(INTERVALO_VERIFICACAO, self.verificar)
+        if erro is not None:
+            raise erro
+        if resultado is not None:
+            if resultado.geracao == self.geracao:
+                self.aplicar(resultado)
+            else:
+                self.quadros_descartados += 1
+
+    """
+    Aguarda o fim do redesenho e aplica o quadro pronto, sem a espera de agendar (ex.: scripts e lotes)
+    Parâmetros:
+        tempo_limite (float): Tempo maximo de espera em segundos (None espera indefinidamente)
+    Retorna:
+        bool: Se o redesenho terminou dentro do tempo limite
+    """
+    def aguardar(self, tempo_limite=None):
+        with self._condicao:
+            terminou = self._condicao.wait_for(lambda: not self._acoes and not self._ocupado, tempo_limite)
+            resultado, self._resultado = self._resultado, None
+            erro, self._erro = self._erro, None
+        if erro is not None:
+            raise erro
+        if resultado is not None and resultado.geracao == self.geracao:
+            self.aplicar(resultado)
+        return terminou
+
+    """
+    Encerra a thread de redesenho (as ações pendentes sao descartadas)
+    """
+    def fechar(self):
+        with self._condicao:
+            self._encerrar = True
+            self._acoes = []
+            self.geracao += 1
+            self._condicao.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _agendar_verificacao(self):
+        with self._condicao:
+            if self._verificacao_agendada:
+                return
+            self._verificacao_agendada = True
+        self.agendar(INTERVALO_VERIFICACAO, self.verificar)
+
+    # Laço da thread de redesenho: aplica as ações acumuladas e gera o quadro do estado mais recente
+    def _executar(self):
+        renderizador = self.renderizador
+        while True:
+            with self._condicao:
+                self._condicao.wait_for(lambda: self._acoes or self._encerrar)
+                if self._encerrar:
+                    return
+                acoes, self._acoes = self._acoes, []
+                geracao = self.geracao
+                self._ocupado = True
+                self._geracao_quadro = geracao
+
+            resultado = erro = None
+            try:
+                with self.trava:
+                    resultado = self._gerar_quadro(renderizador, acoes, geracao)
+            except Exception as excecao:
+                # O erro é repassado a thread da interface (verificar), e a thread de redesenho continua
+                erro = excecao
+            with self._condicao:
+                self._ocupado = False
+                self._erro = erro or self._erro
+                if resultado is not None and geracao == self.geracao:
+                    self._resultado = resultado
+                self._condicao.notify_all()
+
+    # Aplica as ações e gera o quadro; retorna None quando ele é cancelado por ações mais recentes
+    # Com a pirâmide de tiles em uso, o quadro é a imagem composta pelos tiles, sem comandos de desenho;
+    # no modo PONTOS_DENSIDADE o quadro tem os comandos das demais formas e a imagem de densidade dos pontos
+    def _gerar_quadro(self, renderizador, acoes, geracao):
+        resultado = None
+        instrumentacao = renderizador.instrumentacao
+        with instrumentacao.quadro(acoes[-1][1]):
+            instrumentacao.contar('acoes_agrupadas', len(acoes))
+            for acao, _ in acoes:
+                if acao is not None:
+                    acao(renderizador)
+            cancelado = lambda: self.geracao != geracao
+            try:
+                if renderizador.usa_piramide():
+                    with instrumentacao.etapa('piramide'):
+                        imagem = codificar_png(renderizador.renderizar_imagem(cancelado=cancelado))
+                    resultado = QuadroPronto(geracao, [], renderizador.comando_retangulo_minimapa(), imagem)
+                else:
+                    comandos = renderizador.comandos_cena(cancelado=cancelado)
+                    imagem = None
+                    if renderizador.modo_pontos == PONTOS_DENSIDADE:
+                        imagem = codificar_png(renderizador.imagem_pontos())
+                    resultado = QuadroPronto(geracao, comandos, renderizador.comando_retangulo_minimapa(), imagem)
+            except QuadroCancelado:
+                self.quadros_cancelados += 1
+                instrumentacao.contar('quadros_cancelados')
+        return resultado
+
+# Contexto de RedesenhoAssincrono.reservar: cancela o quadro em geração e adquire a trava do renderizador
+class _Reserva:
+    __slots__ = ('redesenho', 'interrompido')
+
+    def __init__(self, redesenho):
+        self.redesenho = redesenho
+
+    def __enter__(self):
+        redesenho = self.redesenho
+        with redesenho._condicao:
+            # Um quadro já cancelado (ex.: por cancelar) termina sozinho e nao é retomado
+            self.interrompido = redesenho._ocupado and redesenho._geracao_quadro == redesenho.geracao
+            if self.interrompido:
+                redesenho.geracao += 1
+        redesenho.trava.acquire()
+        return redesenho.renderizador
+
+    def __exit__(self, tipo, valor, traceback):
+        self.redesenho.trava.release()
+        if self.interrompido:
+            self.redesenho.solicitar(nome='retomar')
+        return False
@@ -0,0 +1,1244 @@
+import bisect
+import math
+import struct
+import zlib
+import numpy as np
+import algoritmos.poligonos as poligonos
+import algoritmos.reta_cohen as reta_cohen
+import algoritmos.reta_liang as reta_liang
+import algoritmos.cache_binario as cache_binario
+from algoritmos.cache_quadros import CacheQuadros, ORCAMENTO_PADRAO, chave_visao
+from algoritmos.cores import cor_rgb
+from algoritmos.densidade import PONTOS_INDIVIDUAIS, PONTOS_AGREGADOS, PONTOS_DENSIDADE, TAMANHO_CELULA, agregar_pontos, imagem_densidade, raios_marcadores
+from algoritmos.geometria import GeometriaCena, TIPO_PONTO, TIPO_RETA, TIPO_POLIGONO, aplicar_matriz, indices_vertices, matriz_viewport
+from algoritmos.indice_espacial import GradeUniforme, extensao_mundo
+from algoritmos.instrumentacao import Instrumentacao
+from algoritmos.poligonos import Ponto, Reta, Poligono
+from algoritmos.poligono_sutherland import SutherlandHodgmanCoordenadas
+from algoritmos.simplificacao import NiveisDetalhe
+
+"""
+Tipos de comando de desenho (mesmos nomes dos itens do canvas do tkinter)
+"""
+COMANDO_OVAL = 'oval'
+COMANDO_LINHA = 'line'
+COMANDO_POLIGONO = 'polygon'
+COMANDO_RETANGULO = 'rectangle'
+
+RAIO_PONTO = 3
+
+# Chave do comando do retangulo da window no minimapa
+CHAVE_RETANGULO_MINIMAPA = 'retangulo_minimapa'
+
+# No recorte dos polígonos, o cancelamento do quadro é verificado a cada INTERVALO_CANCELAMENTO polígonos
+INTERVALO_CANCELAMENTO = 64
+
+# Numero maximo de formas editadas registradas para a atualização dos quadros do cache; acima dele o cache é limpo
+LIMITE_ALTERACOES = 4096
+
+# Margem relativa (ao maior lado da window) da window de recorte na normalização incremental (ver window_recorte)
+MARGEM_RECORTE_INCREMENTAL = 1e-12
+
+"""
+Exceção QuadroCancelado -> O quadro em geração foi cancelado (ver Renderizador.comandos_cena)
+"""
+class QuadroCancelado(Exception):
+    pass
+
+"""
+Classe ComandoDesenho -> Um item a ser desenhado, em coordenadas de dispositivo (pixels)
+Atributos:
+    tipo (str): COMANDO_OVAL, COMANDO_LINHA, COMANDO_POLIGONO ou COMANDO_RETANGULO
+    coordenadas (list): Coordenadas x1, y1, x2, y2, ... do item
+    opcoes (dict): Opções de desenho (fill, outline, dash), no formato do canvas do tkinter
+    chave: Identificação do item entre quadros (o indice da forma na cena; negativa nos marcadores de pontos agregados),
+        usada pela camada retida
+"""
+class ComandoDesenho:
+    __slots__ = ('tipo', 'coordenadas', 'opcoes', 'chave')
+
+    def __init__(self, tipo, coordenadas, opcoes, chave=None):
+        self.tipo = tipo
+        self.coordenadas = coordenadas
+        self.opcoes = opcoes
+        self.chave = chave
+
+    def __repr__(self):
+        return f'ComandoDesenho({self.tipo!r}, {self.coordenadas!r}, {self.opcoes!r}, {self.chave!r})'
+
+"""
+Classe Renderizador -> Pipeline de visualização sem interface gráfica
+Guarda o estado de visualização (window, viewport, angulo, escala e algoritmos de clipping), normaliza
+e recorta as formas e gera os comandos de desenho da janela principal e do minimapa.
+Os comandos podem ser desenhados em um canvas do tkinter (desenhar_comandos) ou rasterizados em
+uma imagem (rasterizar), o que permite renderizar cenas em servidores e em lote, sem tkinter.
+Atributos:
+    window (dict): Window em coordenadas de mundo
+    window_normalizada (dict): Window em coordenadas normalizadas
+    viewport (dict): Viewport da janela principal
+    minimap_viewport (dict): Viewport do minimapa
+    world_size (dict): Extensão do mundo exibida no minimapa
+    formas (GeometriaCena): Formas da cena
+    indice_espacial (GradeUniforme): Indice espacial das formas
+    matriz_normalizada (numpy.ndarray): Matriz de normalização atual
+    matriz_referencia (numpy.ndarray): Matriz com a qual as coordenadas normalizadas das formas foram calculadas
+    matriz_delta (numpy.ndarray): Transformação (escala uniforme e translação) da normalização de referência
+        para a atual: matriz_normalizada = matriz_delta · matriz_referencia
+    angulo (float): Angulo de rotação da window
+    escala (float): Escala (zoom) da window
+    algClippingReta (int): 0 para Cohen-Sutherland, 1 para Liang-Barsky
+    algClippingPoligono (int): Algoritmo de clipping de polígonos (constantes RECORTE_* de poligonos)
+    normalizacao_pendente (bool): Se os vertices ainda precisam ser normalizados com a matriz atual (após uma rotação)
+    cache_quadros (CacheQuadros): Comandos da janela principal já gerados, por estado de visualização
+    recorte_paralelo (RecorteParalelo): Recorte dos polígonos parciais em um conjunto de processos (opcional)
+    instrumentacao (Instrumentacao): Medidas de tempo, alocações e contadores de cada etapa (desativada por padrão)
+    niveis_detalhe (NiveisDetalhe): Versões simplificadas dos polígonos grandes, usadas nas visões afastadas (None desativa)
+    piramide (PiramideTiles): Tiles pré-renderizados usados nas imagens de visões sem rotação (opcional)
+    versao_formas (int): Numero de edições das formas (adicionar_forma, mover_forma, remover_forma)
+    alteracoes (dict): {indice da forma: versao_formas da sua ultima edição}, usado para atualizar os quadros do cache
+    modo_pontos (int): Desenho dos pontos: PONTOS_INDIVIDUAIS, PONTOS_AGREGADOS ou PONTOS_DENSIDADE (ver densidade)
+"""
+class Renderizador:
+    def __init__(self, viewport: dict = None, window: dict = None, world_size: dict = None, minimap_viewport: dict = None,
+                 orcamento_cache: int = ORCAMENTO_PADRAO):
+        self.window = dict(window or {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0})
+        self.window_normalizada = {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0}
+        self.viewport = dict(viewport or {"xmin": 0, "ymin": 0, "xmax": 0, "ymax": 0})
+        self.minimap_viewport = dict(minimap_viewport or {"xmin": 0, "ymin": 0, "xmax": 150, "ymax": 120})
+        self.world_size = dict(world_size or {"xmin": 0, "ymin": 0, "xmax": 50, "ymax": 37.5})
+
+        self.formas = GeometriaCena()
+        self.indice_espacial = None
+        self.matriz_normalizada = np.identity(3)
+        self.matriz_referencia = None
+        self.matriz_delta = np.identity(3)
+        self.normalizacao_pendente = False
+        self.calculou_window = False
+        self.angulo = 0.0
+        self.escala = 1.0
+        self.algClippingReta = 1
+        self.algClippingPoligono = poligonos.RECORTE_AUTOMATICO
+        self.cache_quadros = CacheQuadros(orcamento_cache)
+        self.recorte_paralelo = None
+        self.instrumentacao = Instrumentacao()
+        self.niveis_detalhe = None
+        self.usar_niveis_detalhe = True
+        self.piramide = None
+        self.versao_formas = 0
+        self.alteracoes = {}
+        self.modo_pontos = PONTOS_INDIVIDUAIS
+        self._ultima_consulta = None
+
+    """
+    Carrega um arquivo de entrada (usando o cache binario quando disponivel) e normaliza a cena
+    Parâmetros:
+        caminho (str): Caminho do arquivo XML
+        progresso (callable): Função opcional progresso(bytes_lidos, bytes_totais)
+        ao_ler_cabecalho (callable): Função opcional chamada com a Cena após a viewport e a window serem aplicadas
+    """
+    def carregar_arquivo(self, caminho, progresso=None, ao_ler_cabecalho=None):
+        def aplicar_cabecalho(cena):
+            self.viewport.update(cena.viewport)
+            self.window.update(cena.window)
+            if ao_ler_cabecalho is not None:
+                ao_ler_cabecalho(cena)
+
+        cena = cache_binario.carregar_cena(caminho, progresso=progresso, ao_ler_cabecalho=aplicar_cabecalho)
+        self.definir_formas(cena.geometria)
+        return cena
+
+    """
+    Aplica uma cena já carregada (viewport, window e formas) e a normaliza
+    Permite ler o arquivo (ex.: cache_binario.carregar_cena) sem reservar o renderizador durante a leitura
+    Parâmetros:
+        cena (Cena): Cena lida do arquivo
+    """
+    def definir_cena(self, cena):
+        self.viewport.update(cena.viewport)
+        self.window.update(cena.window)
+        self.definir_formas(cena.geometria)
+
+    """
+    Ativa o recorte paralelo dos polígonos parcialmente visiveis (ver RecorteParalelo)
+    Parâmetros:
+        processos (int): Numero de processos (padrão: numero de CPUs)
+        minimo_poligonos (int): Abaixo desta quantidade de polígonos parciais o recorte continua serial
+    """
+    def ativar_recorte_paralelo(self, processos: int = None, minimo_poligonos: int = None):
+        from algoritmos.recorte_paralelo import RecorteParalelo, MINIMO_POLIGONOS
+
+        self.desativar_recorte_paralelo()
+        self.recorte_paralelo = RecorteParalelo(processos, MINIMO_POLIGONOS if minimo_poligonos is None else minimo_poligonos)
+
+    """
+    Encerra os processos do recorte paralelo e volta ao recorte serial
+    """
+    def desativar_recorte_paralelo(self):
+        if self.recorte_paralelo is not None:
+            self.recorte_paralelo.fechar()
+            self.recorte_paralelo = None
+
+    """
+    Ativa a pirâmide de tiles: as imagens de visões sem rotação passam a ser compostas a partir de tiles
+    pré-renderizados, guardados em disco (ver PiramideTiles)
+    Parâmetros:
+        diretorio (str): Diretório do cache de tiles
+        niveis (int): Numero de niveis de zoom (padrão: NIVEIS_PADRAO)
+        limite_bytes (int): Tamanho maximo do cache em disco (padrão: LIMITE_PADRAO)
+    """
+    def ativar_piramide(self, diretorio, niveis: int = None, limite_bytes: int = None):
+        from algoritmos.piramide_tiles import PiramideTiles, NIVEIS_PADRAO, LIMITE_PADRAO
+
+        self.piramide = PiramideTiles(
+            self.formas, diretorio, self.world_size, NIVEIS_PADRAO if niveis is None else niveis,
+            limite_bytes=LIMITE_PADRAO if limite_bytes is None else limite_bytes,
+            algoritmo_reta=self.algClippingReta, algoritmo_poligono=self.algClippingPoligono
+        )
+
+    def desativar_piramide(self):
+        self.piramide = None
+
+    """
+    Retorna se a imagem da visão atual pode ser composta pela pirâmide de tiles: a visão nao tem rotação,
+    os tiles foram gerados com os algoritmos de clipping e o fundo atuais, e os pontos sao desenhados
+    individualmente, como nos tiles (ver definir_modo_pontos)
+    """
+    def usa_piramide(self, fundo='white'):
+        piramide = self.piramide
+        return (piramide is not None and self.angulo % 360 == 0 and self.escala > 0 and piramide.fundo == fundo
+                and piramide.algoritmo_reta == self.algClippingReta and piramide.algoritmo_poligono == self.algClippingPoligono
+                and self.modo_pontos == PONTOS_INDIVIDUAIS)
+
+    """
+    Região do mundo visivel na janela principal (window com o zoom aplicado), sem considerar a rotação
+    """
+    def window_visivel(self):
+        cx = (self.window['xmin'] + self.window['xmax']) / 2
+        cy = (self.window['ymin'] + self.window['ymax']) / 2
+        meia_largura = (self.window['xmax'] - self.window['xmin']) / (2 * self.escala)
+        meia_altura = (self.window['ymax'] - self.window['ymin']) / (2 * self.escala)
+        return {"xmin": cx - meia_largura, "ymin": cy - meia_altura, "xmax": cx + meia_largura, "ymax": cy + meia_altura}
+
+    """
+    Define as formas da cena, constroi o indice espacial e normaliza
+    """
+    def definir_formas(self, formas: GeometriaCena):
+        self.formas = formas
+        self.matriz_referencia = None
+        self.cache_quadros.limpar()
+        self.alteracoes = {}
+        # Indice espacial sobre as caixas envolventes das formas, construido uma unica vez na leitura
+        self.indice_espacial = GradeUniforme(self.formas.caixas_mundo)
+        self.niveis_detalhe = NiveisDetalhe(self.formas) if self.usar_niveis_detalhe else None
+        if self.piramide is not None:
+            self.piramide.definir_geometria(self.formas)
+        self.normalizar()
+
+    """
+    Ativa ou desativa os niveis de detalhe (polígonos simplificados nas visões afastadas)
+    """
+    def definir_niveis_detalhe(self, ativo: bool):
+        self.usar_niveis_detalhe = ativo
+        self.niveis_detalhe = NiveisDetalhe(self.formas) if ativo and self.indice_espacial is not None else None
+        self.cache_quadros.limpar()
+
+    """
+    Define o desenho dos pontos na janela principal e no minimapa
+    Nos modos agregados (ver densidade) os pontos visiveis sao agrupados pela celula da tela em que caem,
+    com operações vetorizadas, e desenhados como marcadores (PONTOS_AGREGADOS) ou como uma imagem de
+    densidade (PONTOS_DENSIDADE, ver imagem_pontos), em vez de um oval por ponto
+    Parâmetros:
+        modo (int): PONTOS_INDIVIDUAIS, PONTOS_AGREGADOS ou PONTOS_DENSIDADE
+    """
+    def definir_modo_pontos(self, modo: int):
+        if modo not in (PONTOS_INDIVIDUAIS, PONTOS_AGREGADOS, PONTOS_DENSIDADE):
+            raise ValueError(f'modo de desenho dos pontos desconhecido: {modo}')
+        self.modo_pontos = modo
+
+    """
+    Adiciona uma forma a cena sem reconstruir o indice espacial nem normalizar as demais formas
+    Parâmetros:
+        forma (Ponto, Reta ou Poligono): Forma com coordenadas de mundo
+    Retorna:
+        int: Indice da nova forma (os indices das formas existentes nao mudam)
+    """
+    def adicionar_forma(self, forma):
+        indice = self.formas.append(forma)
+        if self.indice_espacial is None:
+            self.definir_formas(self.formas)
+            return indice
+
+        caixa = self.formas.caixas_mundo[indice]
+        self.indice_espacial.adicionar(caixa)
+        if self.niveis_detalhe is not None:
+            self.niveis_detalhe.adicionar_forma(indice)
+        self._editar_forma(indice, caixa)
+        return indice
+
+    """
+    Translada uma forma da cena (coordenadas de mundo)
+    """
+    def mover_forma(self, indice: int, dx: float, dy: float):
+        anterior = self.formas.caixas_mundo[indice].copy()
+        self.formas.mover_forma(indice, dx, dy)
+        caixa = self.formas.caixas_mundo[indice]
+        self.indice_espacial.atualizar(indice, caixa)
+        if self.niveis_detalhe is not None:
+            self.niveis_detalhe.mover_forma(indice, dx, dy)
+        self._editar_forma(indice, anterior, caixa)
+
+    """
+    Remove uma forma da cena; os indices das demais formas nao mudam (ver GeometriaCena.remover_forma)
+    """
+    def remover_forma(self, indice: int):
+        anterior = self.formas.caixas_mundo[indice].copy()
+        self.formas.remover_forma(indice)
+        self.indice_espacial.remover(indice)
+        if self.niveis_detalhe is not None:
+            self.niveis_detalhe.remover_forma(indice)
+        self._editar_forma(indice, anterior)
+
+    # Normaliza apenas a forma editada (se as demais já estao normalizadas), invalida os tiles das regiões
+    # afetadas e registra a edição, para que os quadros do cache sejam atualizados apenas nessa forma
+    def _editar_forma(self, indice, *caixas):
+        if self.matriz_referencia is not None and not self.normalizacao_pendente:
+            self.formas.normalizar_formas([indice], self.matriz_referencia)
+        if self.piramide is not None:
+            for caixa in caixas:
+                self.piramide.invalidar(caixa)
+
+        self.versao_formas += 1
+        self.alteracoes[indice] = self.versao_formas
+        if len(self.alteracoes) > LIMITE_ALTERACOES:
+            self.cache_quadros.limpar()
+            self.alteracoes = {}
+
+    """
+    Movimenta a window em meia unidade na direção informada ("Up", "Down", "Left" ou "Right")
+    """
+    def movimentar(self, direcao):
+        match(direcao):
+            case "Up":
+                self.window['ymin'] = self.window['ymin'] + 0.5
+                self.window['ymax'] = self.window['ymax'] + 0.5
+            case "Down":
+                self.window['ymin'] = self.window['ymin'] - 0.5
+                self.window['ymax'] = self.window['ymax'] - 0.5
+            case "Left":
+                self.window['xmin'] = self.window['xmin'] - 0.5
+                self.window['xmax'] = self.window['xmax'] - 0.5
+            case "Right":
+                self.window['xmin'] = self.window['xmin'] + 0.5
+                self.window['xmax'] = self.window['xmax'] + 0.5
+        self.normalizar()
+
+    """
+    Rotaciona a window pelo angulo informado (em graus)
+    """
+    def rotacionar(self, angulo):
+        self.angulo = self.angulo + angulo
+        if self.angulo == 360 or self.angulo == -360:
+            self.angulo = 0
+        self.normalizar()
+
+    """
+    Ajusta o zoom da window somando o valor informado a escala
+    """
+    def aplicar_zoom(self, escala=1.0):
+        self.escala = self.escala + escala
+        self.normalizar()
+
+    """
+    Calcula a matriz de normalização para o angulo atual e normaliza a window (apenas na primeira vez) e as formas
+    Movimentos e zoom mudam a normalização apenas por uma translação e uma escala uniforme (matriz_delta):
+    nesses casos os vertices nao sao normalizados novamente; o recorte é feito com a window levada ao
+    espaço de referência (com a margem de window_recorte) e a diferença é absorvida pela transformada de viewport.
+    Apenas rotações (ou escalas extremas) exigem normalizar novamente todos os vertices; isso é adiado ate
+    o proximo recorte (garantir_normalizacao), de modo que uma visão atendida pelo cache de quadros nao o exige
+    """
+    def normalizar(self):
+        with self.instrumentacao.etapa('normalizacao'):
+            self._normalizar()
+
+    def _normalizar(self):
+        matriz_normalizada = self.calcular_matriz_normalizada(self.angulo)
+        self.matriz_normalizada = matriz_normalizada
+        if not self.calculou_window:
+            self.normalizar_window(matriz_normalizada)
+            self.calculou_window = True
+
+        if self.matriz_referencia is not None and not self.normalizacao_pendente:
+            delta = np.dot(matriz_normalizada, np.linalg.inv(self.matriz_referencia))
+            if delta_incremental(delta):
+                self.matriz_delta = delta
+                return
+        self.normalizacao_pendente = True
+
+    """
+    Normaliza os vertices com a matriz atual, caso isso tenha sido adiado por normalizar
+    """
+    def garantir_normalizacao(self):
+        if self.normalizacao_pendente:
+            with self.instrumentacao.etapa('normalizacao_vertices'):
+                self.normalizar_formas(self.matriz_normalizada)
+
+    """
+    Normaliza novamente todos os vertices com a matriz atual, descartando a transformação incremental
+    (necessário antes de ler as coordenadas normalizadas das formas diretamente, como na exportação)
+    """
+    def sincronizar_normalizacao(self):
+        self.garantir_normalizacao()
+        if self.matriz_referencia is not None and not np.array_equal(self.matriz_delta, np.identity(3)):
+            self.normalizar_formas(self.matriz_normalizada)
+
+    """
+    Calcula a matriz de normalização de acordo com o angulo passado como parametro
+    """
+    def calcular_matriz_normalizada(self, angulo=0):
+        matriz_s1 = [
+            [self.escala, 0, 0],
+            [0, self.escala, 0],
+            [0, 0, 1],
+        ]
+
+        matriz_s = [
+            [2.0/((self.window['xmax'] - self.window['xmin'])), 0, 0],
+            [0, 2.0/(self.window['ymax'] - self.window['ymin']), 0],
+            [0, 0, 1]
+        ]
+        angulo_radianos = math.radians(-angulo)
+
+        matriz_r = [
+            [math.cos(angulo_radianos), -math.sin(angulo_radianos), 0],
+            [math.sin(angulo_radianos), math.cos(angulo_radianos), 0],
+            [0, 0, 1]
+        ]
+
+        window_centro_x = (self.window['xmax'] + self.window['xmin'])/2.0
+        window_centro_y = (self.window['ymax'] + self.window['ymin'])/2.0
+
+        matriz_t = [
+            [1, 0, -window_centro_x],
+            [0, 1, -window_centro_y],
+            [0, 0, 1]
+        ]
+
+        matriz_normalizada = np.dot(matriz_s1, matriz_s)
+        matriz_normalizada = np.dot(matriz_normalizada, matriz_r)
+        matriz_normalizada = np.dot(matriz_normalizada, matriz_t)
+
+        return matriz_normalizada
+
+    """
+    Normaliza a window de acordo com a matriz de normalização
+    """
+    def normalizar_window(self, matriz_normalizada):
+        windowp1 = np.dot(matriz_normalizada, [[self.window['xmax']], [self.window['ymax']], [1]])
+        windowp2 = np.dot(matriz_normalizada, [[self.window['xmin']], [self.window['ymin']], [1]])
+
+        self.window_normalizada['xmin'] = float(windowp2[0, 0])
+        self.window_normalizada['ymin'] = float(windowp2[1, 0])
+
+        self.window_normalizada['xmax'] = float(windowp1[0, 0])
+        self.window_normalizada['ymax'] = float(windowp1[1, 0])
+
+    """
+    Normaliza todas as formas da cena em lote, com uma unica multiplicação de matrizes
+    """
+    def normalizar_formas(self, matriz_normalizada):
+        self.formas.normalizar(matriz_normalizada)
+        self.matriz_referencia = matriz_normalizada
+        self.matriz_delta = np.identity(3)
+        self.normalizacao_pendente = False
+
+    """
+    Retorna a window normalizada levada ao espaço de referência (inversa de matriz_delta)
+    Como matriz_delta é apenas escala uniforme positiva e translação, o resultado continua alinhado aos eixos
+    """
+    def window_referencia(self):
+        if self.matriz_delta[0, 0] == 1 and self.matriz_delta[0, 2] == 0 and self.matriz_delta[1, 2] == 0:
+            return dict(self.window_normalizada)
+
+        escala = self.matriz_delta[0, 0]
+        dx, dy = self.matriz_delta[0, 2], self.matriz_delta[1, 2]
+        return {
+            "xmin": (self.window_normalizada['xmin'] - dx) / escala,
+            "ymin": (self.window_normalizada['ymin'] - dy) / escala,
+            "xmax": (self.window_normalizada['xmax'] - dx) / escala,
+            "ymax": (self.window_normalizada['ymax'] - dy) / escala,
+        }
+
+    """
+    Window utilizada no recorte, no espaço de referência das coordenadas normalizadas das formas
+    Fora da normalização de referência, a window levada a esse espaço tem erro de arredondamento, e recebe uma
+    margem de MARGEM_RECORTE_INCREMENTAL vezes o seu maior lado para que formas exatamente sobre os lados
+    continuem visiveis. O resultado nao é idêntico ao de normalizar novamente os vertices: formas a até essa
+    distancia por fora da window (uma fração desprezivel de pixel) também sao consideradas visiveis
+    """
+    def window_recorte(self):
+        window = self.window_referencia()
+        margem = 0.0
+        if not np.array_equal(self.matriz_delta, np.identity(3)):
+            margem = MARGEM_RECORTE_INCREMENTAL * max(window['xmax'] - window['xmin'], window['ymax'] - window['ymin'])
+        return poligonos.Window(window['xmin'] - margem, window['ymin'] - margem, window['xmax'] + margem, window['ymax'] + margem)
+
+    """
+    Gera, em ordem, as formas visiveis da cena já recortadas pela window
+    As coordenadas normalizadas das formas geradas estao no espaço de referência (matriz_referencia)
+    """
+    def recortar_formas(self, window=None):
+        for _, forma in self.recortar_formas_indexadas(window):
+            yield forma
+
+    """
+    Gera, em ordem, os pares (indice da forma na cena, forma visivel recortada)
+    """
+    def recortar_formas_indexadas(self, window=None):
+        for indice, tipo, coordenadas in self.recortar_coordenadas(window):
+            if coordenadas is None:
+                yield indice, self.formas[indice]
+            else:
+                yield indice, forma_normalizada(tipo, coordenadas, self.formas.cor(indice))
+
+    """
+    Recorta as formas da cena pela window, trabalhando diretamente sobre os arrays da geometria
+    Gera, em ordem, as triplas (indice da forma, tipo, coordenadas), onde coordenadas é:
+        None, quando a forma é visivel sem precisar de recorte (seus vertices sao os da geometria);
+        um array (K,2) com os vertices normalizados (espaço de referência) da forma recortada
+    Parâmetros:
+        window (Window): Window de recorte (padrão: window_recorte)
+        geometria (GeometriaCena): Geometria recortada, com as mesmas formas da cena (padrão: as formas da cena;
+            ver geometria_detalhe), já normalizada com matriz_referencia
+        cancelado (callable): Função opcional verificada entre as etapas; quando retorna True o recorte
+            é interrompido com QuadroCancelado
+        indices (list): Se informado, apenas essas formas (em ordem crescente) sao recortadas (ex.: formas editadas)
+        incluir_pontos (bool): Se False, os pontos sao ignorados (nos modos agregados eles sao tratados por pontos_visiveis)
+    """
+    def recortar_coordenadas(self, window=None, geometria=None, cancelado=None, indices=None, incluir_pontos=True):
+        if self.indice_espacial is None:
+            return
+        instrumentacao = self.instrumentacao
+        self.garantir_normalizacao()
+        verificar_cancelamento(cancelado)
+        if geometria is None:
+            geometria = self.formas
+        if window is None:
+            window = self.window_recorte()
+        limites = poligonos.limites_window(window)
+
+        # Consulta o indice espacial com a região do mundo visivel pela window: apenas essas formas sao candidatas ao recorte
+        with instrumentacao.etapa('consulta_indice'):
+            extensao = extensao_mundo(self.matriz_referencia, limites)
+            if indices is None:
+                candidatas = self.consultar_indice(extensao)
+            else:
+                candidatas = self.indice_espacial.filtrar(indices, *extensao)
+            if not incluir_pontos:
+                candidatas = candidatas[geometria.tipos[candidatas] != TIPO_PONTO]
+        verificar_cancelamento(cancelado)
+
+        # Pré-classificação pelas caixas envolventes: formas totalmente fora sao rejeitadas
+        # e formas totalmente dentro sao aceitas sem passar pelos algoritmos de recorte
+        # A classificação e os tipos ficam alinhados com as candidatas: o custo nao depende do tamanho da cena
+        with instrumentacao.etapa('classificacao'):
+            tipos = geometria.tipos[candidatas]
+            classificacao = poligonos.classificar_caixas(window, geometria.caixas[candidatas])
+            parcial = classificacao == poligonos.CAIXA_PARCIAL
+
+        # Todas as retas sao recortadas de uma só vez
+        with instrumentacao.etapa('recorte_retas'):
+            retas_recortadas = self.recortar_retas(window, candidatas[parcial & (tipos == TIPO_RETA)], geometria)
+        verificar_cancelamento(cancelado)
+
+        # Os polígonos parciais sao recortados antes do laço (no modo paralelo, nos processos)
+        with instrumentacao.etapa('recorte_poligonos'):
+            parciais = candidatas[parcial & (tipos == TIPO_POLIGONO)]
+            poligonos_recortados = self.recortar_poligonos(window, parciais, geometria, cancelado)
+        verificar_cancelamento(cancelado)
+
+        if instrumentacao.ativa:
+            instrumentacao.contar('formas_candidatas', len(candidatas))
+            instrumentacao.contar('poligonos_parciais', len(parciais))
+            instrumentacao.contar('retas_recortadas', len(retas_recortadas))
+            instrumentacao.contar('poligonos_recortados', len(poligonos_recortados))
+            intersecoes_retas, intersecoes_poligonos, vertices = contar_intersecoes(
+                limites, geometria.normalizadas, geometria.deslocamentos, retas_recortadas, poligonos_recortados
+            )
+            instrumentacao.contar('intersecoes_retas', intersecoes_retas)
+            instrumentacao.contar('intersecoes_poligonos', intersecoes_poligonos)
+            instrumentacao.contar('vertices_recortados', vertices)
+
+        for indice, tipo, situacao in zip(candidatas.tolist(), tipos.tolist(), classificacao.tolist()):
+            if situacao == poligonos.CAIXA_FORA:
+                continue
+
+            # A caixa envolvente de um ponto é o proprio ponto: nunca é parcial
+            if situacao == poligonos.CAIXA_DENTRO or tipo == TIPO_PONTO:
+                yield indice, tipo, None
+
+            elif tipo == TIPO_RETA:
+                if indice in retas_recortadas:
+                    yield indice, tipo, retas_recortadas[indice]
+
+            elif indice in poligonos_recortados:
+                yield indice, tipo, poligonos_recortados[indice]
+
+    # Consulta o indice espacial com uma região do mundo (xmin, ymin, xmax, ymax); a ultima consulta é reaproveitada
+    # enquanto as formas nao mudam (ex.: os pontos agregados consultam a mesma região que o recorte do quadro)
+    def consultar_indice(self, extensao):
+        chave = (tuple(extensao), self.indice_espacial, self.versao_formas)
+        if self._ultima_consulta is None or self._ultima_consulta[0] != chave:
+            self._ultima_consulta = (chave, self.indice_espacial.consultar(*extensao))
+        return self._ultima_consulta[1]
+
+    """
+    Recorta os polígonos parcialmente visiveis informados com o algoritmo selecionado
+    No modo paralelo (ativar_recorte_paralelo) o recorte é distribuido entre os processos
+    Retorna um dicionario {indice da forma: array (K,2) dos vertices recortados} apenas com os polígonos visiveis
+    """
+    def recortar_poligonos(self, window, indices, geometria=None, cancelado=None):
+        if geometria is None:
+            geometria = self.formas
+        if self.recorte_paralelo is not None:
+            return self.recorte_paralelo.recortar_poligonos(geometria, window, self.algClippingPoligono, indices, cancelado)
+        return recortar_poligonos_coordenadas(
+            geometria.normalizadas, geometria.deslocamentos, window, poligonos.limites_window(window), self.algClippingPoligono, indices,
+            cancelado
+        )
+
+    """
+    Aplica o clipping nas retas parcialmente visiveis informadas com uma unica chamada do algoritmo selecionado (versão em lote)
+    Retorna um dicionario {indice da forma: array (2,2) da reta recortada} apenas com as retas recortadas visiveis
+    """
+    def recortar_retas(self, window, indices, geometria=None):
+        if geometria is None:
+            geometria = self.formas
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return {}
+
+        inicio = geometria.deslocamentos[indices]
+        pontos1 = geometria.normalizadas[inicio]
+        pontos2 = geometria.normalizadas[inicio + 1]
+        if self.algClippingReta == 0:
+            pontos1, pontos2, visiveis = reta_cohen.CohenSutherlandClippingLote(window, pontos1, pontos2)
+        else:
+            pontos1, pontos2, visiveis = reta_liang.LiangBarskyClippingLote(window, pontos1, pontos2)
+
+        retas = np.stack((pontos1[visiveis], pontos2[visiveis]), axis=1)
+        return dict(zip(indices[visiveis].tolist(), retas))
+
+    """
+    Retorna os indices (em ordem crescente) dos pontos visiveis pela window, sem passar pelo laço das formas:
+    equivale ao PointClipping de cada ponto, feito de uma só vez pelas caixas envolventes (a de um ponto é o proprio ponto)
+    Parâmetros:
+        window (Window): Window de recorte (padrão: window_recorte)
+    """
+    def pontos_visiveis(self, window=None):
+        if self.indice_espacial is None:
+            return np.empty(0, dtype=np.int64)
+        self.garantir_normalizacao()
+        if window is None:
+            window = self.window_recorte()
+        with self.instrumentacao.etapa('consulta_pontos'):
+            extensao = extensao_mundo(self.matriz_referencia, poligonos.limites_window(window))
+            candidatas = self.consultar_indice(extensao)
+            pontos = candidatas[self.formas.tipos[candidatas] == TIPO_PONTO]
+            visiveis = poligonos.classificar_caixas(window, self.formas.caixas[pontos]) != poligonos.CAIXA_FORA
+            return np.sort(pontos[visiveis])
+
+    """
+    Matriz composta que leva as coordenadas de mundo diretamente aos pixels da viewport
+    (normalização de referência, seguida da transformada de viewport da window no espaço de referência)
+    """
+    def matriz_dispositivo(self):
+        return np.dot(matriz_viewport(self.window_referencia(), self.viewport), self.matriz_referencia)
+
+    """
+    Retorna a geometria a recortar e desenhar na janela principal: o nivel de detalhe adequado ao tamanho
+    atual de um pixel (em unidades de mundo), normalizado com matriz_referencia, ou as formas da cena
+    """
+    def geometria_detalhe(self):
+        self.garantir_normalizacao()
+        if self.niveis_detalhe is None or self.matriz_referencia is None:
+            return self.formas
+        with self.instrumentacao.etapa('nivel_detalhe'):
+            return self.niveis_detalhe.geometria_para(tamanho_pixel(self.matriz_dispositivo()), self.matriz_referencia)
+
+    """
+    Gera os comandos de desenho da janela principal: as formas visiveis, recortadas e levadas a viewport
+    Os vertices das formas nao recortadas vao do mundo aos pixels com a matriz composta, e os das formas
+    recortadas (normalizados) com a transformada de viewport: cada grupo em uma unica operação vetorizada
+    Os comandos ficam no cache de quadros: voltar a um estado de visualização recente nao repete o recorte.
+    A lista retornada é compartilhada com o cache e nao deve ser modificada
+    Parâmetros:
+        cancelado (callable): Função opcional verificada durante a geração do quadro; quando retorna True
+            a geração é interrompida com QuadroCancelado (usado pelo redesenho em segundo plano)
+    """
+    def comandos_cena(self, cancelado=None):
+        chave = self.chave_visao()
+        quadro = self.cache_quadros.obter_quadro(chave)
+        if quadro is None:
+            comandos = self.gerar_comandos_cena(cancelado)
+            self.cache_quadros.guardar(chave, comandos, self.versao_formas)
+        else:
+            self.instrumentacao.contar('cache_quadros_acertos')
+            comandos, versao = quadro
+            # Formas editadas depois que o quadro foi gerado: apenas os seus comandos sao gerados novamente
+            if versao != self.versao_formas:
+                editadas = sorted(indice for indice, edicao in self.alteracoes.items() if edicao > versao)
+                comandos = self.atualizar_comandos(comandos, editadas, cancelado)
+                self.cache_quadros.guardar(chave, comandos, self.versao_formas)
+        self.instrumentacao.contar('comandos_desenho', len(comandos))
+        return comandos
+
+    """
+    Retorna uma copia dos comandos de um quadro (em ordem de forma) com os comandos das formas informadas
+    gerados novamente para a visão atual: as demais formas reutilizam os comandos já recortados
+    Parâmetros:
+        comandos (list): Comandos de um quadro da visão atual
+        indices (list): Indices das formas editadas, em ordem crescente
+        cancelado (callable): Função opcional de cancelamento (ver comandos_cena)
+    """
+    def atualizar_comandos(self, comandos, indices, cancelado=None):
+        with self.instrumentacao.etapa('atualizacao_formas'):
+            novos = {comando.chave: comando for comando in self.gerar_comandos_cena(cancelado, indices)}
+            self.instrumentacao.contar('formas_atualizadas', len(indices))
+
+            comandos = list(comandos)
+            for indice in indices:
+                posicao = bisect.bisect_left(comandos, indice, key=chave_comando)
+                existe = posicao < len(comandos) and comandos[posicao].chave == indice
+                novo = novos.get(indice)
+                if novo is None:
+                    if existe:
+                        del comandos[posicao]
+                elif existe:
+                    comandos[posicao] = novo
+                else:
+                    comandos.insert(posicao, novo)
+
+            # No modo agregado, a edição de um ponto pode mudar qualquer marcador: todos sao gerados novamente
+            if self.modo_pontos == PONTOS_AGREGADOS and (self.formas.tipos[indices] == TIPO_PONTO).any():
+                comandos[:bisect.bisect_left(comandos, 0, key=chave_comando)] = self.comandos_pontos_agregados()
+            return comandos
+
+    """
+    Chave do estado de visualização atual no cache de quadros
+    """
+    def chave_visao(self):
+        return chave_visao(self.window, self.viewport, self.angulo, self.escala, (self.algClippingReta, self.algClippingPoligono, self.modo_pontos))
+
+    """
+    Gera os comandos de desenho da janela principal, sem consultar o cache de quadros
+    Parâmetros:
+        indices (list): Se informado, apenas os comandos dessas formas sao gerados (ver recortar_coordenadas)
+    """
+    def gerar_comandos_cena(self, cancelado=None, indices=None):
+        geometria = self.geometria_detalhe()
+        agregar = self.modo_pontos != PONTOS_INDIVIDUAIS
+        itens = list(self.recortar_coordenadas(geometria=geometria, cancelado=cancelado, indices=indices, incluir_pontos=not agregar))
+
+        # Os marcadores agregados vêm antes das formas (chaves negativas), e sao gerados a partir de todos os pontos visiveis
+        marcadores = []
+        if self.modo_pontos == PONTOS_AGREGADOS and indices is None:
+            marcadores = self.comandos_pontos_agregados()
+        if not itens:
+            return marcadores
+
+        with self.instrumentacao.etapa('transformada_viewport'):
+            # Vertices das formas nao recortadas, levados do mundo aos pixels de uma só vez
+            inteiras = [indice for indice, _, coordenadas in itens if coordenadas is None]
+            vertices, quantidades = indices_vertices(geometria.deslocamentos, inteiras)
+            pixels_inteiras = aplicar_matriz(self.matriz_dispositivo(), geometria.coordenadas[vertices]).ravel().tolist()
+            quantidades = iter(quantidades.tolist())
+
+            # Vertices das formas recortadas (normalizados), levados aos pixels de uma só vez
+            recortadas = [coordenadas for _, _, coordenadas in itens if coordenadas is not None]
+            pixels_recortadas = []
+            if recortadas:
+                matriz = matriz_viewport(self.window_referencia(), self.viewport)
+                pixels_recortadas = aplicar_matriz(matriz, np.concatenate(recortadas)).ravel().tolist()
+
+        verificar_cancelamento(cancelado)
+        with self.instrumentacao.etapa('comandos'):
+            return marcadores + self._montar_comandos(itens, pixels_inteiras, quantidades, pixels_recortadas)
+
+    """
+    Gera os marcadores dos pontos visiveis agrupados por celula da tela e cor (modo PONTOS_AGREGADOS)
+    O numero de marcadores é limitado pela resolução da viewport, e nao pelo numero de pontos.
+    A chave de cada marcador é negativa (-1 - grupo), para nao coincidir com os indices das formas e manter
+    o item do canvas de cada celula entre quadros; os marcadores ficam em ordem crescente de chave
+    """
+    def comandos_pontos_agregados(self):
+        pontos = self.pontos_visiveis()
+        with self.instrumentacao.etapa('agregacao_pontos'):
+            pixels = aplicar_matriz(self.matriz_dispositivo(), self.formas.coordenadas[self.formas.deslocamentos[pontos]])
+            comandos = comandos_marcadores(pixels, self.formas.indices_cor[pontos], self.formas.tabela_cores, self.viewport, RAIO_PONTO)
+            self.instrumentacao.contar('pontos_agregados', len(pontos))
+        return comandos
+
+    """
+    Gera a imagem de densidade dos pontos visiveis na viewport (modo PONTOS_DENSIDADE), desenhada sob as demais formas
+    Retorna:
+        numpy.ndarray: Imagem RGB (altura, largura, 3) com o tamanho da viewport
+    """
+    def imagem_pontos(self, fundo='white'):
+        largura = int(self.viewport['xmax'] - self.viewport['xmin'])
+        altura = int(self.viewport['ymax'] - self.viewport['ymin'])
+        pontos = self.pontos_visiveis()
+        with self.instrumentacao.etapa('densidade_pontos'):
+            pixels = aplicar_matriz(self.matriz_dispositivo(), self.formas.coordenadas[self.formas.deslocamentos[pontos]])
+            tabela_rgb = np.array([cor_rgb(cor) for cor in self.formas.tabela_cores], dtype=float).reshape(-1, 3)
+            cores = tabela_rgb[self.formas.indices_cor[pontos]]
+            self.instrumentacao.contar('pontos_agregados', len(pontos))
+            return imagem_densidade(pixels, cores, largura, altura, cor_rgb(fundo, (255, 255, 255)))
+
+    # Monta os comandos de desenho a partir dos vertices já levados aos pixels
+    def _montar_comandos(self, itens, pixels_inteiras, quantidades, pixels_recortadas):
+
+        tabela_cores = self.formas.tabela_cores
+        cores = self.formas.indices_cor[[indice for indice, _, _ in itens]].tolist()
+
+        # As opções de desenho sao compartilhadas entre os comandos do mesmo tipo e cor
+        opcoes = {}
+
+        comandos = []
+        posicao_inteiras = posicao_recortadas = 0
+        for (indice, tipo, coordenadas), indice_cor in zip(itens, cores):
+            if coordenadas is None:
+                fim = posicao_inteiras + 2 * next(quantidades)
+                pixels = pixels_inteiras[posicao_inteiras:fim]
+                posicao_inteiras = fim
+            else:
+                fim = posicao_recortadas + 2 * len(coordenadas)
+                pixels = pixels_recortadas[posicao_recortadas:fim]
+                posicao_recortadas = fim
+
+            opcoes_forma = opcoes.get((tipo, indice_cor))
+            if opcoes_forma is None:
+                opcoes_forma = opcoes[(tipo, indice_cor)] = opcoes_desenho(tipo, tabela_cores[indice_cor])
+
+            if tipo == TIPO_PONTO:
+                x, y = pixels
+                comandos.append(ComandoDesenho(COMANDO_OVAL, [x - RAIO_PONTO, y - RAIO_PONTO, x + RAIO_PONTO, y + RAIO_PONTO], opcoes_forma, indice))
+            elif tipo == TIPO_RETA:
+                comandos.append(ComandoDesenho(COMANDO_LINHA, pixels, opcoes_forma, indice))
+            else:
+                comandos.append(ComandoDesenho(COMANDO_POLIGONO, pixels, opcoes_forma, indice))
+
+        return comandos
+
+    """
+    Gera os comandos de desenho do minimapa: o mundo inteiro, com todas as formas
+    Todos os vertices da cena sao levados ao minimapa com uma unica operação vetorizada.
+    Os polígonos grandes sao desenhados no nivel de detalhe da escala do minimapa (o mais simplificado em uso)
+    Nos modos agregados (ver definir_modo_pontos) os pontos sao desenhados como marcadores por celula do minimapa,
+    antes das demais formas
+    Parâmetros:
+        indices (list): Se informado, apenas os comandos dessas formas sao gerados (ex.: formas editadas);
+            nos modos agregados os pontos informados sao ignorados (os marcadores vêm apenas com a cena inteira)
+    """
+    def comandos_minimapa(self, indices=None):
+        matriz = matriz_viewport(self.world_size, self.minimap_viewport)
+        geometria = self.formas
+        if self.niveis_detalhe is not None:
+            geometria = self.niveis_detalhe.geometria_para(tamanho_pixel(matriz))
+
+        marcadores = []
+        if self.modo_pontos != PONTOS_INDIVIDUAIS:
+            if indices is None:
+                pontos = np.flatnonzero((geometria.tipos == TIPO_PONTO) & ~geometria.removidas)
+                # O oval de um ponto no minimapa tem 2 pixels, a partir da posição do ponto
+                pixels = aplicar_matriz(matriz, geometria.coordenadas[geometria.deslocamentos[pontos]]) + 1
+                marcadores = comandos_marcadores(pixels, geometria.indices_cor[pontos], geometria.tabela_cores, self.minimap_viewport, 1, 2)
+                indices = np.flatnonzero(geometria.tipos != TIPO_PONTO)
+            else:
+                indices = np.asarray(indices, dtype=np.int64)
+                indices = indices[geometria.tipos[indices] != TIPO_PONTO]
+
+        # As formas removidas nao sao desenhadas
+        if indices is None and geometria.n_removidas == 0:
+            indices = np.arange(len(geometria))
+            pixels = aplicar_matriz(matriz, geometria.coordenadas).ravel().tolist()
+            fins = (2 * geometria.deslocamentos[1:]).tolist()
+        else:
+            indices = np.flatnonzero(~geometria.removidas) if indices is None else np.asarray(indices, dtype=np.int64)
+            indices = indices[~geometria.removidas[indices]]
+            vertices, quantidades = indices_vertices(geometria.deslocamentos, indices)
+            pixels = aplicar_matriz(matriz, geometria.coordenadas[vertices]).ravel().tolist()
+            fins = (2 * np.cumsum(quantidades)).tolist()
+
+        comandos = []
+        cores = geometria.tabela_cores
+        inicio = 0
+        for indice, tipo, indice_cor, fim in zip(indices.tolist(), geometria.tipos[indices].tolist(), geometria.indices_cor[indices].tolist(), fins):
+            coordenadas = pixels[inicio:fim]
+            inicio = fim
+            cor = cores[indice_cor]
+            if tipo == TIPO_PONTO:
+                x, y = coordenadas
+                comandos.append(ComandoDesenho(COMANDO_OVAL, [x, y, x + 2, y + 2], {'fill': cor, 'outline': ''}, indice))
+            elif tipo == TIPO_RETA:
+                comandos.append(ComandoDesenho(COMANDO_LINHA, coordenadas, {'fill': cor}, indice))
+            else:
+                comandos.append(ComandoDesenho(COMANDO_POLIGONO, coordenadas, {'fill': '', 'outline': cor}, indice))
+
+        return marcadores + comandos
+
+    """
+    Gera o comando do retangulo referente a visão da janela principal no minimapa
+    """
+    def comando_retangulo_minimapa(self):
+        matriz = matriz_viewport(self.world_size, self.minimap_viewport)
+        cantos = [[self.window['xmin'], self.window['ymin']], [self.window['xmax'], self.window['ymax']]]
+        coordenadas = aplicar_matriz(matriz, cantos).ravel().tolist()
+        return ComandoDesenho(COMANDO_RETANGULO, coordenadas, {'outline': 'green', 'dash': (1, 1)}, CHAVE_RETANGULO_MINIMAPA)
+
+    """
+    Renderiza a janela principal em uma imagem
+    Com a pirâmide de tiles ativa, visões sem rotação sao compostas a partir dos tiles (ver usa_piramide);
+    no modo PONTOS_DENSIDADE as formas sao desenhadas sobre a imagem de densidade dos pontos
+    Parâmetros:
+        cancelado (callable): Função opcional de cancelamento (ver comandos_cena)
+    Retorna:
+        numpy.ndarray: Imagem RGB (altura, largura, 3) com o tamanho da viewport
+    """
+    def renderizar_imagem(self, fundo='white', cancelado=None):
+        if self.usa_piramide(fundo):
+            return self.piramide.compor(self.window_visivel(), self.viewport, cancelado)
+        largura = int(self.viewport['xmax'] - self.viewport['xmin'])
+        altura = int(self.viewport['ymax'] - self.viewport['ymin'])
+        comandos = self.comandos_cena(cancelado)
+        if self.modo_pontos == PONTOS_DENSIDADE:
+            return rasterizar(comandos, largura, altura, fundo, self.imagem_pontos(fundo))
+        return rasterizar(comandos, largura, altura, fundo)
+
+    """
+    Renderiza o minimapa (formas e retangulo da window) em uma imagem
+    """
+    def renderizar_minimapa(self, fundo='lightgrey'):
+        largura = int(self.minimap_viewport['xmax'] - self.minimap_viewport['xmin'])
+        altura = int(self.minimap_viewport['ymax'] - self.minimap_viewport['ymin'])
+        return rasterizar(self.comandos_minimapa() + [self.comando_retangulo_minimapa()], largura, altura, fundo)
+
+"""
+Interrompe a geração do quadro com QuadroCancelado quando a função cancelado (opcional) retorna True
+"""
+def verificar_cancelamento(cancelado):
+    if cancelado is not None and cancelado():
+        raise QuadroCancelado()
+
+# Chave de ordenação dos comandos de um quadro (o indice da forma)
+def chave_comando(comando):
+    return comando.chave
+
+"""
+Tamanho de um pixel em unidades de mundo para uma matriz que leva o mundo aos pixels
+Com escalas diferentes nos dois eixos, é usado o menor tamanho (o eixo de maior resolução)
+"""
+def tamanho_pixel(matriz):
+    pixels_por_unidade = np.hypot(matriz[0, :2], matriz[1, :2]).max()
+    return 1.0 / pixels_por_unidade if pixels_por_unidade > 0 else math.inf
+
+"""
+Cria uma forma (Ponto, Reta ou Poligono) a partir de seus vertices normalizados
+"""
+def forma_normalizada(tipo, coordenadas, cor):
+    pontos = []
+    for x_norm, y_norm in np.asarray(coordenadas, dtype=float).reshape(-1, 2).tolist():
+        ponto = Ponto(cor=cor)
+        ponto.x_norm, ponto.y_norm = x_norm, y_norm
+        pontos.append(ponto)
+
+    if tipo == TIPO_PONTO:
+        return pontos[0]
+    if tipo == TIPO_RETA:
+        return Reta(pontos[0], pontos[1], cor)
+    return Poligono(pontos, cor)
+
+"""
+Recorta um polígono parcialmente visivel a partir de seus vertices normalizados
+Sutherland-Hodgman (selecionado, ou automatico com polígono convexo) é aplicado direto sobre as coordenadas;
+os demais algoritmos recebem um Poligono montado com os vertices
+Parâmetros:
+    window (Window): Window de recorte
+    limites (tuple): Limites da window (limites_window)
+    coordenadas (numpy.ndarray): Vertices normalizados do polígono (K,2)
+    algoritmo (int): Um dos algoritmos RECORTE_* de poligonos
+    cor (str): Cor do polígono
+Retorna:
+    numpy.ndarray: Vertices recortados (K,2), vazio quando o polígono nao é visivel
+"""
+def recortar_poligono_coordenadas(window, limites, coordenadas, algoritmo, cor='black'):
+    if algoritmo == poligonos.RECORTE_AUTOMATICO:
+        algoritmo = poligonos.algoritmo_automatico(coordenadas)
+    if algoritmo == poligonos.RECORTE_SUTHERLAND_HODGMAN:
+        return SutherlandHodgmanCoordenadas(limites, coordenadas)
+
+    forma_clippada_poligono = poligonos.RecortePoligono(window, forma_normalizada(TIPO_POLIGONO, coordenadas, cor), algoritmo)
+    if not forma_clippada_poligono.visible:
+        return np.empty((0, 2))
+    return np.array([(ponto.x_norm, ponto.y_norm) for ponto in forma_clippada_poligono.pontos], dtype=float).reshape(-1, 2)
+
+"""
+Recorta um conjunto de polígonos parcialmente visiveis (ver recortar_poligono_coordenadas)
+Parâmetros:
+    normalizadas (numpy.ndarray): Coordenadas normalizadas de todos os vertices da cena
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma
+    window (Window), limites (tuple), algoritmo (int): Window de recorte, seus limites e o algoritmo
+    indices (numpy.ndarray): Indices dos polígonos a recortar
+    cancelado (callable): Função opcional verificada a cada INTERVALO_CANCELAMENTO polígonos (ver verificar_cancelamento)
+Retorna:
+    dict: {indice da forma: array (K,2) dos vertices recortados}, apenas com os polígonos visiveis
+"""
+def recortar_poligonos_coordenadas(normalizadas, deslocamentos, window, limites, algoritmo, indices, cancelado=None):
+    recortados = {}
+    for posicao, indice in enumerate(np.asarray(indices).tolist()):
+        if cancelado is not None and posicao % INTERVALO_CANCELAMENTO == 0:
+            verificar_cancelamento(cancelado)
+        recortado = recortar_poligono_coordenadas(window, limites, normalizadas[deslocamentos[indice]:deslocamentos[indice + 1]], algoritmo)
+        if len(recortado):
+            recortados[indice] = recortado
+    return recortados
+
+"""
+Conta as interseções com a borda da window encontradas no recorte de um quadro (usado pela instrumentação)
+Nas retas sao as extremidades movidas pelo clipping (entradas e saídas calculadas por Cohen-Sutherland ou
+Liang-Barsky); nos polígonos, os vertices recortados sobre um lado da window que nao sao cantos dela
+(entradas e saídas do Weiler-Atherton ou as interseções do Sutherland-Hodgman)
+Parâmetros:
+    limites (tuple): Limites da window (limites_window)
+    normalizadas (numpy.ndarray), deslocamentos (numpy.ndarray): Vertices normalizados da cena e seus deslocamentos
+    retas_recortadas (dict), poligonos_recortados (dict): Resultados de recortar_retas e recortar_poligonos
+Retorna:
+    tuple: (interseções das retas, interseções dos polígonos, vertices dos polígonos recortados)
+"""
+def contar_intersecoes(limites, normalizadas, deslocamentos, retas_recortadas, poligonos_recortados):
+    intersecoes_retas = intersecoes_poligonos = vertices = 0
+    if retas_recortadas:
+        inicio = deslocamentos[np.fromiter(retas_recortadas.keys(), dtype=np.int64, count=len(retas_recortadas))]
+        originais = np.stack((normalizadas[inicio], normalizadas[inicio + 1]), axis=1)
+        intersecoes_retas = int((np.stack(list(retas_recortadas.values())) != originais).any(axis=2).sum())
+    if poligonos_recortados:
+        recortados = np.concatenate(list(poligonos_recortados.values()))
+        xmin, ymin, xmax, ymax = limites
+        lado_vertical = (recortados[:, 0] == xmin) | (recortados[:, 0] == xmax)
+        lado_horizontal = (recortados[:, 1] == ymin) | (recortados[:, 1] == ymax)
+        intersecoes_poligonos = int((lado_vertical ^ lado_horizontal).sum())
+        vertices = len(recortados)
+    return intersecoes_retas, intersecoes_poligonos, vertices
+
+"""
+Opções de desenho (no formato do canvas do tkinter) de uma forma do tipo e cor informados
+"""
+def opcoes_desenho(tipo, cor):
+    if tipo == TIPO_PONTO:
+        return {'fill': cor, 'outline': ''}
+    if tipo == TIPO_RETA:
+        return {'fill': cor}
+    return {'fill': '', 'outline': cor}
+
+"""
+Agrupa os pontos (pixels) por celula da tela e cor (ver densidade.agregar_pontos) e gera um marcador (oval) por grupo,
+centrado na posição media dos seus pontos, em ordem crescente de chave (-1 - grupo)
+Parâmetros:
+    pixels (numpy.ndarray): Posição (N,2) dos pontos, em pixels
+    indices_cor (numpy.ndarray): Indice da cor de cada ponto em tabela_cores
+    tabela_cores (list): Cores da cena
+    area (dict): Área de desenho (xmin, ymin, xmax, ymax), em pixels
+    raio_ponto (float): Raio do marcador de um unico ponto
+    tamanho_celula (float): Lado das celulas, em pixels
+"""
+def comandos_marcadores(pixels, indices_cor, tabela_cores, area, raio_ponto, tamanho_celula=TAMANHO_CELULA):
+    grupos, cores, centros, quantidades = agregar_pontos(pixels, indices_cor, len(tabela_cores), area, tamanho_celula)
+    raios = raios_marcadores(quantidades, raio_ponto, tamanho_celula)[:, None]
+    retangulos = np.hstack((centros - raios, centros + raios))[::-1].tolist()
+
+    # As opções de desenho sao compartilhadas entre os marcadores da mesma cor
+    opcoes = {}
+    comandos = []
+    for grupo, indice_cor, retangulo in zip(grupos[::-1].tolist(), cores[::-1].tolist(), retangulos):
+        opcoes_cor = opcoes.get(indice_cor)
+        if opcoes_cor is None:
+            opcoes_cor = opcoes[indice_cor] = opcoes_desenho(TIPO_PONTO, tabela_cores[indice_cor])
+        comandos.append(ComandoDesenho(COMANDO_OVAL, retangulo, opcoes_cor, -1 - grupo))
+    return comandos
+
+"""
+Verifica se a transformação entre duas normalizações é apenas escala uniforme positiva e translação
+(movimento e zoom), caso em que os vertices nao precisam ser normalizados novamente
+Parâmetros:
+    delta (numpy.ndarray): Matriz 3x3 da transformação
+    tolerancia (float): Tolerancia relativa para os termos de rotação e para a diferença entre as escalas
+"""
+def delta_incremental(delta, tolerancia: float = 1e-12):
+    escala = delta[0, 0]
+    # Escalas extremas acumulam erro de arredondamento: nesses casos é melhor normalizar novamente
+    if not 1e-6 < escala < 1e6:
+        return False
+    return (abs(delta[0, 1]) <= tolerancia * escala and abs(delta[1, 0]) <= tolerancia * escala
+            and abs(delta[1, 1] - escala) <= tolerancia * escala)
+
+"""
+Desenha uma lista de comandos em um canvas (ex.: tkinter.Canvas)
+"""
+def desenhar_comandos(canvas, comandos):
+    for comando in comandos:
+        getattr(canvas, 'create_' + comando.tipo)(*comando.coordenadas, **comando.opcoes)
+
+"""
+Rasteriza os segmentos informados na imagem (todos de uma só vez)
+Cada segmento é amostrado em max(|dx|, |dy|) + 1 pixels; segmentos tracejados mantêm apenas pixels alternados
+Parâmetros:
+    imagem (numpy.ndarray): Imagem RGB (altura, largura, 3)
+    segmentos (numpy.ndarray): Segmentos (K,4) x1, y1, x2, y2 em pixels
+    cores (numpy.ndarray): Cor RGB de cada segmento (K,3)
+    tracejado (numpy.ndarray): Se cada segmento é tracejado (K,)
+"""
+def rasterizar_segmentos(imagem, segmentos, cores, tracejado=None):
+    if len(segmentos) == 0:
+        return
+    altura, largura = imagem.shape[:2]
+    segmentos = np.asarray(segmentos, dtype=float)
+    dx = segmentos[:, 2] - segmentos[:, 0]
+    dy = segmentos[:, 3] - segmentos[:, 1]
+    amostras = (np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(np.int64) + 1).clip(1, 4 * (largura + altura))
+
+    indice = np.repeat(np.arange(len(segmentos)), amostras)
+    passo = np.arange(len(indice)) - np.repeat(np.cumsum(amostras) - amostras, amostras)
+    t = passo / np.maximum(amostras - 1, 1)[indice]
+    x = np.rint(segmentos[indice, 0] + dx[indice] * t).astype(np.int64)
+    y = np.rint(segmentos[indice, 1] + dy[indice] * t).astype(np.int64)
+
+    validos = (x >= 0) & (x < largura) & (y >= 0) & (y < altura)
+    if tracejado is not None:
+        validos &= ~(np.asarray(tracejado)[indice] & (passo % 2 == 1))
+    imagem[y[validos], x[validos]] = np.asarray(cores, dtype=np.uint8)[indice[validos]]
+
+"""
+Rasteriza uma lista de comandos de desenho em uma imagem RGB
+As linhas e os contornos consecutivos sao rasterizados em lote; a ordem de desenho dos comandos é mantida
+Parâmetros:
+    comandos (list): Comandos de desenho (ComandoDesenho)
+    largura, altura (int): Dimensões da imagem em pixels
+    fundo (str): Cor de fundo
+    imagem (numpy.ndarray): Imagem (altura, largura, 3) sobre a qual os comandos sao desenhados (modificada);
+        None desenha sobre o fundo
+Retorna:
+    numpy.ndarray: Imagem (altura, largura, 3) do tipo uint8
+"""
+def rasterizar(comandos, largura, altura, fundo='white', imagem=None):
+    if imagem is None:
+        imagem = np.empty((max(int(altura), 0), max(int(largura), 0), 3), dtype=np.uint8)
+        imagem[:] = cor_rgb(fundo, (255, 255, 255))
+
+    segmentos, cores, tracejado = [], [], []
+
+    def desenhar_segmentos():
+        rasterizar_segmentos(imagem, np.asarray(segmentos, dtype=float).reshape(-1, 4), np.asarray(cores).reshape(-1, 3), np.asarray(tracejado, dtype=bool))
+        segmentos.clear()
+        cores.clear()
+        tracejado.clear()
+
+    for comando in comandos:
+        c = comando.coordenadas
+        match(comando.tipo):
+            case 'line':
+                for i in range(0, len(c) - 2, 2):
+                    segmentos.append(c[i:i + 4])
+                    cores.append(cor_rgb(comando.opcoes.get('fill', 'black')))
+                    tracejado.append('dash' in comando.opcoes)
+
+            case 'polygon' | 'rectangle':
+                if comando.tipo == 'rectangle':
+                    c = [c[0], c[1], c[2], c[1], c[2], c[3], c[0], c[3]]
+                if comando.opcoes.get('fill'):
+                    desenhar_segmentos()
+                    preencher_poligono(imagem, c, cor_rgb(comando.opcoes['fill']))
+                contorno = comando.opcoes.get('outline', 'black' if comando.tipo == 'polygon' else '')
+                if contorno and len(c) >= 4:
+                    fechado = list(c) + list(c[:2])
+                    for i in range(0, len(fechado) - 2, 2):
+                        segmentos.append(fechado[i:i + 4])
+                        cores.append(cor_rgb(contorno))
+                        tracejado.append('dash' in comando.opcoes)
+
+            case 'oval':
+                desenhar_segmentos()
+                if comando.opcoes.get('fill'):
+                    preencher_oval(imagem, c, cor_rgb(comando.opcoes['fill']))
+
+    desenhar_segmentos()
+    return imagem
+
+"""
+Preenche a elipse inscrita no retangulo (x1, y1, x2, y2)
+"""
+def preencher_oval(imagem, retangulo, cor):
+    altura, largura = imagem.shape[:2]
+    x1, y1, x2, y2 = retangulo
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    rx, ry = max(abs(x2 - x1) / 2, 0.5), max(abs(y2 - y1) / 2, 0.5)
+
+    xi0, xi1 = max(int(math.floor(cx - rx)), 0), min(int(math.ceil(cx + rx)), largura)
+    yi0, yi1 = max(int(math.floor(cy - ry)), 0), min(int(math.ceil(cy + ry)), altura)
+    if xi0 >= xi1 or yi0 >= yi1:
+        return
+    ys, xs = np.ogrid[yi0:yi1, xi0:xi1]
+    dentro = ((xs + 0.5 - cx) / rx) ** 2 + ((ys + 0.5 - cy) / ry) ** 2 <= 1
+    imagem[yi0:yi1, xi0:xi1][dentro] = cor
+
+"""
+Preenche um polígono (regra par-impar), testando o centro de cada pixel da sua caixa envolvente
+"""
+def preencher_poligono(imagem, coordenadas, cor):
+    altura, largura = imagem.shape[:2]
+    vertices = np.asarray(coordenadas, dtype=float).reshape(-1, 2)
+    if len(vertices) < 3:
+        return
+
+    xi0, yi0 = np.maximum(np.floor(vertices.min(axis=0)).astype(int), 0)
+    xi1, yi1 = np.ceil(vertices.max(axis=0)).astype(int) + 1
+    xi1, yi1 = min(xi1, largura), min(yi1, altura)
+    if xi0 >= xi1 or yi0 >= yi1:
+        return
+
+    ys, xs = np.mgrid[yi0:yi1, xi0:xi1] + 0.5
+    dentro = np.zeros(xs.shape, dtype=bool)
+    for (xa, ya), (xb, yb) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        if ya == yb:
+            continue
+        cruza = (ya > ys) != (yb > ys)
+        dentro ^= cruza & (xs < xa + (ys - ya) * (xb - xa) / (yb - ya))
+    imagem[yi0:yi1, xi0:xi1][dentro] = cor
+
+"""
+Codifica uma imagem RGB no formato PNG, usando apenas zlib e struct
+Parâmetros:
+    imagem (numpy.ndarray): Imagem (altura, largura, 3) do tipo uint8
+Retorna:
+    bytes: Conteudo do arquivo PNG
+"""
+def codificar_png(imagem):
+    imagem = np.ascontiguousarray(imagem, dtype=np.uint8)
+    altura, largura = imagem.shape[:2]
+
+    # Cada linha é precedida pelo byte do filtro (0 = sem filtro)
+    linhas = np.zeros((altura, largura * 3 + 1), dtype=np.uint8)
+    linhas[:, 1:] = imagem.reshape(altura, largura * 3)
+
+    def bloco(tipo, dados):
+        return struct.pack('>I', len(dados)) + tipo + dados + struct.pack('>I', zlib.crc32(tipo + dados) & 0xffffffff)
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + bloco(b'IHDR', struct.pack('>IIBBBBB', largura, altura, 8, 2, 0, 0, 0))
+            + bloco(b'IDAT', zlib.compress(linhas.tobytes(), 6))
+            + bloco(b'IEND', b''))
+
+"""
+Grava uma imagem RGB em um arquivo PNG
+"""
+def salvar_png(caminho, imagem):
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(codificar_png(imagem))
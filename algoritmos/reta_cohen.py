@@ -1,5 +1,5 @@
-import copy
-from algoritmos.poligonos import Ponto, Reta, Window
+import numpy as np
+from algoritmos.poligonos import Reta, Window, limites_window
 
 """
 Retorna o código da região de um ponto em relação a window
@@ -26,71 +26,192 @@ def RegionCode(ponto, window) -> int:
     return c
 
 """
-Função que realiza o clipping de uma reta utilizando o algoritmo de Cohen-Sutherland
+Retorna o código da região de um ponto, dado por suas coordenadas, em relação aos limites (xmin, ymin, xmax, ymax) da window
+Mesmos códigos da função RegionCode
 """
-def CohenSutherlandClipping(window: Window, r: Reta)-> Reta:
+def RegionCodeCoordenadas(x, y, limites) -> int:
+    xmin, ymin, xmax, ymax = limites
+    c=0 # ponto dentro da window
+
+    if( y > ymax ):      # ponto ACIMA da window
+        c = 8
+    elif( y < ymin ):    # ponto ABAIXO da window
+        c = 4
+
+    if ( x > xmax ):     # ponto à DIREITA da window
+        c += 2
+    elif ( x < xmin ):   # ponto à ESQUERDA da window
+        c += 1
+
+    return c
 
-    reta = copy.deepcopy(r)
-    done=False
-    codA = RegionCode(reta.ponto1, window)
-    codB = RegionCode(reta.ponto2, window)
-    p = Ponto()
+"""
+Versão do algoritmo de Cohen-Sutherland que trabalha apenas com coordenadas, sem copiar nem criar objetos
+Parametros:
+    limites (tuple): (xmin, ymin, xmax, ymax) da window
+    x1, y1, x2, y2 (float): Coordenadas normalizadas dos pontos da reta
+    saida (list): Buffer opcional com 5 posições onde o resultado é escrito
+Retorna:
+    (visivel, x1, y1, x2, y2)
+"""
+def CohenSutherlandClippingCoordenadas(limites, x1, y1, x2, y2, saida=None):
+    xmin, ymin, xmax, ymax = limites
+    visivel = False
+    codA = RegionCodeCoordenadas(x1, y1, limites)
+    codB = RegionCodeCoordenadas(x2, y2, limites)
 
-    while not done:
+    while True:
         if ( (codA | codB) == 0 ): # pelo menos um ponto esta dentro da window
-            done = True
-            reta.visible = True 
-        elif ( (codA & codB) != 0 ):
-            reta.visible = False  # ambos fora da window
-            return copy.deepcopy(reta)
+            visivel = True
+            break
+        elif ( (codA & codB) != 0 ): # ambos fora da window
+            break
+
+        # pegar o codigo de um ponto externo à window (A ou B)
+        if ( codA != 0):
+            codOut = codA
         else:
-            # pegar o codigo de um ponto externo à window (A ou B)
-            if ( codA != 0):
-                codOut = codA
+            codOut = codB
+
+        # caso especial: a reta é vertical ou horizontal...
+        if ( x1 == x2 ):
+            if ( codOut & 0x08 ):
+                py = ymax   # intersecção com o TOPO
             else:
-                codOut = codB
-            
-            # caso especial: a reta é vertical ou horizontal...
-            if ( reta.ponto1.x_norm == reta.ponto2.x_norm ):
-                if ( codOut & 0x08 ): 
-                    p.y_norm = window.XminYmax.y_norm   # intersecção com o TOPO
-                else:
-                    p.y_norm = window.XminYmin.y_norm   # intersecção com a BASE
-                p.x_norm = reta.ponto1.x_norm
-            
-            elif ( reta.ponto1.y_norm == reta.ponto2.y_norm ):
-                if ( codOut & 0x01 ):
-                    p.x_norm = window.XminYmin.x_norm   # intersecção com o lado ESQUERDO
-                else:
-                    p.x_norm = window.XmaxYmin.x_norm   # intersecção com o lado DIREITO
-                p.y_norm = reta.ponto1.y_norm
-
-            # reta com inclinação para dentro da window
+                py = ymin   # intersecção com a BASE
+            px = x1
+
+        elif ( y1 == y2 ):
+            if ( codOut & 0x01 ):
+                px = xmin   # intersecção com o lado ESQUERDO
             else:
-                #Inclinação da reta
-                m = float(reta.ponto2.y_norm - reta.ponto1.y_norm)/(reta.ponto2.x_norm - reta.ponto1.x_norm)
-                #ponto de intersecção:
-                # y_norm = y0 + inclinacao * (x_norm-x0) 
-                # x_norm = x0 + ( 1/inclinacao ) * (y_norm-y0)    
-                if ( codOut & 0x08 ): # intersecção com o TOPO
-                    p.y_norm = window.XminYmax.y_norm
-                    p.x_norm = reta.ponto1.x_norm + (window.XminYmax.y_norm - reta.ponto1.y_norm)/m
-                elif ( codOut & 0x04 ): #intersecção com a BASE
-                    p.y_norm = window.XminYmin.y_norm
-                    p.x_norm = reta.ponto1.x_norm + (window.XminYmin.y_norm - reta.ponto1.y_norm)/m
-                elif ( codOut & 0x02 ): # intersecçao com o lado DIREITO
-                    p.x_norm = window.XmaxYmin.x_norm
-                    p.y_norm = reta.ponto1.y_norm + m*(window.XmaxYmin.x_norm - reta.ponto1.x_norm)
-                elif ( codOut & 0x01 ): # intersecção com o lado ESQUERDO
-                    p.x_norm = window.XminYmin.x_norm
-                    p.y_norm = reta.ponto1.y_norm + m*(window.XminYmin.x_norm - reta.ponto1.x_norm)
-                
-         # atualizar o Ponto da reta AB e seu respectivo "region code"
-            if ( codOut == codA ): # o ponto A é que estava fora da window
-                reta.ponto1 = p
-                codA = RegionCode(reta.ponto1, window)
-            else: # o ponto B é que estava fora da window
-                reta.ponto2 = p
-                codB = RegionCode(reta.ponto2, window)
-            
-    return copy.deepcopy(reta)
+                px = xmax   # intersecção com o lado DIREITO
+            py = y1
+
+        # reta com inclinação para dentro da window
+        else:
+            #Inclinação da reta
+            m = float(y2 - y1)/(x2 - x1)
+            #ponto de intersecção:
+            # y = y0 + inclinacao * (x-x0)
+            # x = x0 + ( 1/inclinacao ) * (y-y0)
+            if ( codOut & 0x08 ): # intersecção com o TOPO
+                py = ymax
+                px = x1 + (ymax - y1)/m
+            elif ( codOut & 0x04 ): #intersecção com a BASE
+                py = ymin
+                px = x1 + (ymin - y1)/m
+            elif ( codOut & 0x02 ): # intersecçao com o lado DIREITO
+                px = xmax
+                py = y1 + m*(xmax - x1)
+            else: # intersecção com o lado ESQUERDO
+                px = xmin
+                py = y1 + m*(xmin - x1)
+
+        # atualizar o Ponto da reta AB e seu respectivo "region code"
+        if ( codOut == codA ): # o ponto A é que estava fora da window
+            x1, y1 = px, py
+            codA = RegionCodeCoordenadas(x1, y1, limites)
+        else: # o ponto B é que estava fora da window
+            x2, y2 = px, py
+            codB = RegionCodeCoordenadas(x2, y2, limites)
+
+    if saida is None:
+        return (visivel, x1, y1, x2, y2)
+    saida[0:5] = (visivel, x1, y1, x2, y2)
+    return saida
+
+"""
+Função que realiza o clipping de uma reta utilizando o algoritmo de Cohen-Sutherland
+Retorna uma nova Reta; a reta de entrada nao é modificada
+"""
+def CohenSutherlandClipping(window: Window, r: Reta)-> Reta:
+    visivel, x1, y1, x2, y2 = CohenSutherlandClippingCoordenadas(
+        limites_window(window),
+        r.ponto1.x_norm, r.ponto1.y_norm,
+        r.ponto2.x_norm, r.ponto2.y_norm
+    )
+
+    reta = Reta(r.ponto1.copia(), r.ponto2.copia(), r.cor)
+    reta.ponto1.x_norm, reta.ponto1.y_norm = x1, y1
+    reta.ponto2.x_norm, reta.ponto2.y_norm = x2, y2
+    reta.visible = visivel
+    return reta
+
+"""
+Retorna os códigos de região de um conjunto de pontos em relação a window
+Mesmos códigos da função RegionCode (ACIMA = 8, ABAIXO = 4, DIREITA = 2, ESQUERDA = 1)
+Parametros: x (numpy.ndarray), y (numpy.ndarray), limites (xmin, ymin, xmax, ymax) da window
+"""
+def RegionCodeLote(x, y, limites):
+    xmin, ymin, xmax, ymax = limites
+    c = np.where(y > ymax, 8, np.where(y < ymin, 4, 0))
+    c += np.where(x > xmax, 2, np.where(x < xmin, 1, 0))
+    return c
+
+"""
+Função que realiza o clipping de um lote de retas utilizando o algoritmo de Cohen-Sutherland
+Todas as retas sao processadas ao mesmo tempo com operações vetorizadas, com o mesmo resultado de CohenSutherlandClipping
+Parametros:
+    window (Window): Window de recorte
+    pontos1 (numpy.ndarray): Primeiro ponto normalizado de cada reta (M,2)
+    pontos2 (numpy.ndarray): Segundo ponto normalizado de cada reta (M,2)
+Retorna:
+    tuple: (pontos1 recortados (M,2), pontos2 recortados (M,2), visibilidade de cada reta (M,))
+"""
+def CohenSutherlandClippingLote(window: Window, pontos1, pontos2):
+    limites = limites_window(window)
+    xmin, ymin, xmax, ymax = limites
+
+    x1 = np.array(pontos1, dtype=float)[:, 0].copy()
+    y1 = np.array(pontos1, dtype=float)[:, 1].copy()
+    x2 = np.array(pontos2, dtype=float)[:, 0].copy()
+    y2 = np.array(pontos2, dtype=float)[:, 1].copy()
+
+    codA = RegionCodeLote(x1, y1, limites)
+    codB = RegionCodeLote(x2, y2, limites)
+    visiveis = np.zeros(len(x1), dtype=bool)
+    ativas = np.ones(len(x1), dtype=bool)
+
+    while True:
+        aceitas = ativas & ((codA | codB) == 0)     # ambos os pontos dentro da window
+        visiveis |= aceitas
+        ativas &= ~aceitas
+        ativas &= (codA & codB) == 0                # ambos fora da window
+        if not ativas.any():
+            break
+
+        i = np.flatnonzero(ativas)
+        ax, ay, bx, by = x1[i], y1[i], x2[i], y2[i]
+        ladoA = codA[i] != 0
+        codOut = np.where(ladoA, codA[i], codB[i])
+
+        vertical = ax == bx
+        horizontal = ~vertical & (ay == by)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m = (by - ay) / (bx - ax)
+            topo = codOut & 8 != 0
+            base = ~topo & (codOut & 4 != 0)
+            direita = ~topo & ~base & (codOut & 2 != 0)
+
+            # reta inclinada: intersecção com TOPO, BASE, lado DIREITO ou lado ESQUERDO (nesta ordem de prioridade)
+            py_borda = np.where(topo, ymax, ymin)
+            px_borda = np.where(direita, xmax, xmin)
+            px = np.where(topo | base, ax + (py_borda - ay) / m, px_borda)
+            py = np.where(topo | base, py_borda, ay + m * (px_borda - ax))
+
+        # casos especiais: reta vertical ou horizontal
+        px = np.where(vertical, ax, px)
+        py = np.where(vertical, np.where(topo, ymax, ymin), py)
+        px = np.where(horizontal, np.where(codOut & 1 != 0, xmin, xmax), px)
+        py = np.where(horizontal, ay, py)
+
+        # atualizar o ponto externo de cada reta e seu respectivo "region code"
+        iA, iB = i[ladoA], i[~ladoA]
+        x1[iA], y1[iA] = px[ladoA], py[ladoA]
+        x2[iB], y2[iB] = px[~ladoA], py[~ladoA]
+        codA[iA] = RegionCodeLote(x1[iA], y1[iA], limites)
+        codB[iB] = RegionCodeLote(x2[iB], y2[iB], limites)
+
+    return np.column_stack((x1, y1)), np.column_stack((x2, y2)), visiveis
@@ -1,70 +1,146 @@
-import copy
-import math
-from algoritmos.poligonos import Ponto, Reta, Window, Orientacao
+import numpy as np
+from algoritmos.poligonos import Reta, Window, Orientacao, limites_window
 
 """
-Função que realiza o clipping de uma reta utilizando o algoritmo de Liang-Barsky
-Parametros: window (Window), linha (Reta)
+Versão do algoritmo de Liang-Barsky que trabalha apenas com coordenadas, sem copiar nem criar objetos
+Parametros:
+    limites (tuple): (xmin, ymin, xmax, ymax) da window
+    x1, y1, x2, y2 (float): Coordenadas normalizadas dos pontos da reta
+    saida (list): Buffer opcional com 8 posições onde o resultado é escrito
+Retorna:
+    (visivel, x1, y1, x2, y2, u1, u2, coincidentes)
+    u1 > 0 indica que o primeiro ponto é uma intersecção de entrada e u2 < 1 que o segundo é uma intersecção de saida
+    coincidentes indica que os pontos de intersecção eram iguais (o segundo é deslocado de epsilon)
 """
-def LiangBarskyClipping(window: Window, linha: Reta):
-    reta = copy.deepcopy(linha)
+def LiangBarskyClippingCoordenadas(limites, x1, y1, x2, y2, saida=None):
+    xmin, ymin, xmax, ymax = limites
     u1 = 0.0
     u2 = 1.0
+    visivel = True
+    coincidentes = False
+
+    deltaX = x2 - x1
+    deltaY = y2 - y1
 
-    deltaX = reta.ponto2.x_norm - reta.ponto1.x_norm
-    deltaY = reta.ponto2.y_norm - reta.ponto1.y_norm
-
-    p = [-deltaX, deltaX, -deltaY, deltaY]
-    q = [
-        reta.ponto1.x_norm - window.XminYmin.x_norm,
-        window.XmaxYmin.x_norm - reta.ponto1.x_norm,
-        reta.ponto1.y_norm - window.XminYmin.y_norm,
-        window.XmaxYmax.y_norm - reta.ponto1.y_norm
-    ]
-
-    for i in range(4):
-        if math.isclose(p[i], 0):
-            if q[i] < 0:  # Linha fora da janela e paralela
-                reta.visible = False
-                return reta
+    for p, q in ((-deltaX, x1 - xmin), (deltaX, xmax - x1), (-deltaY, y1 - ymin), (deltaY, ymax - y1)):
+        if p == 0:
+            if q < 0:  # Linha fora da janela e paralela
+                visivel = False
+                break
         else:
-            r = q[i] / p[i]
-            if p[i] < 0:  # Linha entrando
+            r = q / p
+            if p < 0:  # Linha entrando
                 u1 = max(u1, r)
             else:  # Linha saindo
                 u2 = min(u2, r)
 
-    if u1 > u2:  # Linha completamente fora
-        reta.visible = False
+    if visivel and u1 > u2:  # Linha completamente fora
+        visivel = False
+
+    if visivel:
+        # Cálculo dos pontos de intersecção
+        Q1x, Q1y, Q2x, Q2y = x1, y1, x2, y2
+        # Se a linha está entrando na janela
+        if u1 > 0:
+            Q1x = x1 + deltaX * u1
+            Q1y = y1 + deltaY * u1
+        # Se a linha está saindo da janela
+        if u2 < 1:
+            Q2x = x1 + deltaX * u2
+            Q2y = y1 + deltaY * u2
+
+        # Evita erros devido a pontos coincidentes da window e do poligono
+        epsilon = 0.00000000000001
+        if round(Q1x, 8) == round(Q2x, 8) and round(Q1y, 8) == round(Q2y, 8): # Se os pontos de interseção são iguais
+            Q2x = Q2x - epsilon
+            Q2y = Q2y - epsilon
+            coincidentes = True
+        x1, y1, x2, y2 = Q1x, Q1y, Q2x, Q2y
+
+    if saida is None:
+        return (visivel, x1, y1, x2, y2, u1, u2, coincidentes)
+    saida[0:8] = (visivel, x1, y1, x2, y2, u1, u2, coincidentes)
+    return saida
+
+"""
+Função que realiza o clipping de uma reta utilizando o algoritmo de Liang-Barsky
+Parametros: window (Window), linha (Reta)
+Retorna uma nova Reta; a reta de entrada nao é modificada
+"""
+def LiangBarskyClipping(window: Window, linha: Reta):
+    visivel, x1, y1, x2, y2, u1, u2, coincidentes = LiangBarskyClippingCoordenadas(
+        limites_window(window),
+        linha.ponto1.x_norm, linha.ponto1.y_norm,
+        linha.ponto2.x_norm, linha.ponto2.y_norm
+    )
+
+    Q1 = linha.ponto1.copia()
+    Q2 = linha.ponto2.copia()
+    reta = Reta(Q1, Q2, linha.cor)
+    reta.visible = visivel
+    if not visivel:
         return reta
 
-    # Cálculo dos pontos de intersecção
-    Q1 = copy.deepcopy(reta.ponto1)
-    Q2 = copy.deepcopy(reta.ponto2)
+    Q1.x_norm, Q1.y_norm = x1, y1
+    Q2.x_norm, Q2.y_norm = x2, y2
 
     # Se a linha está entrando na janela
     if u1 > 0:
-        Q1.x_norm = reta.ponto1.x_norm + deltaX * u1
-        Q1.y_norm = reta.ponto1.y_norm + deltaY * u1
         Q1.intersecao = True
         Q1.orientacao = Orientacao.ENTRANDO
 
     # Se a linha está saindo da janela
     if u2 < 1:
-        Q2.x_norm = reta.ponto1.x_norm + deltaX * u2
-        Q2.y_norm = reta.ponto1.y_norm + deltaY * u2
         Q2.intersecao = True
         Q2.orientacao = Orientacao.SAINDO
 
-    reta.ponto1 = Q1
-    reta.ponto2 = Q2
-    reta.visible = True
-    
+    if coincidentes:
+        Q1.orientacao = Orientacao.NAO_UTILIZADA
+
+    return reta
+
+"""
+Função que realiza o clipping de um lote de retas utilizando o algoritmo de Liang-Barsky
+Os parametros u1 e u2 de todas as retas sao calculados ao mesmo tempo com operações vetorizadas,
+com o mesmo resultado de LiangBarskyClipping
+Parametros:
+    window (Window): Window de recorte
+    pontos1 (numpy.ndarray): Primeiro ponto normalizado de cada reta (M,2)
+    pontos2 (numpy.ndarray): Segundo ponto normalizado de cada reta (M,2)
+Retorna:
+    tuple: (pontos1 recortados (M,2), pontos2 recortados (M,2), visibilidade de cada reta (M,))
+"""
+def LiangBarskyClippingLote(window: Window, pontos1, pontos2):
+    xmin, ymin, xmax, ymax = limites_window(window)
+    pontos1 = np.asarray(pontos1, dtype=float).reshape(-1, 2)
+    pontos2 = np.asarray(pontos2, dtype=float).reshape(-1, 2)
+
+    delta = pontos2 - pontos1
+    p = np.stack((-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]))
+    q = np.stack((
+        pontos1[:, 0] - xmin,
+        xmax - pontos1[:, 0],
+        pontos1[:, 1] - ymin,
+        ymax - pontos1[:, 1]
+    ))
+
+    paralela = p == 0
+    fora = (paralela & (q < 0)).any(axis=0)     # Linha fora da janela e paralela
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = q / p
+    u1 = np.maximum(np.where(~paralela & (p < 0), r, 0.0).max(axis=0), 0.0)   # Linha entrando
+    u2 = np.minimum(np.where(~paralela & (p > 0), r, 1.0).min(axis=0), 1.0)   # Linha saindo
+
+    visiveis = ~fora & (u1 <= u2)
+
+    # Cálculo dos pontos de intersecção
+    Q1 = np.where((u1 > 0)[:, None], pontos1 + delta * u1[:, None], pontos1)
+    Q2 = np.where((u2 < 1)[:, None], pontos1 + delta * u2[:, None], pontos2)
+
     # Evita erros devido a pontos coincidentes da window e do poligono
     epsilon = 0.00000000000001
-    if Q1.compare_norm_coordinates(Q2): # Se os pontos de interseção são iguais
-        reta.ponto2.x_norm = reta.ponto2.x_norm - epsilon
-        reta.ponto2.y_norm = reta.ponto2.y_norm - epsilon
-        reta.ponto1.orientacao = Orientacao.NAO_UTILIZADA
-         
-    return copy.deepcopy(reta)
+    iguais = (np.round(Q1, 8) == np.round(Q2, 8)).all(axis=1)
+    Q2[iguais] -= epsilon
+
+    return Q1, Q2, visiveis
@@ -0,0 +1,334 @@
+import math
+from collections import OrderedDict
+import numpy as np
+from algoritmos.geometria import GeometriaCena, TIPO_POLIGONO, indices_vertices
+
+# Desvio maximo (em pixels) entre um polígono e a sua versão simplificada
+TOLERANCIA_PIXELS = 0.5
+
+# Polígonos com menos vertices que isso nao sao simplificados: o ganho nao compensa
+MINIMO_VERTICES = 16
+
+# Numero de niveis de detalhe gerados mantidos, e de niveis montados como GeometriaCena (ver NiveisDetalhe)
+MAXIMO_NIVEIS = 8
+MAXIMO_MONTADOS = 2
+
+"""
+Simplificação de Douglas-Peucker de varias cadeias abertas de vertices ao mesmo tempo
+Em cada cadeia os vertices extremos sao sempre mantidos; entre eles é mantido o vertice mais distante do
+segmento que os une, sempre que essa distancia for maior que a tolerancia, e o processo se repete nas duas metades.
+Todas as cadeias (e todas as metades de um mesmo nivel da recursão) sao processadas juntas, com operações vetorizadas
+Parâmetros:
+    coordenadas (numpy.ndarray): Vertices (N,2)
+    inicios, fins (numpy.ndarray): Indices do primeiro e do ultimo vertice de cada cadeia em coordenadas
+    tolerancia (float): Distancia maxima entre as cadeias originais e as simplificadas
+Retorna:
+    numpy.ndarray: Mascara (N,) dos vertices mantidos (os vertices fora das cadeias ficam False)
+"""
+def douglas_peucker_lote(coordenadas, inicios, fins, tolerancia):
+    coordenadas = np.asarray(coordenadas, dtype=float)
+    inicios = np.asarray(inicios, dtype=np.int64)
+    fins = np.asarray(fins, dtype=np.int64)
+    manter = np.zeros(len(coordenadas), dtype=bool)
+    manter[inicios] = True
+    manter[fins] = True
+
+    while len(inicios):
+        # Apenas os trechos com vertices intermediarios continuam
+        com_intermediarios = fins - inicios >= 2
+        inicios, fins = inicios[com_intermediarios], fins[com_intermediarios]
+        if len(inicios) == 0:
+            break
+
+        quantidades = fins - inicios - 1
+        trechos = np.repeat(np.arange(len(inicios)), quantidades)
+        intermediarios = np.arange(int(quantidades.sum())) - np.repeat(np.cumsum(quantidades) - quantidades - inicios - 1, quantidades)
+
+        a, b = coordenadas[inicios][trechos], coordenadas[fins][trechos]
+        p = coordenadas[intermediarios]
+        direcao = b - a
+        comprimento = np.hypot(direcao[:, 0], direcao[:, 1])
+        distancias = np.abs(direcao[:, 0] * (p[:, 1] - a[:, 1]) - direcao[:, 1] * (p[:, 0] - a[:, 0]))
+        # Trechos com extremos coincidentes: distancia ao proprio extremo
+        degenerados = comprimento == 0
+        distancias[degenerados] = np.hypot(p[degenerados, 0] - a[degenerados, 0], p[degenerados, 1] - a[degenerados, 1])
+        distancias[~degenerados] /= comprimento[~degenerados]
+
+        posicoes, maximos = primeiro_maximo(distancias, quantidades)
+        divide = maximos > tolerancia
+        meios = intermediarios[posicoes[divide]]
+        manter[meios] = True
+        inicios, fins = np.concatenate((inicios[divide], meios)), np.concatenate((meios, fins[divide]))
+    return manter
+
+"""
+Simplificação de Douglas-Peucker de uma cadeia aberta de vertices (ver douglas_peucker_lote)
+Retorna:
+    numpy.ndarray: Mascara (K,) dos vertices mantidos
+"""
+def douglas_peucker(coordenadas, tolerancia):
+    if len(coordenadas) == 0:
+        return np.zeros(0, dtype=bool)
+    return douglas_peucker_lote(coordenadas, [0], [len(coordenadas) - 1], tolerancia)
+
+"""
+Retorna a posição e o valor do primeiro maximo de cada grupo de valores consecutivos
+Parâmetros:
+    valores (numpy.ndarray): Valores de todos os grupos, concatenados
+    quantidades (numpy.ndarray): Quantidade de valores de cada grupo (todas maiores que zero)
+"""
+def primeiro_maximo(valores, quantidades):
+    inicios = np.cumsum(quantidades) - quantidades
+    maximos = np.maximum.reduceat(valores, inicios)
+    grupos = np.repeat(np.arange(len(quantidades)), quantidades)
+    posicoes = np.flatnonzero(valores == maximos[grupos])
+    _, primeiras = np.unique(grupos[posicoes], return_index=True)
+    return posicoes[primeiras], maximos
+
+"""
+Simplifica polígonos (cadeias fechadas) com Douglas-Peucker
+O contorno de cada polígono é dividido no primeiro vertice e no vertice mais distante dele, e as duas metades
+sao simplificadas juntas com as dos demais polígonos; pelo menos 3 vertices de cada polígono sao mantidos
+Parâmetros:
+    coordenadas (numpy.ndarray): Vertices de todas as formas (N,2)
+    deslocamentos (numpy.ndarray): Deslocamentos dos vertices de cada forma (S+1,)
+    indices (numpy.ndarray): Indices dos polígonos a simplificar (com pelo menos 3 vertices)
+    tolerancia (float): Distancia maxima entre os polígonos originais e os simplificados
+Retorna:
+    numpy.ndarray: Mascara (N,) dos vertices mantidos; os vertices das demais formas sao mantidos
+"""
+def simplificar_poligonos(coordenadas, deslocamentos, indices, tolerancia):
+    manter = np.ones(len(coordenadas), dtype=bool)
+    indices = np.asarray(indices, dtype=np.int64)
+    if len(indices) == 0:
+        return manter
+
+    # Cada polígono é copiado com o primeiro vertice repetido no final, fechando o contorno
+    vertices, quantidades = indices_vertices(deslocamentos, indices)
+    primeiros = np.cumsum(quantidades + 1) - quantidades - 1
+    ordem = np.insert(vertices, np.cumsum(quantidades), deslocamentos[indices])
+    contornos = coordenadas[ordem]
+
+    # Vertice mais distante do primeiro, em cada polígono
+    repetidos = np.repeat(primeiros, quantidades + 1)
+    distancias = np.hypot(contornos[:, 0] - contornos[repetidos, 0], contornos[:, 1] - contornos[repetidos, 1])
+    opostos, _ = primeiro_maximo(distancias, quantidades + 1)
+    # Polígonos com todos os vertices coincidentes sao divididos ao meio
+    coincidentes = opostos == primeiros
+    opostos[coincidentes] += quantidades[coincidentes] // 2
+
+    ultimos = primeiros + quantidades
+    mantidos = douglas_peucker_lote(contornos, np.concatenate((primeiros, opostos)), np.concatenate((opostos, ultimos)), tolerancia)
+
+    # Polígonos menores que a tolerancia ainda sao desenhados como triangulos: é mantido tambem o vertice
+    # mais distante da reta entre o primeiro vertice e o oposto
+    poucos = np.flatnonzero(np.add.reduceat(mantidos.astype(np.int64), primeiros) - 1 < 3)
+    if len(poucos):
+        posicoes, _ = indices_vertices(np.append(primeiros, len(contornos)), poucos)
+        grupos = np.repeat(np.arange(len(poucos)), quantidades[poucos] + 1)
+        a, b = contornos[primeiros[poucos]][grupos], contornos[opostos[poucos]][grupos]
+        p = contornos[posicoes]
+        areas = np.abs((b[:, 0] - a[:, 0]) * (p[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (p[:, 0] - a[:, 0]))
+        areas[np.isin(posicoes, np.concatenate((primeiros[poucos], opostos[poucos], ultimos[poucos])))] = -1
+        terceiros, _ = primeiro_maximo(areas, quantidades[poucos] + 1)
+        mantidos[posicoes[terceiros]] = True
+
+    # A copia do primeiro vertice no final de cada contorno é descartada
+    fechamento = np.zeros(len(contornos), dtype=bool)
+    fechamento[ultimos] = True
+    manter[vertices] = mantidos[~fechamento]
+    return manter
+
+"""
+Classe NiveisDetalhe -> Versões simplificadas (niveis de detalhe) dos polígonos de uma cena
+Os polígonos com pelo menos minimo_vertices vertices sao simplificados por Douglas-Peucker; as tolerancias dos niveis
+sao potencias de 2 (em unidades de mundo). O nivel utilizado em um quadro é o mais simplificado cuja tolerancia nao
+passa de tolerancia_pixels pixels na escala atual, de modo que o custo do recorte e do desenho acompanha a resolução
+da tela e nao o detalhe do arquivo.
+Cada nivel guarda apenas os indices (na geometria original) dos vertices mantidos nos polígonos simplificados; os
+demais vertices sao os da geometria original. A GeometriaCena de um nivel (as mesmas formas, na mesma ordem) é montada
+a partir deles quando o nivel é usado, e apenas as maximo_montados usadas mais recentemente sao mantidas (ex.: a da
+janela principal e a do minimapa). Os niveis mais finos que o primeiro a remover algum vertice usam a propria
+geometria original, e os mais grossos que a maior caixa envolvente dos polígonos (em que todos ficam com o minimo de
+vertices) usam o nivel dessa caixa; dos demais, apenas os maximo_niveis usados mais recentemente sao mantidos.
+As formas adicionadas, movidas ou removidas na cena sao repetidas nos niveis já gerados (adicionar_forma,
+mover_forma e remover_forma)
+Atributos:
+    geometria (GeometriaCena): Geometria original (detalhe completo)
+    niveis (OrderedDict): {expoente: indices dos vertices mantidos nos polígonos simplificados} niveis já gerados,
+        com tolerancia 2**expoente, do usado menos recentemente ao mais recente
+    montados (OrderedDict): {expoente: GeometriaCena} niveis montados, do usado menos recentemente ao mais recente
+"""
+class NiveisDetalhe:
+    def __init__(self, geometria, tolerancia_pixels: float = TOLERANCIA_PIXELS, minimo_vertices: int = MINIMO_VERTICES,
+                 maximo_niveis: int = MAXIMO_NIVEIS, maximo_montados: int = MAXIMO_MONTADOS):
+        self.geometria = geometria
+        self.tolerancia_pixels = tolerancia_pixels
+        self.minimo_vertices = minimo_vertices
+        self.maximo_niveis = max(maximo_niveis, 1)
+        self.maximo_montados = max(maximo_montados, 1)
+        self.niveis = OrderedDict()
+        self.montados = OrderedDict()
+        self._matrizes = {}
+        # Maior expoente já verificado em que nenhum vertice é removido (os mais finos tambem nao removem nenhum)
+        self._expoente_sem_ganho = None
+
+        quantidades = np.diff(geometria.deslocamentos)
+        self.simplificaveis = np.flatnonzero((geometria.tipos == TIPO_POLIGONO) & (quantidades >= minimo_vertices))
+        self._vertices_simplificaveis, _ = indices_vertices(geometria.deslocamentos, self.simplificaveis)
+        self._maior_diagonal = 0.0
+        if len(self.simplificaveis):
+            caixas = geometria.caixas_mundo[self.simplificaveis]
+            diagonais = np.hypot(caixas[:, 2] - caixas[:, 0], caixas[:, 3] - caixas[:, 1])
+            # As caixas das formas removidas sao NaN
+            diagonais = diagonais[np.isfinite(diagonais)]
+            if len(diagonais):
+                self._maior_diagonal = float(diagonais.max())
+
+    """
+    Retorna o expoente do nivel adequado ao tamanho de um pixel (em unidades de mundo),
+    ou None quando o detalhe completo deve ser usado
+    """
+    def expoente(self, tamanho_pixel):
+        tolerancia = tamanho_pixel * self.tolerancia_pixels
+        if len(self.simplificaveis) == 0 or not math.isfinite(tolerancia) or tolerancia <= 0:
+            return None
+        expoente = math.floor(math.log2(tolerancia))
+        # Com a tolerancia maior que a diagonal da caixa de um polígono, nenhum vertice dele fica além da tolerancia
+        # de nenhum segmento: a partir da maior diagonal, todos os niveis sao iguais
+        if self._maior_diagonal > 0:
+            expoente = min(expoente, math.ceil(math.log2(self._maior_diagonal)))
+        if self._expoente_sem_ganho is not None and expoente <= self._expoente_sem_ganho:
+            return None
+        return expoente
+
+    """
+    Retorna a geometria do nivel de detalhe adequado ao tamanho de um pixel (em unidades de mundo)
+    Parâmetros:
+        tamanho_pixel (float): Tamanho de um pixel em unidades de mundo
+        matriz_normalizada (numpy.ndarray): Se informada, o nivel é normalizado com ela (apenas quando ela muda)
+    """
+    def geometria_para(self, tamanho_pixel, matriz_normalizada=None):
+        expoente = self.expoente(tamanho_pixel)
+        if expoente is None:
+            return self.geometria
+
+        nivel = self.montados.get(expoente)
+        if nivel is None:
+            mantidos = self._mantidos(expoente)
+            if mantidos is None:
+                return self.geometria
+            nivel = self.montados[expoente] = self.montar_nivel(mantidos)
+            if len(self.montados) > self.maximo_montados:
+                descartado, _ = self.montados.popitem(last=False)
+                self._matrizes.pop(descartado, None)
+        else:
+            self.montados.move_to_end(expoente)
+            self.niveis.move_to_end(expoente)
+
+        if matriz_normalizada is not None and self._matrizes.get(expoente) is not matriz_normalizada:
+            nivel.normalizar(matriz_normalizada)
+            self._matrizes[expoente] = matriz_normalizada
+        return nivel
+
+    # Vertices mantidos no nivel (gerado na primeira vez em que é usado), ou None quando o nivel nao remove nenhum vertice
+    def _mantidos(self, expoente):
+        mantidos = self.niveis.get(expoente)
+        if mantidos is not None:
+            self.niveis.move_to_end(expoente)
+            return mantidos
+
+        mantidos = self.gerar_nivel(2.0 ** expoente)
+        if len(mantidos) == len(self._vertices_simplificaveis):
+            if self._expoente_sem_ganho is None or expoente > self._expoente_sem_ganho:
+                self._expoente_sem_ganho = expoente
+            return None
+        self.niveis[expoente] = mantidos
+        if len(self.niveis) > self.maximo_niveis:
+            descartado, _ = self.niveis.popitem(last=False)
+            if self.montados.pop(descartado, None) is not None:
+                self._matrizes.pop(descartado, None)
+        return mantidos
+
+    """
+    Simplifica os polígonos grandes com a tolerancia informada (unidades de mundo)
+    Retorna:
+        numpy.ndarray: Indices (na geometria original, em ordem crescente) dos vertices mantidos nos polígonos simplificados
+    """
+    def gerar_nivel(self, tolerancia):
+        geometria = self.geometria
+        manter = simplificar_poligonos(geometria.coordenadas, geometria.deslocamentos, self.simplificaveis, tolerancia)
+        return self._vertices_simplificaveis[manter[self._vertices_simplificaveis]]
+
+    """
+    Monta a GeometriaCena de um nivel: as formas da geometria original, com os polígonos simplificados
+    reduzidos aos vertices mantidos (ver gerar_nivel)
+    """
+    def montar_nivel(self, mantidos):
+        geometria = self.geometria
+        coordenadas = geometria.coordenadas
+        deslocamentos = geometria.deslocamentos
+
+        manter = np.ones(len(coordenadas), dtype=bool)
+        manter[self._vertices_simplificaveis] = False
+        manter[mantidos] = True
+
+        # Vertices mantidos por forma: soma acumulada da mascara nos limites de cada forma
+        acumulado = np.concatenate(([0], np.cumsum(manter)))
+        novos_deslocamentos = acumulado[deslocamentos]
+
+        nivel = GeometriaCena.de_arrays(
+            coordenadas[manter], novos_deslocamentos, geometria.tipos, geometria.indices_cor, geometria.tabela_cores
+        )
+        nivel.removidas[:] = geometria.removidas
+        nivel.n_removidas = geometria.n_removidas
+        return nivel
+
+    """
+    Acrescenta aos niveis já gerados a forma adicionada a geometria original (a ultima forma)
+    Os polígonos grandes sao simplificados com a tolerancia de cada nivel
+    """
+    def adicionar_forma(self, indice):
+        geometria = self.geometria
+        inicio, fim = geometria.intervalo(indice)
+        coordenadas = geometria.coordenadas[inicio:fim]
+        tipo = int(geometria.tipos[indice])
+        simplificavel = tipo == TIPO_POLIGONO and fim - inicio >= self.minimo_vertices
+        novos = {}
+        if simplificavel:
+            self.simplificaveis = np.append(self.simplificaveis, indice)
+            self._vertices_simplificaveis = np.append(self._vertices_simplificaveis, np.arange(inicio, fim))
+            self._maior_diagonal = max(self._maior_diagonal, float(np.hypot(*np.ptp(coordenadas, axis=0))))
+            # O novo polígono pode ter vertices removidos mesmo nos niveis em que os demais nao tinham
+            self._expoente_sem_ganho = None
+            for expoente, mantidos in self.niveis.items():
+                manter = simplificar_poligonos(coordenadas, np.array([0, len(coordenadas)]), [0], 2.0 ** expoente)
+                novos[expoente] = inicio + np.flatnonzero(manter)
+                self.niveis[expoente] = np.append(mantidos, novos[expoente])
+
+        for expoente, nivel in self.montados.items():
+            vertices = geometria.coordenadas[novos[expoente]] if simplificavel else coordenadas
+            nivel._adicionar_forma(tipo, vertices, geometria.cor(indice))
+            self._normalizar_forma(expoente, indice)
+
+    """
+    Translada a forma nos niveis montados (ver GeometriaCena.mover_forma)
+    Os niveis já gerados guardam apenas indices de vertices, que continuam validos
+    """
+    def mover_forma(self, indice, dx, dy):
+        for expoente, nivel in self.montados.items():
+            nivel.mover_forma(indice, dx, dy)
+            self._normalizar_forma(expoente, indice)
+
+    """
+    Remove a forma dos niveis montados (ver GeometriaCena.remover_forma)
+    """
+    def remover_forma(self, indice):
+        for nivel in self.montados.values():
+            nivel.remover_forma(indice)
+
+    # Normaliza a forma editada no nivel com a mesma matriz das demais formas dele
+    def _normalizar_forma(self, expoente, indice):
+        matriz = self._matrizes.get(expoente)
+        if matriz is not None:
+            self.montados[expoente].normalizar_formas([indice], matriz)
@@ -0,0 +1,220 @@
+import json
+import time
+import numpy as np
+
+# Ações de visualização que compõem um trajeto de câmera (métodos do Renderizador e do Visualizador)
+ACOES = ("movimentar", "rotacionar", "aplicar_zoom")
+
+DIRECOES = ("Up", "Down", "Left", "Right")
+
+# Versão do formato do arquivo de trajeto
+VERSAO_TRAJETO = 1
+
+PERCENTIS = (50, 95, 99)
+
+"""
+Classe TrajetoCamera -> Sequência gravada de ações de visualização (movimentar, rotacionar e aplicar_zoom)
+O trajeto é gravado em JSON e pode ser reproduzido sobre qualquer cena, sem interface (reproduzir) ou na
+interface (ReproducaoInterface), como uma medida de ponta a ponta de sessões interativas
+Atributos:
+    passos (list): Tuplas (acao, argumento, instante), com o instante em segundos a partir da primeira ação
+"""
+class TrajetoCamera:
+    def __init__(self, passos=None):
+        self.passos = []
+        self._inicio = None
+        for acao, argumento, instante in passos or []:
+            self.passos.append((acao, validar_acao(acao, argumento), float(instante)))
+
+    def __len__(self):
+        return len(self.passos)
+
+    """
+    Acrescenta uma ação ao trajeto, no instante atual
+    Parâmetros:
+        acao (str): Uma de ACOES
+        argumento: Direção (movimentar), angulo em graus (rotacionar) ou variação da escala (aplicar_zoom)
+    """
+    def registrar(self, acao, argumento):
+        argumento = validar_acao(acao, argumento)
+        agora = time.perf_counter()
+        if self._inicio is None:
+            self._inicio = agora
+        self.passos.append((acao, argumento, agora - self._inicio))
+
+    def salvar(self, caminho):
+        documento = {
+            "versao": VERSAO_TRAJETO,
+            "passos": [{"acao": acao, "argumento": argumento, "instante_s": instante} for acao, argumento, instante in self.passos],
+        }
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(documento, arquivo, indent=1)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            documento = json.load(arquivo)
+        if documento.get("versao") != VERSAO_TRAJETO:
+            raise ValueError(f"Versão de trajeto nao suportada: {documento.get('versao')}")
+        return cls((passo["acao"], passo["argumento"], passo.get("instante_s", 0.0)) for passo in documento["passos"])
+
+# Verifica uma ação do trajeto e retorna o seu argumento no tipo esperado
+def validar_acao(acao, argumento):
+    if acao not in ACOES:
+        raise ValueError(f"Ação de trajeto desconhecida: {acao}")
+    if acao == "movimentar":
+        if argumento not in DIRECOES:
+            raise ValueError(f"Direção de movimento desconhecida: {argumento}")
+        return argumento
+    return float(argumento)
+
+"""
+Reproduz um trajeto sobre o renderizador, sem interface: cada ação gera um quadro da janela principal
+(os comandos de desenho, ou a imagem rasterizada) medido pela instrumentação
+O quadro do estado inicial é gerado antes, fora das medidas (como na abertura do arquivo na interface)
+Parâmetros:
+    renderizador (Renderizador): Renderizador com a cena já carregada
+    trajeto (TrajetoCamera): Trajeto reproduzido
+    imagem (bool): Rasteriza cada quadro (renderizar_imagem) em vez de gerar apenas os comandos de desenho
+Retorna:
+    list: Registro de cada quadro (ver registro_quadro)
+"""
+def reproduzir(renderizador, trajeto, imagem=False):
+    instrumentacao = renderizador.instrumentacao
+    ativa = instrumentacao.ativa
+    instrumentacao.ativar()
+    registros = []
+    try:
+        gerar = renderizador.renderizar_imagem if imagem else renderizador.comandos_cena
+        gerar()
+        for acao, argumento, _ in trajeto.passos:
+            with instrumentacao.quadro(acao) as quadro:
+                getattr(renderizador, acao)(argumento)
+                gerar()
+            registros.append(registro_quadro(acao, argumento, quadro.duracao, quadro.etapas, quadro.contadores))
+    finally:
+        if not ativa:
+            instrumentacao.desativar()
+    return registros
+
+# Registro de um quadro reproduzido: ação, latencia, duração de cada etapa e contadores
+def registro_quadro(acao, argumento, latencia, etapas, contadores=None):
+    return {
+        "acao": acao,
+        "argumento": argumento,
+        "latencia_s": latencia,
+        "etapas_s": dict(etapas),
+        "contadores": dict(contadores or {}),
+    }
+
+"""
+Classe ReproducaoInterface -> Reproduz um trajeto na interface, com o redesenho em segundo plano
+Cada ação é enviada apenas depois que o quadro da anterior foi desenhado, de modo que as ações nunca sao
+agrupadas. A latencia de um quadro vai do envio da ação ao fim do desenho no canvas; as etapas sao as do
+quadro gerado em segundo plano, mais 'interface' (espera pelo quadro pronto e desenho no canvas)
+Atributos:
+    trajeto (TrajetoCamera): Trajeto reproduzido
+    enviar (callable): Função enviar(acao, argumento) que solicita a ação (ex.: Visualizador.movimentar)
+    agendar (callable): Função agendar(ms, funcao) que executa funcao na thread da interface (ex.: root.after)
+    instrumentacao (Instrumentacao): Instrumentação do renderizador (ativada durante a reprodução)
+    ao_concluir (callable): Função chamada com os registros dos quadros ao fim da reprodução
+    registros (list): Registro de cada quadro já desenhado (ver registro_quadro)
+"""
+class ReproducaoInterface:
+    def __init__(self, trajeto, enviar, agendar, instrumentacao, ao_concluir=None):
+        self.trajeto = trajeto
+        self.enviar = enviar
+        self.agendar = agendar
+        self.instrumentacao = instrumentacao
+        self.ao_concluir = ao_concluir
+        self.registros = []
+        self._posicao = 0
+        self._envio = None
+        self._instrumentacao_ativa = False
+
+    def iniciar(self):
+        self._instrumentacao_ativa = self.instrumentacao.ativa
+        self.instrumentacao.ativar()
+        self._proxima()
+
+    """
+    Registra o quadro da ação enviada e agenda a proxima ação (chamada pela interface após desenhar cada quadro)
+    """
+    def quadro_desenhado(self):
+        if self._envio is None:
+            return
+        latencia = time.perf_counter() - self._envio
+        self._envio = None
+        acao, argumento, _ = self.trajeto.passos[self._posicao]
+        quadro = self.instrumentacao.ultimo_quadro()
+        etapas, contadores, duracao = {}, {}, 0.0
+        if quadro is not None:
+            etapas, contadores, duracao = dict(quadro.etapas), quadro.contadores, quadro.duracao
+        etapas["interface"] = max(latencia - duracao, 0.0)
+        self.registros.append(registro_quadro(acao, argumento, latencia, etapas, contadores))
+        self._posicao += 1
+        self.agendar(0, self._proxima)
+
+    def _proxima(self):
+        if self._posicao >= len(self.trajeto):
+            if not self._instrumentacao_ativa:
+                self.instrumentacao.desativar()
+            if self.ao_concluir is not None:
+                self.ao_concluir(self.registros)
+            return
+        acao, argumento, _ = self.trajeto.passos[self._posicao]
+        self._envio = time.perf_counter()
+        self.enviar(acao, argumento)
+
+"""
+Percentis (PERCENTIS), media e maximo de uma lista de tempos, em milissegundos
+"""
+def percentis(tempos):
+    tempos = np.asarray(tempos, dtype=float) * 1000
+    if len(tempos) == 0:
+        return {}
+    resumo = {f"p{percentil}": float(valor) for percentil, valor in zip(PERCENTIS, np.percentile(tempos, PERCENTIS))}
+    resumo["media"] = float(tempos.mean())
+    resumo["maximo"] = float(tempos.max())
+    return resumo
+
+"""
+Resume os quadros de uma reprodução: percentis da latencia e de cada etapa, em milissegundos
+Parâmetros:
+    registros (list): Registros dos quadros (reproduzir ou ReproducaoInterface)
+Retorna:
+    dict: {"quadros", "latencia_ms", "etapas_ms": {etapa: percentis e "total"}, "acoes": {acao: quadros}};
+        as etapas ficam na ordem em que aparecem pela primeira vez, e valem 0 nos quadros em que nao ocorreram
+"""
+def resumir_quadros(registros):
+    etapas = {}
+    for registro in registros:
+        for etapa in registro["etapas_s"]:
+            etapas.setdefault(etapa, [])
+    for etapa, tempos in etapas.items():
+        tempos.extend(registro["etapas_s"].get(etapa, 0.0) for registro in registros)
+
+    acoes = {}
+    for registro in registros:
+        acoes[registro["acao"]] = acoes.get(registro["acao"], 0) + 1
+
+    return {
+        "quadros": len(registros),
+        "latencia_ms": percentis([registro["latencia_s"] for registro in registros]),
+        "etapas_ms": {etapa: {**percentis(tempos), "total": 1000 * sum(tempos)} for etapa, tempos in etapas.items()},
+        "acoes": acoes,
+    }
+
+"""
+Texto com o resumo de uma reprodução: latencia dos quadros e tabela das etapas
+"""
+def texto_resumo(resumo):
+    linhas = [f"{resumo['quadros']} quadros ({', '.join(f'{acao}: {n}' for acao, n in resumo['acoes'].items())})"]
+    latencia = resumo["latencia_ms"]
+    if latencia:
+        linhas.append("latencia: " + "  ".join(f"p{percentil} {latencia[f'p{percentil}']:.1f} ms" for percentil in PERCENTIS)
+                      + f"  max {latencia['maximo']:.1f} ms")
+    linhas.append(f"{'etapa':<24}" + "".join(f"{f'p{percentil} (ms)':>11}" for percentil in PERCENTIS) + f"{'total (ms)':>12}")
+    for etapa, medidas in resumo["etapas_ms"].items():
+        linhas.append(f"{etapa:<24}" + "".join(f"{medidas[f'p{percentil}']:>11.2f}" for percentil in PERCENTIS) + f"{medidas['total']:>12.1f}")
+    return "\n".join(linhas)
@@ -0,0 +1,146 @@
+# Gerador de cenas sintéticas para os benchmarks
+# Uso (na raiz do projeto): python -m benchmarks.cena_sintetica saida.xml [--pontos 1000] [--retas 1000] [--convexos 100] [--concavos 100]
+import argparse
+import math
+import numpy as np
+from algoritmos.geometria import GeometriaCena, TIPO_PONTO, TIPO_RETA, TIPO_POLIGONO
+from algoritmos.leitor_xml import Cena
+from algoritmos.escritor_xml import exportar_cena_xml
+
+# Mesma window e viewport dos arquivos de entrada de exemplo
+WINDOW = {"xmin": 0.0, "ymin": 0.0, "xmax": 10.0, "ymax": 7.5}
+VIEWPORT = {"xmin": 0, "ymin": 0, "xmax": 800, "ymax": 600}
+
+# O mundo gerado tem MUNDO vezes o tamanho da window, com a window no centro
+MUNDO = 3.0
+
+CORES = ["red", "blue", "green", "gold2", "maroon1", "orchid1", "tomato2", "navy"]
+
+"""
+Sorteia os centros de formas de raio informado em relação a window
+Com probabilidade cruzamento o centro fica sobre a borda da window (a forma cruza a window);
+as demais formas ficam metade totalmente dentro e metade totalmente fora da window
+Parâmetros:
+    gerador (numpy.random.Generator): Gerador de numeros aleatorios
+    quantidade (int): Numero de centros
+    raio (float): Raio das formas (0 para pontos)
+    cruzamento (float): Fração das formas que cruzam a borda da window
+Retorna:
+    numpy.ndarray: Centros (quantidade, 2)
+"""
+def sortear_centros(gerador, quantidade, raio, cruzamento):
+    xmin, ymin, xmax, ymax = WINDOW["xmin"], WINDOW["ymin"], WINDOW["xmax"], WINDOW["ymax"]
+    largura, altura = xmax - xmin, ymax - ymin
+    centros = np.empty((quantidade, 2))
+    situacao = gerador.random(quantidade)
+    cruzam = situacao < cruzamento
+    dentro = ~cruzam & (situacao < cruzamento + (1 - cruzamento) / 2)
+    fora = ~cruzam & ~dentro
+
+    # Sobre a borda: um ponto aleatorio do perimetro da window
+    p = gerador.random(cruzam.sum()) * 2 * (largura + altura)
+    lados = [p < largura, p < largura + altura, p < 2 * largura + altura]
+    centros[cruzam] = np.column_stack((
+        np.select(lados, [xmin + p, xmax, xmax - (p - largura - altura)], xmin),
+        np.select(lados, [ymin, ymin + p - largura, ymax], ymax - (p - 2 * largura - altura)),
+    ))
+
+    # Dentro: na window reduzida pelo raio
+    folga_x, folga_y = min(raio, largura / 2), min(raio, altura / 2)
+    quantidade_dentro = dentro.sum()
+    centros[dentro] = np.column_stack((
+        gerador.uniform(xmin + folga_x, xmax - folga_x, quantidade_dentro),
+        gerador.uniform(ymin + folga_y, ymax - folga_y, quantidade_dentro),
+    ))
+
+    # Fora: no restante do mundo, sem que a caixa envolvente toque a window
+    cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+    faltam = np.flatnonzero(fora)
+    while len(faltam):
+        candidatos = np.column_stack((
+            gerador.uniform(cx - MUNDO * largura / 2, cx + MUNDO * largura / 2, len(faltam)),
+            gerador.uniform(cy - MUNDO * altura / 2, cy + MUNDO * altura / 2, len(faltam)),
+        ))
+        validos = ((candidatos[:, 0] + raio < xmin) | (candidatos[:, 0] - raio > xmax)
+                   | (candidatos[:, 1] + raio < ymin) | (candidatos[:, 1] - raio > ymax))
+        centros[faltam[validos]] = candidatos[validos]
+        faltam = faltam[~validos]
+    return centros
+
+"""
+Gera os vertices (quantidade, vertices, 2) de polígonos em torno dos centros, no sentido horário
+Polígonos convexos sao regulares; polígonos concavos sao estrelas (raios alternados)
+"""
+def vertices_poligonos(gerador, centros, vertices, raio, concavo):
+    rotacao = gerador.uniform(0, 2 * math.pi, (len(centros), 1))
+    angulos = rotacao - np.linspace(0, 2 * math.pi, vertices, endpoint=False)
+    raios = np.full(vertices, raio)
+    if concavo:
+        raios[1::2] = 0.4 * raio
+    return np.stack((centros[:, :1] + raios * np.cos(angulos), centros[:, 1:] + raios * np.sin(angulos)), axis=2)
+
+"""
+Gera uma cena sintética com pontos, retas e polígonos convexos e concavos
+Parâmetros:
+    pontos, retas, convexos, concavos (int): Quantidade de cada tipo de forma
+    vertices (int): Vertices de cada polígono (pelo menos 3; polígonos concavos usam um numero par)
+    cruzamento (float): Fração das formas que cruzam a borda da window (de 0 a 1)
+    tamanho (float): Raio das retas e polígonos, em fração da largura da window
+    semente (int): Semente do gerador de numeros aleatorios
+Retorna:
+    Cena: Viewport, window e geometria da cena gerada
+"""
+def gerar_cena(pontos=0, retas=0, convexos=0, concavos=0, vertices=8, cruzamento=0.3, tamanho=0.05, semente=0) -> Cena:
+    gerador = np.random.default_rng(semente)
+    raio = tamanho * (WINDOW["xmax"] - WINDOW["xmin"])
+    vertices = max(int(vertices), 3)
+    vertices_concavos = max(vertices + vertices % 2, 4)
+
+    blocos = []
+    # Pontos: com raio 0, "cruzar" a window significa estar sobre a sua borda
+    blocos.append((TIPO_PONTO, sortear_centros(gerador, pontos, 0.0, cruzamento).reshape(-1, 1, 2)))
+
+    centros = sortear_centros(gerador, retas, raio, cruzamento)
+    angulos = gerador.uniform(0, 2 * math.pi, (retas, 1))
+    direcao = raio * np.column_stack((np.cos(angulos), np.sin(angulos)))[:, None, :]
+    blocos.append((TIPO_RETA, np.concatenate((centros[:, None, :] - direcao, centros[:, None, :] + direcao), axis=1)))
+
+    centros = sortear_centros(gerador, convexos, raio, cruzamento)
+    blocos.append((TIPO_POLIGONO, vertices_poligonos(gerador, centros, vertices, raio, False)))
+    centros = sortear_centros(gerador, concavos, raio, cruzamento)
+    blocos.append((TIPO_POLIGONO, vertices_poligonos(gerador, centros, vertices_concavos, raio, True)))
+
+    tipos = np.concatenate([np.full(len(bloco), tipo, dtype=np.int8) for tipo, bloco in blocos])
+    quantidades = np.concatenate([np.full(len(bloco), bloco.shape[1], dtype=np.int64) for _, bloco in blocos])
+    coordenadas = np.concatenate([bloco.reshape(-1, 2) for _, bloco in blocos])
+    deslocamentos = np.concatenate(([0], np.cumsum(quantidades)))
+    indices_cor = gerador.integers(0, len(CORES), len(tipos)).astype(np.int32)
+
+    geometria = GeometriaCena.de_arrays(coordenadas, deslocamentos, tipos, indices_cor, CORES)
+    return Cena(dict(VIEWPORT), dict(WINDOW), geometria)
+
+"""
+Grava uma cena no formato dos arquivos de entrada
+"""
+def salvar_cena_xml(caminho, cena: Cena):
+    exportar_cena_xml(caminho, cena.viewport, cena.window, cena.geometria)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um arquivo de entrada com uma cena sintética")
+    parser.add_argument("saida")
+    parser.add_argument("--pontos", type=int, default=1000)
+    parser.add_argument("--retas", type=int, default=1000)
+    parser.add_argument("--convexos", type=int, default=100)
+    parser.add_argument("--concavos", type=int, default=100)
+    parser.add_argument("--vertices", type=int, default=8)
+    parser.add_argument("--cruzamento", type=float, default=0.3)
+    parser.add_argument("--tamanho", type=float, default=0.05)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    cena = gerar_cena(args.pontos, args.retas, args.convexos, args.concavos, args.vertices, args.cruzamento, args.tamanho, args.semente)
+    salvar_cena_xml(args.saida, cena)
+    print(f"{len(cena.geometria)} formas gravadas em {args.saida}")
+
+if __name__ == "__main__":
+    main()
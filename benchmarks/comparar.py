@@ -0,0 +1,52 @@
+# Compara dois resultados do benchmark do pipeline (python -m benchmarks.pipeline --saida ...)
+# Uso (na raiz do projeto): python -m benchmarks.comparar antes.json depois.json [--tolerancia 0.10]
+# Termina com código 1 quando alguma medida ficou mais lenta que a tolerancia (para uso em integração contínua)
+import argparse
+import json
+import sys
+
+"""
+Compara as medidas em comum de dois resultados pelo melhor tempo de cada uma
+Parâmetros:
+    antes, depois (dict): Documentos JSON gerados pelo benchmark
+    tolerancia (float): Aumento relativo de tempo aceito antes de considerar uma regressão
+Retorna:
+    list: Tuplas (etapa, medida, melhor_antes, melhor_depois, razão, regressão) das medidas em comum
+"""
+def comparar(antes, depois, tolerancia=0.10):
+    anteriores = {(medida["etapa"], medida["medida"]): medida for medida in antes["resultados"]}
+    comparacoes = []
+    for medida in depois["resultados"]:
+        anterior = anteriores.get((medida["etapa"], medida["medida"]))
+        if anterior is None:
+            continue
+        razao = medida["melhor_s"] / anterior["melhor_s"] if anterior["melhor_s"] > 0 else float("inf")
+        comparacoes.append((medida["etapa"], medida["medida"], anterior["melhor_s"], medida["melhor_s"], razao, razao > 1 + tolerancia))
+    return comparacoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados do benchmark do pipeline")
+    parser.add_argument("antes")
+    parser.add_argument("depois")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Aumento relativo de tempo aceito (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.antes, encoding="utf-8") as arquivo:
+        antes = json.load(arquivo)
+    with open(args.depois, encoding="utf-8") as arquivo:
+        depois = json.load(arquivo)
+
+    if antes.get("parametros") != depois.get("parametros"):
+        print("Aviso: os resultados foram gerados com parâmetros diferentes", file=sys.stderr)
+
+    comparacoes = comparar(antes, depois, args.tolerancia)
+    print(f"{'etapa':<14}{'medida':<50}{'antes (ms)':>12}{'depois (ms)':>12}{'razão':>8}")
+    for etapa, medida, tempo_antes, tempo_depois, razao, regressao in comparacoes:
+        marca = "  <- regressão" if regressao else ""
+        print(f"{etapa:<14}{medida:<50}{tempo_antes * 1000:>12.2f}{tempo_depois * 1000:>12.2f}{razao:>7.2f}x{marca}")
+
+    if any(regressao for *_, regressao in comparacoes):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
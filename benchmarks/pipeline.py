@@ -0,0 +1,220 @@
+# Benchmark das etapas do pipeline de visualização sobre uma cena sintética
+# Uso (na raiz do projeto): python -m benchmarks.pipeline [--pontos 20000] [--retas 20000] [--convexos 2000] [--concavos 2000]
+#                                                         [--cruzamento 0.3] [--etapas retas poligonos] [--saida resultados.json]
+#                                                         [--limite-carga 1.5]
+# Na etapa xml, termina com código 1 quando a montagem da geometria na leitura do XML custa mais que limite-carga
+# vezes a propria leitura dos elementos (ex.: trabalho por forma adicionado a GeometriaCena._adicionar_forma)
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import algoritmos.cache_binario as cache_binario
+import algoritmos.poligonos as poligonos
+from algoritmos.geometria import TIPO_PONTO, TIPO_RETA, TIPO_POLIGONO
+from algoritmos.leitor_xml import carregar_cena_xml, ler_elementos_xml
+from algoritmos.poligonos import Ponto, Reta, Poligono, PointClipping
+from algoritmos.poligonos import WeilerAthertonPolygonClipping, WeilerAthertonIndexadoPolygonClipping
+from algoritmos.poligono_sutherland import SutherlandHodgmanPolygonClipping
+from algoritmos.reta_cohen import CohenSutherlandClipping, CohenSutherlandClippingLote
+from algoritmos.reta_liang import LiangBarskyClipping, LiangBarskyClippingLote
+from algoritmos.renderizador import Renderizador
+from benchmarks.cena_sintetica import gerar_cena, salvar_cena_xml
+
+ETAPAS = ("normalizacao", "pontos", "retas", "poligonos", "xml", "cache", "quadro")
+
+"""
+Executa uma medida algumas vezes e retorna os tempos (em segundos) de cada execução
+Parâmetros:
+    funcao (callable): Função medida, chamada com os argumentos retornados por preparar
+    repeticoes (int): Numero de execuções
+    preparar (callable): Função opcional executada antes de cada execução, fora da medida
+"""
+def cronometrar(funcao, repeticoes, preparar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        argumentos = preparar() if preparar is not None else ()
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+"""
+Classe Resultados -> Acumula as medidas do benchmark e as imprime à medida que sao feitas
+"""
+class Resultados:
+    def __init__(self, repeticoes, silencioso=False):
+        self.repeticoes = repeticoes
+        self.silencioso = silencioso
+        self.medidas = []
+        if not silencioso:
+            print(f"{'etapa':<14}{'medida':<50}{'itens':>10}{'melhor (ms)':>14}{'mediana (ms)':>14}{'us/item':>10}")
+
+    """
+    Mede uma função e registra o resultado
+    Parâmetros:
+        etapa (str): Etapa do pipeline (uma de ETAPAS)
+        medida (str): Nome da medida (ex.: o algoritmo)
+        itens (int): Numero de itens processados por execução (formas, vertices...)
+        funcao, preparar (callable): Ver cronometrar
+    """
+    def medir(self, etapa, medida, itens, funcao, preparar=None):
+        tempos = cronometrar(funcao, self.repeticoes, preparar)
+        resultado = {
+            "etapa": etapa,
+            "medida": medida,
+            "itens": int(itens),
+            "melhor_s": min(tempos),
+            "mediana_s": statistics.median(tempos),
+            "tempos_s": tempos,
+            "por_item_us": min(tempos) / max(itens, 1) * 1e6,
+        }
+        self.medidas.append(resultado)
+        if not self.silencioso:
+            print(f"{etapa:<14}{medida:<50}{itens:>10}{resultado['melhor_s'] * 1000:>14.2f}"
+                  f"{resultado['mediana_s'] * 1000:>14.2f}{resultado['por_item_us']:>10.3f}")
+        return resultado
+
+# Objetos Ponto, Reta e Poligono (coordenadas normalizadas) das formas do tipo informado
+def formas_normalizadas(geometria, tipo, indices=None):
+    if indices is None:
+        indices = np.flatnonzero(geometria.tipos == tipo)
+    normalizadas = geometria.normalizadas.tolist()
+    deslocamentos = geometria.deslocamentos.tolist()
+    formas = []
+    for indice in indices.tolist():
+        pontos = [Ponto(x, y) for x, y in normalizadas[deslocamentos[indice]:deslocamentos[indice + 1]]]
+        if tipo == TIPO_PONTO:
+            formas.append(pontos[0])
+        elif tipo == TIPO_RETA:
+            formas.append(Reta(pontos[0], pontos[1]))
+        else:
+            formas.append(Poligono(pontos))
+    return formas
+
+# Identificação do ambiente em que o benchmark foi executado
+def ambiente():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede as etapas do pipeline de visualização em uma cena sintética")
+    parser.add_argument("--pontos", type=int, default=20000)
+    parser.add_argument("--retas", type=int, default=20000)
+    parser.add_argument("--convexos", type=int, default=2000)
+    parser.add_argument("--concavos", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=8)
+    parser.add_argument("--cruzamento", type=float, default=0.3, help="Fração das formas que cruzam a borda da window")
+    parser.add_argument("--tamanho", type=float, default=0.05, help="Raio das formas em fração da largura da window")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--etapas", nargs="*", choices=ETAPAS, default=list(ETAPAS))
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados ('-' para a saída padrão)")
+    parser.add_argument("--limite-carga", type=float, default=1.5,
+                        help="Custo maximo da montagem da geometria na leitura do XML, relativo a leitura dos elementos")
+    args = parser.parse_args()
+
+    parametros = {chave: valor for chave, valor in vars(args).items() if chave != "saida"}
+    montagem = None
+    resultados = Resultados(args.repeticoes, silencioso=args.saida == "-")
+
+    cena = gerar_cena(args.pontos, args.retas, args.convexos, args.concavos, args.vertices, args.cruzamento, args.tamanho, args.semente)
+    geometria = cena.geometria
+    renderizador = Renderizador(cena.viewport, cena.window, orcamento_cache=0)
+    renderizador.definir_formas(geometria)
+    renderizador.garantir_normalizacao()
+    window = renderizador.window_recorte()
+
+    if "normalizacao" in args.etapas:
+        resultados.medir("normalizacao", "GeometriaCena.normalizar", geometria.n_vertices,
+                         lambda: geometria.normalizar(renderizador.matriz_normalizada))
+
+    if "pontos" in args.etapas:
+        pontos = formas_normalizadas(geometria, TIPO_PONTO)
+        resultados.medir("pontos", "PointClipping", len(pontos), lambda: [PointClipping(window, ponto) for ponto in pontos])
+        caixas = geometria.caixas[geometria.tipos == TIPO_PONTO]
+        resultados.medir("pontos", "classificar_caixas", len(pontos), lambda: poligonos.classificar_caixas(window, caixas))
+
+    if "retas" in args.etapas:
+        retas = formas_normalizadas(geometria, TIPO_RETA)
+        resultados.medir("retas", "CohenSutherlandClipping", len(retas), lambda: [CohenSutherlandClipping(window, reta) for reta in retas])
+        resultados.medir("retas", "LiangBarskyClipping", len(retas), lambda: [LiangBarskyClipping(window, reta) for reta in retas])
+
+        inicio = geometria.deslocamentos[:-1][geometria.tipos == TIPO_RETA]
+        pontos1, pontos2 = geometria.normalizadas[inicio], geometria.normalizadas[inicio + 1]
+        resultados.medir("retas", "CohenSutherlandClippingLote", len(retas), lambda: CohenSutherlandClippingLote(window, pontos1, pontos2))
+        resultados.medir("retas", "LiangBarskyClippingLote", len(retas), lambda: LiangBarskyClippingLote(window, pontos1, pontos2))
+
+    if "poligonos" in args.etapas:
+        # Os algoritmos de polígonos sao medidos apenas nos polígonos que cruzam a window (os demais sao
+        # aceitos ou rejeitados pela caixa envolvente antes de chegar a eles)
+        parciais = np.flatnonzero((geometria.tipos == TIPO_POLIGONO)
+                                  & (poligonos.classificar_caixas(window, geometria.caixas) == poligonos.CAIXA_PARCIAL))
+        inicio_concavos = args.pontos + args.retas + args.convexos
+        grupos = [("convexos", parciais[parciais < inicio_concavos]), ("concavos", parciais[parciais >= inicio_concavos])]
+        algoritmos = [
+            ("WeilerAthertonPolygonClipping", WeilerAthertonPolygonClipping),
+            ("WeilerAthertonIndexadoPolygonClipping", WeilerAthertonIndexadoPolygonClipping),
+            ("SutherlandHodgmanPolygonClipping", SutherlandHodgmanPolygonClipping),
+        ]
+        for nome_grupo, indices in grupos:
+            for nome_algoritmo, algoritmo in algoritmos:
+                resultados.medir(
+                    "poligonos", f"{nome_algoritmo} ({nome_grupo})", len(indices),
+                    lambda formas, algoritmo=algoritmo: [algoritmo(window, forma) for forma in formas],
+                    lambda indices=indices: (formas_normalizadas(geometria, TIPO_POLIGONO, indices),),
+                )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_xml = os.path.join(diretorio, "cena.xml")
+        caminho_binario = cache_binario.caminho_cache(caminho_xml)
+
+        if "xml" in args.etapas or "cache" in args.etapas:
+            resultados.medir("xml", "salvar (exportar_cena_xml)", len(geometria), lambda: salvar_cena_xml(caminho_xml, cena))
+        if "xml" in args.etapas:
+            leitura = resultados.medir("xml", "ler (ler_elementos_xml)", len(geometria), lambda: sum(1 for _ in ler_elementos_xml(caminho_xml)))
+            carga = resultados.medir("xml", "carregar (carregar_cena_xml)", len(geometria), lambda: carregar_cena_xml(caminho_xml))
+            # Custo da montagem da GeometriaCena, alem da leitura dos elementos
+            montagem = (carga["melhor_s"] - leitura["melhor_s"]) / leitura["melhor_s"]
+
+        if "cache" in args.etapas:
+            resultados.medir("cache", "salvar_cena_binaria", len(geometria), lambda: cache_binario.salvar_cena_binaria(caminho_binario, cena, caminho_xml))
+            resultados.medir("cache", "abrir_cena_binaria", len(geometria), lambda: cache_binario.abrir_cena_binaria(caminho_binario))
+
+    if "quadro" in args.etapas:
+        # Quadro completo da janela principal (recorte e transformada de viewport), sem o cache de quadros
+        resultados.medir("quadro", "Renderizador.gerar_comandos_cena", len(geometria), renderizador.gerar_comandos_cena)
+        resultados.medir("quadro", "Renderizador.comandos_minimapa", len(geometria), renderizador.comandos_minimapa)
+
+    if args.saida:
+        documento = {"parametros": parametros, "ambiente": ambiente(), "resultados": resultados.medidas}
+        if args.saida == "-":
+            json.dump(documento, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.saida, "w", encoding="utf-8") as arquivo:
+                json.dump(documento, arquivo, indent=2)
+
+    if montagem is not None and montagem > args.limite_carga:
+        print(f"carga do XML: a montagem da geometria custa {montagem:.2f}x a leitura dos elementos "
+              f"(limite {args.limite_carga:.2f}x)", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Benchmark dos algoritmos de clipping de polígonos
+# Uso (na raiz do projeto): python -m benchmarks.recorte_poligonos [--vertices 10000] [--dentes 10 200 1000]
+#                           [--pequenos 4 8 16 32 64] [--poligonos 200]
+# Os polígonos pequenos (--pequenos) medem o tempo por polígono, inclusive o do recorte automatico, como nas cenas
+import argparse
+import math
+import time
+import numpy as np
+from algoritmos.poligonos import Ponto, Poligono, Window, RecortePoligono, RECORTE_AUTOMATICO
+from algoritmos.poligonos import WeilerAthertonPolygonClipping, WeilerAthertonIndexadoPolygonClipping
+from algoritmos.poligono_sutherland import SutherlandHodgmanPolygonClipping
+
+"""
+Gera um polígono regular (convexo) com n vertices no sentido horário
+"""
+def poligono_convexo(n, raio=1.3):
+    angulos = -np.linspace(0, 2 * math.pi, n, endpoint=False)
+    return np.column_stack((raio * np.cos(angulos), raio * np.sin(angulos)))
+
+"""
+Gera uma "engrenagem" (polígono concavo) com n vertices cujos dentes cruzam a window [-1,1] varias vezes
+"""
+def poligono_engrenagem(n, dentes, raio_interno=0.9, raio_externo=1.6):
+    angulos = -np.linspace(0, 2 * math.pi, n, endpoint=False)
+    raios = np.where((np.arange(n) * dentes * 2 // n) % 2 == 0, raio_interno, raio_externo)
+    return np.column_stack((raios * np.cos(angulos), raios * np.sin(angulos)))
+
+def cria_poligono(coordenadas):
+    return Poligono([Ponto(float(x), float(y)) for x, y in coordenadas])
+
+"""
+Retorna o menor tempo (em segundos) de algumas execuções do algoritmo
+"""
+def cronometrar(algoritmo, window, coordenadas, repeticoes):
+    melhor = math.inf
+    for _ in range(repeticoes):
+        poligono = cria_poligono(coordenadas)
+        inicio = time.perf_counter()
+        algoritmo(window, poligono)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+"""
+Retorna o menor tempo medio (em segundos) por polígono de algumas execuções do algoritmo sobre varios polígonos
+pequenos, em que o custo fixo de cada chamada pesa tanto quanto o do recorte
+"""
+def cronometrar_pequenos(algoritmo, window, coordenadas, quantidade, repeticoes):
+    melhor = math.inf
+    for _ in range(repeticoes):
+        poligonos = [cria_poligono(coordenadas) for _ in range(quantidade)]
+        inicio = time.perf_counter()
+        for poligono in poligonos:
+            algoritmo(window, poligono)
+        melhor = min(melhor, (time.perf_counter() - inicio) / quantidade)
+    return melhor
+
+def recorte_automatico(window, poligono):
+    return RecortePoligono(window, poligono, RECORTE_AUTOMATICO)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os algoritmos de clipping de polígonos")
+    parser.add_argument("--vertices", type=int, default=10000)
+    parser.add_argument("--dentes", type=int, nargs="*", default=[10, 200, 1000])
+    parser.add_argument("--pequenos", type=int, nargs="*", default=[4, 8, 16, 32, 64], help="Vertices dos polígonos pequenos")
+    parser.add_argument("--poligonos", type=int, default=200, help="Numero de polígonos pequenos de cada caso")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    window = Window(-1, -1, 1, 1)
+    casos = [("convexo", poligono_convexo(args.vertices))]
+    casos += [(f"engrenagem ({dentes} dentes)", poligono_engrenagem(args.vertices, dentes)) for dentes in args.dentes]
+    algoritmos = [
+        ("Weiler-Atherton", WeilerAthertonPolygonClipping),
+        ("Weiler-Atherton indexado", WeilerAthertonIndexadoPolygonClipping),
+        ("Sutherland-Hodgman", SutherlandHodgmanPolygonClipping),
+    ]
+
+    print(f"{'caso':<28}{'algoritmo':<28}{'tempo (ms)':>12}{'speedup':>10}")
+    for nome_caso, coordenadas in casos:
+        referencia = None
+        for nome_algoritmo, algoritmo in algoritmos:
+            tempo = cronometrar(algoritmo, window, coordenadas, args.repeticoes)
+            referencia = referencia or tempo
+            print(f"{nome_caso:<28}{nome_algoritmo:<28}{tempo * 1000:>12.2f}{referencia / tempo:>9.1f}x")
+
+    if not args.pequenos:
+        return
+    casos = []
+    for vertices in args.pequenos:
+        casos.append((f"convexo ({vertices} vertices)", poligono_convexo(vertices)))
+        casos.append((f"concavo ({vertices} vertices)", poligono_engrenagem(vertices, max(vertices // 4, 1))))
+    algoritmos.append(("Automatico", recorte_automatico))
+
+    print(f"\n{'caso':<28}{'algoritmo':<28}{'tempo (us)':>12}{'speedup':>10}")
+    for nome_caso, coordenadas in casos:
+        referencia = None
+        for nome_algoritmo, algoritmo in algoritmos:
+            tempo = cronometrar_pequenos(algoritmo, window, coordenadas, args.poligonos, args.repeticoes)
+            referencia = referencia or tempo
+            print(f"{nome_caso:<28}{nome_algoritmo:<28}{tempo * 1e6:>12.1f}{referencia / tempo:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
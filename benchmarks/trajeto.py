@@ -0,0 +1,135 @@
+# Reprodução de trajetos de câmera (sequências de movimentar, rotacionar e aplicar_zoom) com os percentis da latencia dos quadros
+# Uso (na raiz do projeto):
+#   python -m benchmarks.trajeto gerar trajeto.json [--passos 200] [--angulo 10] [--zoom 0.1] [--semente 0]
+#   python -m benchmarks.trajeto reproduzir trajeto.json [--cena entradas/entrada.xml] [--pontos 20000] [--retas 20000] ...
+#                                [--sem-cache] [--imagem] [--saida resultado.json] [--trace trace.json]
+#                                [--comparar anterior.json] [--tolerancia 0.10]
+# Os trajetos tambem sao gravados na interface (menu Trajeto de Câmera), que os reproduz na janela do tkinter.
+# Com --comparar, termina com código 1 quando algum percentil da latencia ficou mais lento que a tolerancia
+import argparse
+import json
+import sys
+import numpy as np
+from algoritmos.cache_binario import carregar_cena
+from algoritmos.cache_quadros import ORCAMENTO_PADRAO
+from algoritmos.renderizador import Renderizador
+from algoritmos.trajeto_camera import DIRECOES, PERCENTIS, TrajetoCamera, reproduzir, resumir_quadros, texto_resumo
+from benchmarks.cena_sintetica import gerar_cena
+from benchmarks.pipeline import ambiente
+
+# Limites da escala nos trajetos gerados: o zoom muda de sentido ao alcançá-los
+ESCALA_MINIMA = 0.5
+ESCALA_MAXIMA = 3.0
+
+"""
+Gera um trajeto aleatorio parecido com uma sessão interativa: sequências de movimentos na mesma direção,
+intercaladas com rotações e passos de zoom
+Parâmetros:
+    passos (int): Numero de ações
+    angulo (float): Angulo de cada rotação (graus), como o angulo_rotacao da interface
+    zoom (float): Variação da escala de cada passo de zoom, como os botões da interface
+    semente (int): Semente do gerador aleatorio
+"""
+def gerar_trajeto(passos=200, angulo=10.0, zoom=0.1, semente=0):
+    gerador = np.random.default_rng(semente)
+    trajeto = []
+    escala = 1.0
+    direcao = DIRECOES[0]
+    while len(trajeto) < passos:
+        sorteio = gerador.random()
+        if sorteio < 0.6:
+            # Movimentos costumam vir em sequência, na mesma direção
+            if gerador.random() < 0.3:
+                direcao = DIRECOES[gerador.integers(len(DIRECOES))]
+            trajeto.append(("movimentar", direcao))
+        elif sorteio < 0.8:
+            trajeto.append(("rotacionar", angulo if gerador.random() < 0.5 else -angulo))
+        else:
+            variacao = zoom if gerador.random() < 0.5 else -zoom
+            if not ESCALA_MINIMA <= escala + variacao <= ESCALA_MAXIMA:
+                variacao = -variacao
+            escala += variacao
+            trajeto.append(("aplicar_zoom", variacao))
+    return TrajetoCamera((acao, argumento, 0.0) for acao, argumento in trajeto)
+
+"""
+Compara os percentis da latencia de duas reproduções
+Retorna:
+    list: Tuplas (percentil, antes_ms, depois_ms, razão, regressão)
+"""
+def comparar_resumos(antes, depois, tolerancia=0.10):
+    comparacoes = []
+    for percentil in PERCENTIS:
+        chave = f"p{percentil}"
+        anterior, atual = antes["latencia_ms"].get(chave), depois["latencia_ms"].get(chave)
+        if anterior is None or atual is None:
+            continue
+        razao = atual / anterior if anterior > 0 else float("inf")
+        comparacoes.append((chave, anterior, atual, razao, razao > 1 + tolerancia))
+    return comparacoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava e reproduz trajetos de câmera, medindo a latencia dos quadros")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    gerar = comandos.add_parser("gerar", help="Gera um trajeto aleatorio")
+    gerar.add_argument("trajeto", help="Arquivo JSON do trajeto")
+    gerar.add_argument("--passos", type=int, default=200)
+    gerar.add_argument("--angulo", type=float, default=10.0, help="Angulo de cada rotação, em graus")
+    gerar.add_argument("--zoom", type=float, default=0.1, help="Variação da escala de cada passo de zoom")
+    gerar.add_argument("--semente", type=int, default=0)
+
+    reproducao = comandos.add_parser("reproduzir", help="Reproduz um trajeto sem interface e mede os quadros")
+    reproducao.add_argument("trajeto", help="Arquivo JSON do trajeto")
+    reproducao.add_argument("--cena", help="Arquivo XML da cena (padrão: uma cena sintética)")
+    reproducao.add_argument("--pontos", type=int, default=20000)
+    reproducao.add_argument("--retas", type=int, default=20000)
+    reproducao.add_argument("--convexos", type=int, default=2000)
+    reproducao.add_argument("--concavos", type=int, default=2000)
+    reproducao.add_argument("--vertices", type=int, default=8)
+    reproducao.add_argument("--cruzamento", type=float, default=0.3, help="Fração das formas que cruzam a borda da window")
+    reproducao.add_argument("--semente", type=int, default=0)
+    reproducao.add_argument("--sem-cache", action="store_true", help="Desativa o cache de quadros")
+    reproducao.add_argument("--imagem", action="store_true", help="Rasteriza cada quadro em uma imagem")
+    reproducao.add_argument("--saida", help="Arquivo JSON com o resumo e o registro de cada quadro")
+    reproducao.add_argument("--trace", help="Arquivo de trace (Chrome Trace) com as etapas de cada quadro")
+    reproducao.add_argument("--comparar", help="Resultado anterior (--saida) comparado pelos percentis da latencia")
+    reproducao.add_argument("--tolerancia", type=float, default=0.10, help="Aumento relativo de latencia aceito (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.comando == "gerar":
+        gerar_trajeto(args.passos, args.angulo, args.zoom, args.semente).salvar(args.trajeto)
+        return
+
+    trajeto = TrajetoCamera.carregar(args.trajeto)
+    if args.cena:
+        cena = carregar_cena(args.cena, gravar_cache=False)
+    else:
+        cena = gerar_cena(args.pontos, args.retas, args.convexos, args.concavos, args.vertices, args.cruzamento, semente=args.semente)
+    renderizador = Renderizador(cena.viewport, cena.window, orcamento_cache=0 if args.sem_cache else ORCAMENTO_PADRAO)
+    renderizador.definir_formas(cena.geometria)
+
+    registros = reproduzir(renderizador, trajeto, imagem=args.imagem)
+    resumo = resumir_quadros(registros)
+    print(texto_resumo(resumo))
+
+    if args.trace:
+        renderizador.instrumentacao.exportar_trace(args.trace)
+    if args.saida:
+        parametros = {chave: valor for chave, valor in vars(args).items() if chave not in ("saida", "trace", "comparar", "tolerancia")}
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"parametros": parametros, "ambiente": ambiente(), "resumo": resumo, "quadros": registros}, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        comparacoes = comparar_resumos(anterior["resumo"], resumo, args.tolerancia)
+        print(f"{'latencia':<10}{'antes (ms)':>12}{'depois (ms)':>12}{'razão':>8}")
+        for chave, antes, depois, razao, regressao in comparacoes:
+            marca = "  <- regressão" if regressao else ""
+            print(f"{chave:<10}{antes:>12.2f}{depois:>12.2f}{razao:>7.2f}x{marca}")
+        if any(regressao for *_, regressao in comparacoes):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()